@@ -1,35 +1,56 @@
 import random
 import json
-import torch
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from transformers import pipeline, AutoModelForSequenceClassification, AutoTokenizer
-from sentence_transformers import SentenceTransformer, util
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 from nltk.probability import FreqDist
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
+from model_registry import register_model, get_model
+from embedding_cache import SENTENCE_ENCODER_MODEL, get_embedding_cache
+
+# Heavy models (torch, transformers) are loaded on first use through the model
+# registry rather than at import time.
+def _load_nltk_data():
+    """Download required NLTK data if it is not installed yet"""
+    try:
+        nltk.data.find('tokenizers/punkt')
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('punkt')
+        nltk.download('stopwords')
+    return set(stopwords.words('english'))
+
+def _load_sentiment_analyzer():
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+
+def _load_sentence_encoder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(SENTENCE_ENCODER_MODEL)
+
+register_model('nltk_stopwords', _load_nltk_data)
+register_model('sentiment_analyzer', _load_sentiment_analyzer)
+register_model('sentence_encoder', _load_sentence_encoder)
 
 class NLPAnalyzer:
-    def __init__(self):
-        # Initialize sentiment analysis pipeline
-        self.sentiment_analyzer = pipeline("sentiment-analysis", 
-                                         model="distilbert-base-uncased-finetuned-sst-2-english")
-        
-        # Initialize sentence transformer for semantic similarity
-        self.sentence_encoder = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # Initialize stopwords
-        self.stop_words = set(stopwords.words('english'))
+    """NLP helpers for interview answers; models are shared across instances"""
+    
+    @property
+    def sentiment_analyzer(self):
+        # Sentiment analysis pipeline
+        return get_model('sentiment_analyzer')
+    
+    @property
+    def sentence_encoder(self):
+        # Sentence transformer for semantic similarity
+        return get_model('sentence_encoder')
+    
+    @property
+    def stop_words(self) -> set:
+        return get_model('nltk_stopwords')
         
     def analyze_sentiment(self, text: str) -> Dict:
         """Analyze sentiment of the given text."""
@@ -41,20 +62,31 @@ class NLPAnalyzer:
     def extract_keywords(self, text: str, top_n: int = 5) -> List[str]:
         """Extract top N keywords from the text."""
         try:
+            stop_words = self.stop_words
             words = [word.lower() for word in word_tokenize(text) 
-                    if word.isalnum() and word.lower() not in self.stop_words]
+                    if word.isalnum() and word.lower() not in stop_words]
             freq_dist = FreqDist(words)
             return [word for word, _ in freq_dist.most_common(top_n)]
         except Exception as e:
             return []
     
     def get_semantic_similarity(self, text1: str, text2: str) -> float:
-        """Calculate semantic similarity between two texts."""
+        """Calculate semantic similarity between two texts (embeddings are cached)."""
         try:
-            embeddings = self.sentence_encoder.encode([text1, text2], convert_to_tensor=True)
-            return util.pytorch_cos_sim(embeddings[0], embeddings[1]).item()
+            embeddings = get_embedding_cache().encode([text1, text2])
+            return float(embeddings[0] @ embeddings[1])
         except Exception as e:
             return 0.0
+    
+    def get_semantic_similarities(self, text: str, others: List[str]) -> List[float]:
+        """Similarity of ``text`` to each of ``others``, with one encoder call for any uncached texts."""
+        if not others:
+            return []
+        try:
+            embeddings = get_embedding_cache().encode([text] + list(others))
+            return [float(score) for score in embeddings[1:] @ embeddings[0]]
+        except Exception as e:
+            return [0.0] * len(others)
 
 class AIInterviewer:
     def __init__(self):
@@ -0,0 +1,252 @@
+"""
+IVF approximate nearest-neighbour index over an ``EmbeddingStore``.
+
+An exact scan of the resume embedding matrix reads every row per query.
+Past a few hundred thousand resumes that is too slow for interactive
+"candidates like this job" searches. The inverted-file index partitions
+the vectors into ``nlist`` cells with spherical k-means. A query is then
+scored against the centroids first and only against the vectors in the
+``nprobe`` closest cells.
+
+* Recall/latency knobs: ``nprobe`` per query (more cells probed means
+  higher recall and slower queries) and ``nlist`` at build time (more,
+  smaller cells means faster probes, but more cells are needed for the
+  same recall).
+* Inserts: rows appended to the store after the index was built are
+  assigned to their nearest centroid on the next search. That costs one
+  small matrix product, so the index never has to be rebuilt for new
+  resumes. Rebuild when the data has drifted far from the centroids.
+* Deletes and superseded resumes follow the store's ``live`` mask
+  (tombstones), so they stop showing up immediately.
+* Persistence: centroids and the row-to-cell assignments are saved to
+  ``<store>.ivf.npz`` next to the store. Each process reloads the file
+  when a rebuild replaces it. A compaction renumbers rows, and the index
+  then reassigns every row to the existing centroids.
+
+The vectors themselves are not copied; probed cells are read from the
+store's memory map (its int8 codes, with float32 rescoring, when the
+store is quantized).
+"""
+
+import os
+import time
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ANN_CONFIG = {
+    'min_rows': int(os.environ.get('RESUME_ANN_MIN_ROWS', 50000)),  # exact scan below this
+    'nprobe': int(os.environ.get('RESUME_ANN_NPROBE', 32)),
+    'train_points_per_list': 64,
+    'kmeans_iterations': 10,
+    'assign_chunk_rows': 65536
+}
+
+
+def default_nlist(rows: int) -> int:
+    """About 4 * sqrt(N) cells, the usual IVF rule of thumb"""
+    return int(min(max(4 * np.sqrt(rows), 16), 65536))
+
+
+def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray, chunk_rows: int) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_rows):
+        chunk = np.asarray(vectors[start:start + chunk_rows], dtype=np.float32)
+        assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iterations: int = ANN_CONFIG['kmeans_iterations'],
+                    seed: int = 0) -> np.ndarray:
+    """Spherical k-means: unit centroids maximising the summed cosine to their members"""
+    rng = np.random.default_rng(seed)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest_centroid(vectors, centroids, ANN_CONFIG['assign_chunk_rows'])
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=nlist)
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            # Reseed empty cells with random points so every cell is used
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.maximum(norms, 1e-12)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """Inverted-file index of an ``EmbeddingStore``'s rows"""
+
+    def __init__(self, store, centroids: np.ndarray, assignments: Optional[np.ndarray] = None,
+                 store_inode: Optional[int] = None, nprobe: int = ANN_CONFIG['nprobe']):
+        self.store = store
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nprobe = nprobe
+        self._assignments = np.zeros(0, dtype=np.int32) if assignments is None else assignments.astype(np.int32)
+        self._store_inode = store_inode
+        self._lists: List[np.ndarray] = []
+        self._lock = threading.Lock()
+        self._build_lists()
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def path(self) -> str:
+        return index_path(self.store)
+
+    @classmethod
+    def build(cls, store, nlist: Optional[int] = None, seed: int = 0,
+              nprobe: int = ANN_CONFIG['nprobe']) -> 'IVFIndex':
+        """Train centroids on a sample of the live rows and assign every row"""
+        live_rows = np.flatnonzero(store.live)
+        if not len(live_rows):
+            raise ValueError(f"Embedding store '{store.name}' has no rows to index")
+        nlist = nlist or default_nlist(len(live_rows))
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(live_rows), nlist * ANN_CONFIG['train_points_per_list'])
+        sample = np.sort(rng.choice(live_rows, sample_size, replace=False))
+        centroids = train_centroids(store.vectors[sample], nlist, seed=seed)
+        index = cls(store, centroids, nprobe=nprobe)
+        index.update()
+        return index
+
+    def _build_lists(self) -> None:
+        order = np.argsort(self._assignments, kind='stable')
+        bounds = np.searchsorted(self._assignments[order], np.arange(self.nlist + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]].astype(np.int64) for i in range(self.nlist)]
+
+    def update(self) -> int:
+        """Assign rows added to the store since the last call; returns how many were added"""
+        rows = self.store.refresh()
+        inode = self.store.file_inode()
+        with self._lock:
+            if inode != self._store_inode:
+                # Compacted (or first use): row numbers changed, reassign everything
+                self._assignments = np.zeros(0, dtype=np.int32)
+                self._store_inode = inode
+            indexed = len(self._assignments)
+            if rows <= indexed:
+                return 0
+            new = _nearest_centroid(self.store.vectors[indexed:rows], self.centroids,
+                                    ANN_CONFIG['assign_chunk_rows'])
+            self._assignments = np.concatenate([self._assignments, new])
+            if rows - indexed > len(self._lists):
+                self._build_lists()
+            else:
+                for cell in np.unique(new):
+                    added = indexed + np.flatnonzero(new == cell)
+                    self._lists[cell] = np.concatenate([self._lists[cell], added])
+            return rows - indexed
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None,
+               exclude_owners: Sequence[int] = ()) -> List[Tuple[int, int, float]]:
+        """(key, owner, cosine) of about the ``k`` closest live rows, probing ``nprobe`` cells
+        (clamped to ``1..nlist``)"""
+        self.update()
+        if k <= 0 or not len(self._assignments):
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = min(max(self.nprobe if nprobe is None else nprobe, 1), self.nlist)
+        cells = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.sort(np.concatenate([self._lists[cell] for cell in cells]))
+        live = self.store.live
+        rows = rows[live[rows]]
+        if len(exclude_owners):
+            rows = rows[~np.isin(self.store.keys['owner'][rows], np.asarray(exclude_owners, dtype=np.int64))]
+        if not len(rows):
+            return []
+        rows, scores = self.store.best_rows(query, k, rows)
+        keys = self.store.keys
+        return [(int(keys[row]['key']), int(keys[row]['owner']), float(score)) for row, score in zip(rows, scores)]
+
+    def save(self) -> str:
+        """Write centroids and assignments next to the store (atomically)"""
+        with self._lock:
+            tmp = self.path + '.tmp.npz'
+            np.savez(tmp, centroids=self.centroids, assignments=self._assignments,
+                     store_inode=np.int64(self._store_inode or 0), created_at=np.float64(time.time()))
+            os.replace(tmp, self.path)
+        return self.path
+
+    @classmethod
+    def load(cls, store, nprobe: int = ANN_CONFIG['nprobe']) -> Optional['IVFIndex']:
+        try:
+            with np.load(index_path(store)) as data:
+                if data['centroids'].shape[1] != store.dim:
+                    return None
+                return cls(store, data['centroids'], data['assignments'], int(data['store_inode']), nprobe)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def stats(self) -> Dict:
+        sizes = np.array([len(cell) for cell in self._lists])
+        return {
+            'nlist': self.nlist,
+            'nprobe': self.nprobe,
+            'indexed_rows': int(len(self._assignments)),
+            'largest_cell': int(sizes.max()) if len(sizes) else 0,
+            'mean_cell': round(float(sizes.mean()), 1) if len(sizes) else 0.0
+        }
+
+
+def index_path(store) -> str:
+    return os.path.join(store.directory, f"{store.name}.ivf.npz")
+
+
+_indexes: Dict[str, Tuple[IVFIndex, Tuple[int, int]]] = {}
+_indexes_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(inode, mtime) of the index file; a rebuild replaces it, changing both"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def get_ann_index(store) -> Optional[IVFIndex]:
+    """The saved index of a store; None if it was never built.
+
+    The loaded index is kept per process and reloaded when the file is
+    replaced (``flask build-ann-index`` runs in another process). A missing
+    or unreadable file is not remembered, so the first build is picked up
+    on the next search.
+    """
+    signature = _file_signature(index_path(store))
+    if signature is None:
+        return None
+    cached = _indexes.get(store.name)
+    if cached is not None and cached[1] == signature:
+        return cached[0]
+    with _indexes_lock:
+        cached = _indexes.get(store.name)
+        if cached is not None and cached[1] == signature:
+            return cached[0]
+        index = IVFIndex.load(store)
+        if index is None:
+            return None
+        _indexes[store.name] = (index, signature)
+        return index
+
+
+def reset_ann_index(store) -> None:
+    """Forget the loaded index so the next ``get_ann_index`` reads the file again"""
+    with _indexes_lock:
+        _indexes.pop(store.name, None)
+
+
+def search(store, query: np.ndarray, k: int, nprobe: Optional[int] = None,
+           exclude_owners: Sequence[int] = ()) -> List[Tuple[int, int, float]]:
+    """ANN search once the store is large enough and an index exists, exact scan otherwise"""
+    index = get_ann_index(store) if len(store) >= ANN_CONFIG['min_rows'] else None
+    if index is None:
+        return store.top_k(query, k, exclude_owners)
+    return index.search(query, k, nprobe, exclude_owners)
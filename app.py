@@ -1,10 +1,12 @@
 import os
+import re
 import json
 import random
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_from_directory, send_file, abort
+import click
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
@@ -20,15 +22,26 @@ from functools import wraps
 import uuid
 import shutil
 from pathlib import Path
-from resume_parser import ResumeParser  # Import the ResumeParser class initialized to avoid circular imports
-from models import db, User, Candidate, Resume, JobPosting, Application, Interview, Note, AIConversation, AIMessage
+from resume_parser import ResumeParser, get_resume_parser, reload_skills_taxonomy  # Import the ResumeParser class initialized to avoid circular imports
+from models import db, User, Candidate, Resume, ResumeJob, JobPosting, Application, Interview, Note, AIConversation, AIMessage
 from resume_parser import ResumeData
+from job_profile import JobProfile, get_job_profile, get_text_profile, job_posting_text
+from scoring_engine import score_resume
+from rescoring import store_score_components
+from resume_store import load_resume_data
+from resume_jobs import create_resume_job, get_resume_job_runner
+from model_registry import register_model, get_model, registry as model_registry, warm_up
 
 # Add the app directory to the path
 sys.path.append(str(Path(__file__).parent))
 
-def calculate_match_score(resume_data: ResumeData, job_title: str, job_description: str) -> Dict[str, Any]:
-    """Calculate a match score between resume and job description"""
+def calculate_match_score(resume_data: ResumeData, job_title: str, job_description: str,
+                          job_profile: Optional[JobProfile] = None) -> Dict[str, Any]:
+    """Calculate a match score between resume and job description.
+    
+    Pass the compiled ``job_profile`` (see ``get_job_profile``) when scoring
+    many resumes against one posting; otherwise it is looked up by text.
+    """
     if not job_description:
         return {
             'score': 0,
@@ -37,74 +50,15 @@ def calculate_match_score(resume_data: ResumeData, job_title: str, job_descripti
             'experience_match': 0
         }
     
-    # Extract skills from job description (simple keyword matching)
-    required_skills = {
-        'python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php',
-        'swift', 'kotlin', 'go', 'rust', 'typescript', 'html', 'css',
-        'django', 'flask', 'react', 'angular', 'vue', 'node', 'spring',
-        'rails', 'laravel', '.net', 'tensorflow', 'pytorch', 'pandas',
-        'numpy', 'docker', 'kubernetes', 'git', 'aws', 'azure', 'gcp',
-        'mongodb', 'postgresql', 'mysql', 'sql', 'nosql', 'linux', 'ci/cd',
-        'jenkins', 'github actions', 'rest', 'graphql', 'api'
-    }
-    
-    # Find matching skills
-    resume_skills = set(skill.lower() for skill in (resume_data.skills or []))
-    job_skills = set()
-    job_desc_lower = job_description.lower()
-    
-    for skill in required_skills:
-        if skill in job_desc_lower:
-            job_skills.add(skill)
-    
-    matched_skills = resume_skills.intersection(job_skills)
-    missing_skills = job_skills - resume_skills
-    
-    # Calculate skill match percentage
-    skill_match = 0
-    if job_skills:
-        skill_match = len(matched_skills) / len(job_skills) * 100
-    
-    # Check experience level (very basic)
-    experience_match = 0
-    if resume_data.experience:
-        # Simple check for seniority in job title/description
-        seniority_keywords = {
-            'junior': 1,
-            'mid-level': 2,
-            'senior': 3,
-            'lead': 4,
-            'principal': 5,
-            'architect': 5
-        }
-        
-        # Check job title for seniority
-        job_level = 2  # Default to mid-level
-        for keyword, level in seniority_keywords.items():
-            if keyword in job_title.lower() or keyword in job_description.lower():
-                job_level = level
-                break
-        
-        # Count years of experience (very rough estimate)
-        exp_years = 0
-        for exp in resume_data.experience:
-            if 'duration' in exp:
-                # Try to extract years from duration (simplified)
-                years = re.findall(r'\d+', exp['duration'])
-                if years:
-                    exp_years += int(years[0])
-        
-        # Simple experience match (0-100)
-        experience_match = min(exp_years / 10 * 100, 100)  # Cap at 10+ years
-    
-    # Calculate overall score (weighted average)
-    overall_score = (skill_match * 0.7) + (experience_match * 0.3)
+    if job_profile is None:
+        job_profile = get_text_profile(job_description, job_title)
+    result = score_resume(resume_data, job_profile, 'match')
     
     return {
-        'score': round(overall_score, 1),
-        'matched_skills': list(matched_skills),
-        'missing_skills': list(missing_skills),
-        'experience_match': round(experience_match, 1)
+        'score': result.score,
+        'matched_skills': result.matched_skills,
+        'missing_skills': result.missing_skills,
+        'experience_match': round(result.components['experience_years'], 1)
     }
 
 def time_ago(dt):
@@ -184,6 +138,8 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # Initialize extensions
 db.init_app(app)
+# Schema changes ship as revisions in migrations/: run `flask db upgrade` after
+# updating (db.create_all() below only creates missing tables, never new columns)
 migrate = Migrate(app, db)
 csrf = CSRFProtect(app)
 
@@ -277,7 +233,13 @@ class MockDB:
                     file_type='application/pdf',
                     file_size=1024 * 1024,  # 1MB
                     parsed_data={
-                        'skills': ['Python', 'JavaScript', 'SQL', 'Docker', 'AWS'],
+                        'skills': [
+                            {'name': 'Python', 'category': 'programming'},
+                            {'name': 'JavaScript', 'category': 'programming'},
+                            {'name': 'SQL', 'category': 'database'},
+                            {'name': 'Docker', 'category': 'devops'},
+                            {'name': 'AWS', 'category': 'cloud'}
+                        ],
                         'experience': [
                             {
                                 'title': 'Senior Software Engineer',
@@ -297,15 +259,17 @@ class MockDB:
                     }
                 )
                 db.session.add(resume)
+                db.session.flush()  # Get the resume ID
                 
-                # Create a sample application
+                # Create a sample application, scored with its components so `flask rescore` can re-weight it
                 application = Application(
                     candidate_id=candidate.id,
-                    job_posting_id=1,  # Assuming there's a job posting with ID 1
+                    job_posting_id=job.id,
                     resume_id=resume.id,
-                    status=data['status'],
-                    ats_score=data['ats_score']
+                    status=data['status']
                 )
+                store_score_components(application, score_resume(ResumeData.from_dict(resume.parsed_data),
+                                                                 get_job_profile(job), 'ats'))
                 db.session.add(application)
                 
                 # For some candidates, create interviews
@@ -669,6 +633,57 @@ def exit_route():
         except Exception as e:
             return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def refresh_onboarding_candidate(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an onboarding candidate's resume analysis from its finished resume job"""
+    job = ResumeJob.query.get(candidate['resume_job_id']) if candidate.get('resume_job_id') else None
+    if job is None or job.status not in ('done', 'failed'):
+        return candidate
+    if job.status == 'failed':
+        return {**candidate, 'status': 'Failed', 'error': job.error}
+    
+    result = job.result or {}
+    # Get experience in years
+    experience_years = 0
+    for exp in result.get('experience') or []:
+        if 'start_date' in exp and exp['start_date']:
+            try:
+                start_year = int(exp['start_date'].split('-')[0])
+                end_year = datetime.now().year
+                if 'end_date' in exp and exp['end_date'] and exp['end_date'].lower() != 'present':
+                    end_year = int(exp['end_date'].split('-')[0])
+                experience_years += (end_year - start_year)
+            except (ValueError, IndexError):
+                pass
+    
+    name = result.get('name') or 'New Candidate'
+    education = result.get('education') or []
+    return {
+        **candidate,
+        'name': name,
+        'email': result.get('email') or candidate['email'],
+        'status': 'New',
+        'resume_analysis': {
+            'match_score': result.get('match_score', 0),
+            'matched_skills': result.get('matched_skills', []),
+            'missing_skills': result.get('missing_skills', []),
+            'skills': result.get('skills', []),
+            'experience': f"{experience_years} years" if experience_years > 0 else 'Not specified',
+            'education': education[0].get('degree', 'Not specified') if education else 'Not specified',
+            'status': 'Pending Review',
+            'summary': 'No summary available',
+            'experience_details': [
+                {
+                    'title': exp.get('title', 'Not specified'),
+                    'company': exp.get('company', 'Not specified'),
+                    'duration': f"{exp.get('start_date', '')} - {exp.get('end_date', 'Present')}",
+                    'description': exp.get('description', 'No description')
+                }
+                for exp in (result.get('experience') or [])[:3]  # Show up to 3 most recent experiences
+            ]
+        },
+        'avatar': f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random"
+    }
+
 @app.route('/onboarding', methods=['GET', 'POST'])
 def onboarding_route():
     # Get onboarding data
@@ -729,76 +744,37 @@ def onboarding_route():
                     
                     # Generate a unique filename
                     filename = secure_filename(resume_file.filename)
-                    filepath = os.path.join(uploads_dir, filename)
+                    filepath = os.path.join(uploads_dir, f"{uuid.uuid4().hex[:8]}_{filename}")
                     resume_file.save(filepath)
                     
-                    # Parse the resume
-                    parser = ResumeParser()
-                    resume_data = parser.parse_resume(filepath)
-                    
-                    # Calculate match score based on job requirements
-                    required_skills = set(skill.lower() for skill in selected_job['required_skills'])
-                    candidate_skills = set(skill.lower() for skill in (resume_data.skills or []))
-                    matched_skills = required_skills.intersection(candidate_skills)
-                    match_score = int((len(matched_skills) / len(required_skills)) * 100) if required_skills else 0
+                    # Parse and score in the background; the page shows the result once the job is done
+                    job = enqueue_resume_job(file_path=filepath, file_name=filename,
+                                             job_title=selected_job['title'],
+                                             job_description=selected_job['description'],
+                                             required_skills=selected_job['required_skills'],
+                                             delete_file=True)
+                    session['resume_job_ids'] = session.get('resume_job_ids', []) + [job.id]
                     
-                    # Get experience in years
-                    experience_years = 0
-                    if resume_data.experience:
-                        for exp in resume_data.experience:
-                            if 'start_date' in exp and exp['start_date']:
-                                try:
-                                    start_year = int(exp['start_date'].split('-')[0])
-                                    end_year = datetime.now().year
-                                    if 'end_date' in exp and exp['end_date'] and exp['end_date'].lower() != 'present':
-                                        end_year = int(exp['end_date'].split('-')[0])
-                                    experience_years += (end_year - start_year)
-                                except (ValueError, IndexError):
-                                    pass
-                    
-                    # Create a new candidate from the parsed resume
                     new_candidate = {
                         'id': len(candidates) + 1,
-                        'name': f"{resume_data.first_name} {resume_data.last_name}".strip() or 'New Candidate',
-                        'email': resume_data.email or f"candidate{len(candidates) + 1}@example.com",
+                        'name': 'New Candidate',
+                        'email': f"candidate{len(candidates) + 1}@example.com",
                         'position': selected_job['title'],
-                        'status': 'New',
+                        'status': 'Processing',
                         'applied_date': datetime.now().strftime('%Y-%m-%d'),
                         'start_date': (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d'),
                         'resume_uploaded': True,
                         'resume_file': filename,
+                        'resume_job_id': job.id,
                         'job_position': selected_job,
-                        'resume_analysis': {
-                            'match_score': match_score,
-                            'matched_skills': list(matched_skills),
-                            'missing_skills': list(required_skills - candidate_skills),
-                            'skills': resume_data.skills or [],
-                            'experience': f"{experience_years} years" if experience_years > 0 else 'Not specified',
-                            'education': resume_data.education[0]['degree'] if resume_data.education else 'Not specified',
-                            'status': 'Pending Review',
-                            'summary': resume_data.summary or 'No summary available',
-                            'experience_details': [
-                                {
-                                    'title': exp.get('title', 'Not specified'),
-                                    'company': exp.get('company', 'Not specified'),
-                                    'duration': f"{exp.get('start_date', '')} - {exp.get('end_date', 'Present')}",
-                                    'description': exp.get('description', 'No description')
-                                }
-                                for exp in (resume_data.experience or [])[:3]  # Show up to 3 most recent experiences
-                            ]
-                        },
-                        'avatar': f"https://ui-avatars.com/api/?name={resume_data.first_name}+{resume_data.last_name if resume_data.last_name else 'Candidate'}&background=random"
+                        'avatar': "https://ui-avatars.com/api/?name=Candidate&background=random"
                     }
                     
                     # Add the new candidate to the list
                     candidates.append(new_candidate)
                     session['candidates'] = candidates
                     
-                    # Clean up the temporary file
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
-                    
-                    flash(f'Resume uploaded and analyzed! Match score: {match_score}% for {selected_job["title"]}', 'success')
+                    flash(f'Resume uploaded! It is being analyzed for {selected_job["title"]}.', 'success')
                     return redirect(url_for('onboarding_route'))
                 else:
                     flash('No file selected', 'error')
@@ -813,6 +789,11 @@ def onboarding_route():
             flash('Please select both a resume and a job position', 'error')
             return redirect(url_for('onboarding_route'))
     
+    # Fill in uploaded candidates whose background analysis has finished
+    if any(candidate.get('status') == 'Processing' for candidate in candidates):
+        candidates = [refresh_onboarding_candidate(candidate) for candidate in candidates]
+        session['candidates'] = candidates
+    
     # Generate mock candidates if none exist
     if not candidates:
         candidates = [
@@ -1344,23 +1325,20 @@ def interview_route():
                          ai_analysis=ai_analysis,
                          title=f"Interview Evaluation - {candidate['name']}")
 
-# Initialize the NLP chatbot
-try:
-    # Use a relative import from the current package
-    from .nlp.train import NLPChatbot
-    
-    # Global chatbot instance
-    chatbot = NLPChatbot()
-    print("Successfully initialized NLPChatbot")
-except (ImportError, ValueError) as e:
+# The NLP chatbot is created on first use through the model registry
+def _load_chatbot():
+    from app.nlp.train import NLPChatbot
+    return NLPChatbot()
+
+register_model('chatbot', _load_chatbot)
+
+def get_chatbot():
+    """Shared NLPChatbot instance, or None if it could not be initialized"""
     try:
-        # Fallback for direct script execution
-        from app.nlp.train import NLPChatbot
-        chatbot = NLPChatbot()
-        print("Successfully initialized NLPChatbot (fallback import)")
+        return get_model('chatbot')
     except Exception as e:
         print(f"Warning: Could not initialize NLPChatbot: {str(e)}. Some features may not be available.")
-        chatbot = None
+        return None
 
 @app.route('/ai-training')
 @app.route('/ai_training')
@@ -1386,6 +1364,9 @@ def chat():
             return jsonify({'error': 'Empty message'}), 400
             
         # Get response from the chatbot
+        chatbot = get_chatbot()
+        if chatbot is None:
+            return jsonify({'error': 'Chatbot is not available'}), 503
         response = chatbot.get_response(message)
         
         return jsonify({
@@ -1408,6 +1389,9 @@ def train_chatbot():
             return jsonify({'error': 'No training data provided'}), 400
             
         # Train the chatbot with new data
+        chatbot = get_chatbot()
+        if chatbot is None:
+            return jsonify({'error': 'Chatbot is not available'}), 503
         chatbot.train(new_data)
         
         return jsonify({'message': 'Chatbot trained successfully'})
@@ -1653,10 +1637,7 @@ def get_mock_onboarding_data():
     }
 
 def onboarding_route():
-    from resume_parser import ResumeParser
-    
-    # Initialize resume parser
-    resume_parser = ResumeParser()
+    resume_parser = get_resume_parser()
     
     # Sample resume data (in a real app, this would come from file uploads)
     sample_resumes = [
@@ -1840,7 +1821,7 @@ E-commerce Platform
             
             try:
                 # Parse the sample resume
-                parser = ResumeParser()
+                parser = get_resume_parser()
                 resume_data = parser.parse_resume(filepath)
                 
                 # Create a new candidate with parsed data
@@ -1855,7 +1836,7 @@ E-commerce Platform
                     'resume_file': 'sample_resume_1.txt',
                     'resume_analysis': {
                         'match_score': 85,
-                        'skills': resume_data.skills or ['Python', 'Django', 'React', 'AWS', 'Docker'],
+                        'skills': [skill['name'] for skill in resume_data.skills] or ['Python', 'Django', 'React', 'AWS', 'Docker'],
                         'experience': resume_data.experience or '5 years',
                         'education': resume_data.education or 'MSc in Computer Science',
                         'status': 'Sample Resume',
@@ -1897,7 +1878,6 @@ E-commerce Platform
     
     # Handle file upload
     elif request.method == 'POST' and 'resume' in request.files:
-        from resume_parser import ResumeParser
         import os
         import uuid
         
@@ -1913,7 +1893,7 @@ E-commerce Platform
             
             try:
                 # Parse the resume
-                parser = ResumeParser()
+                parser = get_resume_parser()
                 resume_data = parser.parse_resume(filepath)
                 
                 # Create a new candidate with parsed data
@@ -1928,7 +1908,7 @@ E-commerce Platform
                     'resume_file': resume_file.filename,
                     'resume_analysis': {
                         'match_score': 0,  # You can calculate this based on job requirements
-                        'skills': resume_data.skills or [],
+                        'skills': [skill['name'] for skill in resume_data.skills],
                         'experience': resume_data.experience or 'Not specified',
                         'education': resume_data.education or 'Not specified',
                         'status': 'Pending Review',
@@ -2223,6 +2203,7 @@ def add_candidate():
         )
         
         # Handle file upload
+        resume = None
         if 'resume' in request.files:
             file = request.files['resume']
             if file.filename != '':
@@ -2231,7 +2212,7 @@ def add_candidate():
                 os.makedirs(os.path.dirname(filepath), exist_ok=True)
                 file.save(filepath)
                 
-                # Create resume record
+                # Create resume record; it is parsed in the background (see resume_jobs)
                 resume = Resume(
                     candidate=candidate,
                     file_name=filename,
@@ -2257,8 +2238,19 @@ def add_candidate():
         db.session.add(candidate)
         db.session.commit()
         
+        response = {'success': True, 'redirect': url_for('candidate_management')}
+        if resume is not None:
+            # Extract and score once in the background so later analyses never re-open the file
+            job_posting = (JobPosting.query.filter_by(title=position_applied)
+                           .order_by(JobPosting.updated_at.desc()).first()) if position_applied else None
+            job = enqueue_resume_job(file_path=resume.file_path, file_name=resume.file_name,
+                                     resume=resume, candidate=candidate,
+                                     job_posting_id=job_posting.id if job_posting else None,
+                                     job_title=position_applied or "")
+            response.update({'job_id': job.id, 'status_url': url_for('resume_job_status', job_id=job.id)})
+        
         flash('Candidate added successfully!', 'success')
-        return jsonify({'success': True, 'redirect': url_for('candidate_management')})
+        return jsonify(response)
         
     except Exception as e:
         db.session.rollback()
@@ -2282,52 +2274,29 @@ def analyze_resume(resume_text: str, job_title: str) -> Dict[str, Any]:
             'message': 'Resume text and job title are required'
         }
     
-    # Get job description based on job title
-    job_desc = JOB_DESCRIPTIONS.get(job_title, {
-        'required_skills': [],
-        'required_experience': 0,
-        'required_education': [],
-        'keywords': []
-    })
-    
-    # Process resume text with spaCy
-    doc = nlp(resume_text.lower())
-    
-    # Extract skills (simple keyword matching for now)
-    found_skills = []
-    for skill in job_desc['required_skills']:
-        if skill.lower() in resume_text.lower():
-            found_skills.append(skill)
+    # Score against the posting with this title, or the title alone
+    job_posting = (JobPosting.query.filter_by(title=job_title)
+                   .order_by(JobPosting.updated_at.desc()).first())
+    job_profile = get_job_profile(job_posting) if job_posting else get_text_profile(job_title, job_title)
+    result = score_resume(ResumeData(raw_text=resume_text), job_profile, 'mentions')
     
-    # Calculate skills match percentage
-    skill_match = 0
-    if job_desc['required_skills']:
-        skill_match = (len(found_skills) / len(job_desc['required_skills'])) * 100
-    
-    # Check for education
-    education_found = any(edu.lower() in resume_text.lower() for edu in job_desc['required_education'])
-    education_match = 100 if education_found else 0
-    
-    # Check for keywords
-    found_keywords = [kw for kw in job_desc['keywords'] if kw.lower() in resume_text.lower()]
-    keyword_match = 0
-    if job_desc['keywords']:
-        keyword_match = (len(found_keywords) / len(job_desc['keywords'])) * 100
-    
-    # Calculate overall ATS score (weighted average)
-    ats_score = (skill_match * 0.5) + (education_match * 0.2) + (keyword_match * 0.3)
+    found_skills = result.matched_skills
+    skill_match = result.components['skill_mentions']
+    education_found = result.components['education_mention'] > 0
+    keyword_match = result.components['keyword_mentions']
+    ats_score = result.score
     
     # Generate recommendations
     recommendations = []
     if skill_match < 50:
-        missing_skills = [s for s in job_desc['required_skills'] if s.lower() not in [fs.lower() for fs in found_skills]]
+        missing_skills = result.missing_skills
         if missing_skills:
             recommendations.append(f"Consider highlighting these skills: {', '.join(missing_skills[:3])}")
     
-    if not education_found and job_desc['required_education']:
+    if not education_found and job_profile.education_requirements:
         recommendations.append(f"Consider adding education details or relevant certifications")
     
-    if keyword_match < 40 and job_desc['keywords']:
+    if keyword_match < 40 and job_profile.keywords:
         recommendations.append("Incorporate more job-specific keywords from the job description")
     
     if not recommendations:
@@ -2335,14 +2304,14 @@ def analyze_resume(resume_text: str, job_title: str) -> Dict[str, Any]:
     
     return {
         'success': True,
-        'score': round(ats_score, 1),
+        'score': ats_score,
         'matched_skills': found_skills,
-        'missing_skills': [s for s in job_desc['required_skills'] if s.lower() not in [fs.lower() for fs in found_skills]],
+        'missing_skills': result.missing_skills,
         'education_match': 'Yes' if education_found else 'No',
         'keyword_match': f"{int(keyword_match)}%",
         'recommendations': recommendations,
-        'missing_keywords': [kw for kw in job_desc['keywords'] if kw.lower() not in [fk.lower() for fk in found_keywords]],
-        'experience_match': 'Yes' if job_desc['required_experience'] == 0 else 'Check experience',
+        'missing_keywords': result.missing_keywords,
+        'experience_match': 'Check experience',
         'skills_match': f"{int(skill_match)}%"
     }
 
@@ -2364,9 +2333,14 @@ def analyze_candidate_resume(candidate_id):
         }), 404
     
     try:
-        # Read resume content (assuming it's a text file for simplicity)
-        with open(resume.file_path, 'r', encoding='utf-8') as f:
-            resume_text = f.read()
+        # Stored text from upload time; only older resumes are read from file (once)
+        resume_data = load_resume_data(resume)
+        if resume_data is None:
+            return jsonify({
+                'success': False,
+                'message': 'Resume file could not be read'
+            }), 422
+        resume_text = resume_data.raw_text
         
         # Analyze resume
         analysis = analyze_resume(resume_text, candidate.position_applied or 'Data Scientist')
@@ -2409,21 +2383,13 @@ def view_candidate(candidate_id):
         joinedload(Candidate.interviews)
     ).get_or_404(candidate_id)
     
-    # Get similar candidates (same position or similar skills)
-    similar_candidates = []
-    if candidate.position_applied:
-        similar_candidates = Candidate.query.filter(
-            Candidate.id != candidate.id,
-            or_(
-                Candidate.position_applied.ilike(f'%{candidate.position_applied}%'),
-                Candidate.skills.ilike(f'%{candidate.position_applied}%')
-            )
-        ).limit(5).all()
+    # Similar candidates (resume embedding + skill overlap) from the precomputed neighbour graph
+    from candidate_neighbors import similar_candidates
     
     return render_template(
         'candidate_profile.html',
         candidate=candidate,
-        similar_candidates=similar_candidates,
+        similar_candidates=similar_candidates(candidate.id, limit=5),
         now=datetime.utcnow()
     )
 
@@ -2716,123 +2682,69 @@ def get_recruitment_pipeline():
     return jsonify(pipeline_data)
 
 
-"""
-    API endpoint to get top candidates data with enhanced mock data.
+@app.route('/api/top-candidates')
+def get_top_candidates():
+    """
+    API endpoint ranking candidates for a job posting by resume/job embedding similarity.
+    
+    Query parameters: ``job_id`` (default: the most recently updated active
+    posting), ``limit`` (default 30) and ``nprobe`` (IVF cells searched once
+    the store is large enough for the ANN index, at most all of them; see
+    ann_index). A non-positive ``nprobe`` is a 400.
     
     Returns:
         JSON: List of top candidates with detailed information
     """
-@app.route('/api/top-candidates')
-def get_top_candidates():
-    # More comprehensive position titles
-    positions = [
-        'Senior Software Engineer', 'Frontend Developer', 'Backend Developer',
-        'Full Stack Developer', 'DevOps Engineer', 'Data Scientist',
-        'Machine Learning Engineer', 'Mobile Developer', 'QA Engineer',
-        'Product Manager', 'UX/UI Designer', 'Technical Lead',
-        'Cloud Architect', 'Data Engineer', 'Security Engineer',
-        'Site Reliability Engineer', 'Engineering Manager', 'CTO'
-    ]
+    if 'user_role' not in session or session['user_role'] != 'hr':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
     
-    # More detailed candidate statuses with realistic weights
-    statuses = [
-        {'status': 'New Application', 'weight': 25},
-        {'status': 'Resume Review', 'weight': 20},
-        {'status': 'Phone Screen Scheduled', 'weight': 15},
-        {'status': 'Technical Assessment', 'weight': 15},
-        {'status': 'Onsite Interview', 'weight': 10},
-        {'status': 'Final Interview', 'weight': 8},
-        {'status': 'Reference Check', 'weight': 5},
-        {'status': 'Offer Extended', 'weight': 2}
-    ]
+    from embedding_index import rank_candidates
     
-    # Skills matrix for different roles
-    role_skills = {
-        'Senior Software Engineer': ['Python', 'Java', 'System Design', 'Algorithms', 'Microservices'],
-        'Frontend Developer': ['React', 'TypeScript', 'JavaScript', 'HTML/CSS', 'Redux'],
-        'Backend Developer': ['Node.js', 'Python', 'Java', 'REST APIs', 'Databases'],
-        'DevOps Engineer': ['AWS', 'Docker', 'Kubernetes', 'CI/CD', 'Terraform'],
-        'Data Scientist': ['Python', 'Machine Learning', 'Pandas', 'SQL', 'Statistics']
-    }
+    job_id = request.args.get('job_id', type=int)
+    limit = min(max(request.args.get('limit', 30, type=int), 1), 200)
+    nprobe = request.args.get('nprobe', type=int)  # ANN recall/latency trade-off on large stores
+    if 'nprobe' in request.args and (nprobe is None or nprobe < 1):
+        return jsonify({'error': 'nprobe must be a positive integer'}), 400
+    if job_id is not None:
+        job_posting = JobPosting.query.get_or_404(job_id)
+    else:
+        job_posting = (JobPosting.query.filter_by(is_active=True)
+                       .order_by(JobPosting.updated_at.desc()).first())
+    if job_posting is None:
+        return jsonify({'total': 0, 'job_id': None, 'candidates': []})
     
-    # Common first and last names for realistic candidate names
-    first_names = ['James', 'John', 'Robert', 'Michael', 'William', 'David', 'Richard', 'Joseph',
-                  'Thomas', 'Charles', 'Mary', 'Patricia', 'Jennifer', 'Linda', 'Elizabeth',
-                  'Barbara', 'Susan', 'Jessica', 'Sarah', 'Karen', 'Lisa', 'Nancy', 'Betty']
-    last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
-                 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson',
-                 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Thompson', 'White']
+    try:
+        matches = rank_candidates(job_posting, k=limit, nprobe=nprobe)
+    except Exception as e:
+        print(f"Error ranking candidates for job {job_posting.id}: {str(e)}")
+        return jsonify({'error': 'Candidate ranking is unavailable'}), 503
     
+    candidates = {c.id: c for c in Candidate.query.filter(Candidate.id.in_([m.candidate_id for m in matches]))}
+    resumes = {r.id: r for r in Resume.query.filter(Resume.id.in_([m.resume_id for m in matches]))}
     top_candidates = []
-    
-    for i in range(1, 31):  # Generate 30 top candidates
-        # Select a random position and get relevant skills
-        position = random.choice(positions)
-        skills = []
-        
-        # Get relevant skills for the position if available, otherwise use common skills
-        for role, role_skills_list in role_skills.items():
-            if role.lower() in position.lower():
-                skills = role_skills_list
-                break
-        
-        if not skills:  # If no specific skills found, use common ones
-            skills = ['Python', 'JavaScript', 'SQL', 'Git', 'REST APIs', 'Problem Solving']
-        
-        # Add 2-4 more random skills
-        all_skills = [
-            'React', 'Node.js', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP',
-            'TypeScript', 'Java', 'C#', 'Go', 'Ruby', 'PHP', 'Swift', 'Kotlin',
-            'Machine Learning', 'Data Analysis', 'Big Data', 'AI', 'Blockchain',
-            'Cybersecurity', 'DevOps', 'Agile', 'Scrum', 'TDD', 'CI/CD', 'Microservices'
-        ]
-        
-        additional_skills = random.sample(
-            [s for s in all_skills if s not in skills],
-            k=random.randint(2, 4)
-        )
-        skills.extend(additional_skills)
-        
-        # Generate candidate details
-        first_name = random.choice(first_names)
-        last_name = random.choice(last_names)
-        email = f"{first_name.lower()}.{last_name.lower()}{i}@example.com"
-        
-        # Generate a realistic score (80-100 for top candidates)
-        score = random.randint(80, 100)
-        
-        # Select status with weights
-        status = random.choices(
-            [s['status'] for s in statuses],
-            weights=[s['weight'] for s in statuses],
-            k=1
-        )[0]
-        
-        candidate = {
-            'id': f"TC{i:03d}",
-            'name': f"{random.choice(['John', 'Jane', 'Robert', 'Emily', 'Michael', 'Sarah'])} {random.choice(['Smith', 'Johnson', 'Williams', 'Brown', 'Jones'])}",
-            'email': f"candidate.top{i}@example.com",
-            'phone': f"+1 (555) {random.randint(100, 999)}-{random.randint(1000, 9999)}",
-            'position': random.choice(positions),
-            'score': score,
-            'status': status,
-            'experience': f"{random.randint(2, 15)}+ years",
-            'location': f"{random.choice(['San Francisco', 'New York', 'Remote', 'Austin', 'Seattle'])}",
-            'last_updated': (datetime.now() - timedelta(days=random.randint(1, 14))).strftime('%Y-%m-%d'),
-            'skills': [
-                random.choice(['Python', 'JavaScript', 'Java', 'C++', 'TypeScript']),
-                random.choice(['React', 'Node.js', 'Django', 'Spring', 'Angular']),
-                random.choice(['AWS', 'Docker', 'Kubernetes', 'CI/CD'])
-            ]
-        }
-        
-        top_candidates.append(candidate)
-    
-    # Sort by score in descending order
-    top_candidates.sort(key=lambda x: x['score'], reverse=True)
+    for match in matches:
+        candidate = candidates.get(match.candidate_id)
+        if candidate is None:
+            continue
+        resume = resumes.get(match.resume_id)
+        parsed = (resume.parsed_data if resume else None) or {}
+        top_candidates.append({
+            'id': candidate.id,
+            'name': f"{candidate.first_name} {candidate.last_name}".strip(),
+            'email': candidate.email,
+            'phone': candidate.phone,
+            'position': job_posting.title,
+            'score': round(max(match.similarity, 0.0) * 100, 1),
+            'ats_score': candidate.ats_score,
+            'status': candidate.status,
+            'resume_id': match.resume_id,
+            'last_updated': candidate.updated_at.strftime('%Y-%m-%d') if candidate.updated_at else None,
+            'skills': [skill['name'] for skill in parsed.get('skills', [])[:5]]
+        })
     
     return jsonify({
         'total': len(top_candidates),
+        'job_id': job_posting.id,
         'candidates': top_candidates
     })
 
@@ -3601,12 +3513,18 @@ def submit_resume():
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
             file.save(filepath)
             
-            # Process the resume (in a real app, you'd use a resume parser here)
-            resume_info = process_resume_data({
+            # Parse the resume in the background; the job id lets the page poll for the result
+            job = enqueue_resume_job(file_path=filepath, file_name=filename,
+                                     job_title=request.form.get('position', 'Software Developer'))
+            session['resume_job_ids'] = session.get('resume_job_ids', []) + [job.id]
+            resume_info = {
                 'filename': filename,
                 'content_type': file.content_type,
-                'size': os.path.getsize(filepath)
-            }, filename)
+                'size': os.path.getsize(filepath),
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': url_for('resume_job_status', job_id=job.id)
+            }
         else:
             flash('Invalid file type. Please upload a PDF, DOC, or DOCX file.', 'error')
             return redirect(url_for('candidate_resume_upload'))
@@ -3756,8 +3674,11 @@ from functools import wraps
 import json
 from datetime import datetime
 
-# Initialize the question bank
-question_bank = InterviewQuestionBank()
+# The question bank is loaded from disk on first use
+register_model('question_bank', InterviewQuestionBank)
+
+def get_question_bank() -> InterviewQuestionBank:
+    return get_model('question_bank')
 
 def candidate_required(f):
     """Decorator to ensure the user is logged in as a candidate."""
@@ -3805,15 +3726,15 @@ def get_questions():
     questions = []
     
     if category:
-        questions = question_bank.get_questions_by_category(category)
+        questions = get_question_bank().get_questions_by_category(category)
     elif difficulty:
-        questions = question_bank.get_questions_by_difficulty(difficulty)
+        questions = get_question_bank().get_questions_by_difficulty(difficulty)
     elif tag:
-        questions = question_bank.get_questions_by_tag(tag)
+        questions = get_question_bank().get_questions_by_tag(tag)
     elif search:
-        questions = question_bank.search_questions(search)
+        questions = get_question_bank().search_questions(search)
     else:
-        questions = list(question_bank.questions.values())
+        questions = list(get_question_bank().questions.values())
     
     return jsonify({
         'success': True,
@@ -3827,7 +3748,7 @@ def get_question_categories():
     """Get all unique categories."""
     return jsonify({
         'success': True,
-        'categories': question_bank.get_all_categories()
+        'categories': get_question_bank().get_all_categories()
     })
 
 @app.route('/api/interview-questions/tags', methods=['GET'])
@@ -3836,7 +3757,7 @@ def get_question_tags():
     """Get all unique tags."""
     return jsonify({
         'success': True,
-        'tags': question_bank.get_all_tags()
+        'tags': get_question_bank().get_all_tags()
     })
 
 @app.route('/api/interview-questions/random', methods=['GET'])
@@ -3846,7 +3767,7 @@ def get_random_question():
     category = request.args.get('category')
     difficulty = request.args.get('difficulty')
     
-    question = question_bank.get_random_question(category, difficulty)
+    question = get_question_bank().get_random_question(category, difficulty)
     
     if not question:
         return jsonify({
@@ -3876,7 +3797,7 @@ def create_question():
                 }), 400
         
         # Create the question
-        question = question_bank.add_question(data)
+        question = get_question_bank().add_question(data)
         
         return jsonify({
             'success': True,
@@ -3899,7 +3820,7 @@ def create_question():
 @candidate_required
 def get_question(question_id):
     """Get a specific question by ID."""
-    question = question_bank.get_question(question_id)
+    question = get_question_bank().get_question(question_id)
     
     if not question:
         return jsonify({
@@ -3916,7 +3837,7 @@ def get_question(question_id):
 @admin_required
 def update_question(question_id):
     """Update an existing question (admin only)."""
-    question = question_bank.get_question(question_id)
+    question = get_question_bank().get_question(question_id)
     
     if not question:
         return jsonify({
@@ -3931,7 +3852,7 @@ def update_question(question_id):
         if 'question' in data:
             del data['question']
         
-        updated_question = question_bank.update_question(question_id, data)
+        updated_question = get_question_bank().update_question(question_id, data)
         
         if not updated_question:
             return jsonify({
@@ -3955,13 +3876,13 @@ def update_question(question_id):
 @admin_required
 def delete_question(question_id):
     """Delete a question (admin only)."""
-    if not question_bank.get_question(question_id):
+    if not get_question_bank().get_question(question_id):
         return jsonify({
             'success': False,
             'error': 'Question not found'
         }), 404
     
-    success = question_bank.delete_question(question_id)
+    success = get_question_bank().delete_question(question_id)
     
     if not success:
         return jsonify({
@@ -4746,6 +4667,281 @@ def workflow_route():
     """Route for the workflow page"""
     return render_template('workflow.html')
 
+@app.route('/readyz')
+def readiness_probe():
+    """Readiness probe: 503 while a warm-up is running or after it failed.
+
+    Without SMARTHIRE_WARM_UP models load lazily, so the app is always ready.
+    """
+    status = model_registry.status()
+    ready = status['warm_up'] in ('done', 'not_started')
+    return jsonify(status), (200 if ready else 503)
+
+# Set SMARTHIRE_WARM_UP=1 to load all models in the background at startup
+if os.environ.get('SMARTHIRE_WARM_UP') == '1':
+    warm_up(background=True)
+
+# Start this process's resume job runner now, so jobs left queued or interrupted
+# by a previous process resume without waiting for a request (CLI commands such
+# as ingest-resumes drain them too). The request hook starts a runner in worker
+# processes forked after import.
+get_resume_job_runner(app)
+
+@app.before_request
+def start_resume_job_runner():
+    get_resume_job_runner(app)
+
+# Purged candidates leave the embedding matrix (and so semantic search) once the delete commits
+@db.event.listens_for(Candidate, 'after_delete')
+def queue_candidate_embedding_purge(mapper, connection, candidate):
+    session = db.object_session(candidate) or db.session
+    session.info.setdefault('purged_candidate_ids', set()).add(candidate.id)
+
+@db.event.listens_for(db.session, 'after_commit')
+def purge_candidate_embeddings(session):
+    candidate_ids = session.info.pop('purged_candidate_ids', None)
+    if candidate_ids:
+        from embedding_index import get_embedding_store
+        try:
+            get_embedding_store('resumes').delete(sorted(candidate_ids))
+        except OSError as e:
+            print(f"Could not remove embeddings of candidates {sorted(candidate_ids)}: {str(e)}")
+
+@db.event.listens_for(db.session, 'after_rollback')
+def forget_candidate_embedding_purge(session):
+    session.info.pop('purged_candidate_ids', None)
+
+def enqueue_resume_job(**kwargs) -> ResumeJob:
+    """Create and commit a background job for an uploaded resume and wake the runner"""
+    job = create_resume_job(**kwargs)
+    db.session.commit()
+    runner = get_resume_job_runner(app)
+    if runner is not None:
+        runner.notify()
+    return job
+
+@app.route('/api/resume-jobs/<job_id>', methods=['GET'])
+def resume_job_status(job_id):
+    """Status and (partial) results of a background resume job"""
+    # HR sees every job; anyone else only the jobs their own uploads created
+    if session.get('user_role') != 'hr' and job_id not in session.get('resume_job_ids', []):
+        return jsonify({'error': 'Unauthorized'}), 401
+    job = ResumeJob.query.get_or_404(job_id)
+    return jsonify(job.to_dict())
+
+@app.cli.command('warm-up')
+def warm_up_command():
+    """Load every registered model now and print load times."""
+    warm_up()
+    for name, info in model_registry.status()['models'].items():
+        state = f"{info['load_seconds']}s" if info['loaded'] else f"failed: {info['error']}"
+        click.echo(f'{name:<20} {state}')
+
+@app.cli.command('reload-skills')
+@click.option('--taxonomy', default=None, help='Path to a new skills taxonomy JSON file')
+def reload_skills_command(taxonomy):
+    """Reload the shared parser's skills taxonomy."""
+    count = reload_skills_taxonomy(taxonomy)
+    click.echo(f'Loaded {count} skills')
+
+@app.route('/api/admin/reload-skills', methods=['POST'])
+@admin_required
+def reload_skills_api():
+    """Reload the skills taxonomy in this process without a restart"""
+    taxonomy_path = (request.get_json(silent=True) or {}).get('taxonomy_path')
+    return jsonify({'skills': reload_skills_taxonomy(taxonomy_path)})
+
+@app.route('/api/admin/parse-metrics', methods=['GET'])
+@admin_required
+def parse_metrics_api():
+    """Stage timing and counter histograms of sampled resume parses in this process"""
+    from parse_metrics import metrics_registry
+    snapshot = metrics_registry.snapshot()
+    if request.args.get('reset') in ('1', 'true'):
+        metrics_registry.reset()
+    return jsonify(snapshot)
+
+@app.route('/api/admin/embedding-cache', methods=['GET'])
+@admin_required
+def embedding_cache_api():
+    """Hit rate of the sentence embedding cache in this process"""
+    from embedding_cache import get_embedding_cache
+    return jsonify(get_embedding_cache().stats())
+
+@app.cli.command('rescore')
+@click.option('--weight', 'weights', multiple=True, help='Component weight, e.g. --weight skills=0.5 (repeatable)')
+@click.option('--job-id', type=int, default=None, help='Only applications for this job posting')
+@click.option('--dry-run', is_flag=True, help='Report score and ranking changes without writing')
+@click.option('--backfill', is_flag=True, help='First score applications that have no stored components')
+@click.option('--top', type=int, default=10, help='Ranking cut-off reported per job')
+def rescore_command(weights, job_id, dry_run, backfill, top):
+    """Recompute application ATS scores from stored component scores."""
+    from rescoring import backfill_score_components, reweight_applications
+
+    parsed_weights = None
+    if weights:
+        parsed_weights = {}
+        for item in weights:
+            name, _, value = item.partition('=')
+            try:
+                parsed_weights[name.strip()] = float(value)
+            except ValueError:
+                raise click.BadParameter(f'Expected component=number, got {item!r}', param_hint='--weight')
+
+    if backfill:
+        click.echo(f'Scored {backfill_score_components(job_id)} applications without components')
+
+    try:
+        report = reweight_applications(parsed_weights, job_posting_id=job_id, dry_run=dry_run, top=top)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"Weights: {report.weights}")
+    click.echo(f"{report.changed}/{report.applications} scores change "
+               f"(mean |delta| {report.mean_abs_delta:.2f}, max {report.max_abs_delta:.2f}); "
+               f"{report.skipped} without stored components")
+    for job in report.jobs:
+        click.echo(f"  job {job.job_posting_id}: {job.moved}/{job.applications} move, "
+                   f"max shift {job.max_rank_shift}, top {top} +{job.entered_top} -{job.left_top}")
+    click.echo('Dry run: nothing written' if dry_run else 'Scores updated')
+
+@app.cli.command('ingest-resumes')
+@click.argument('source')
+@click.option('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+@click.option('--batch-size', type=int, default=32, help='Files per worker chunk / nlp.pipe batch')
+@click.option('--job-id', type=int, default=None, help='Score resumes against this job posting')
+@click.option('--no-embed', is_flag=True, help='Skip resume embeddings (run embed-resumes later)')
+def ingest_resumes_command(source, workers, batch_size, job_id, no_embed):
+    """Bulk-parse a directory or manifest of resumes into Candidate/Resume rows."""
+    from candidate_neighbors import update_candidate_neighbors
+    from embedding_index import embed_resumes
+    from resume_ingest import collect_resume_files, ingest_resumes, store_ingest_result
+
+    job_description = ''
+    job_keywords = None
+    if job_id is not None:
+        job = JobPosting.query.get(job_id)
+        if not job:
+            raise click.ClickException(f'Job posting {job_id} not found')
+        job_description = job_posting_text(job)
+        job_keywords = get_job_profile(job).keywords
+
+    file_paths = collect_resume_files(source)
+    click.echo(f'Ingesting {len(file_paths)} resume files...')
+    pending = []
+
+    def commit_pending():
+        # Embed each committed batch for semantic ranking (needs the new row ids) and
+        # link the new candidates into the similar-candidates graph
+        db.session.commit()
+        if pending and not no_embed:
+            try:
+                if embed_resumes([(resume.id, resume.candidate_id, resume_data) for resume, resume_data in pending]):
+                    for candidate_id in dict.fromkeys(resume.candidate_id for resume, _ in pending):
+                        update_candidate_neighbors(candidate_id)
+                    db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                click.echo(f'  embedding failed: {e}', err=True)
+        pending.clear()
+
+    def on_result(result):
+        if result.ok:
+            resume = store_ingest_result(result, commit=False)
+            pending.append((resume, result.resume_data))
+            if len(pending) >= batch_size:
+                commit_pending()
+        else:
+            click.echo(f'  failed: {result.file_path}: {result.error}', err=True)
+
+    stats = ingest_resumes(file_paths, workers=workers, batch_size=batch_size,
+                           job_description=job_description, job_keywords=job_keywords,
+                           on_result=on_result)
+    commit_pending()
+
+    click.echo(f'Parsed {stats.parsed}/{stats.files} files ({stats.failed} failed) '
+               f'in {stats.elapsed:.1f}s - {stats.files_per_second:.1f} files/s')
+
+@app.cli.command('embed-resumes')
+@click.option('--batch-size', type=int, default=256, help='Resumes loaded and encoded per batch')
+@click.option('--compact', is_flag=True, help='Afterwards drop rows superseded by newer resumes')
+def embed_resumes_command(batch_size, compact):
+    """Embed every resume not yet in the embedding matrix (or whose text changed)."""
+    from embedding_index import embed_resume_rows, get_embedding_store
+
+    encoded = 0
+    last_id = 0
+    while True:
+        # Ascending ids, so each candidate ends up ranked by their latest resume
+        batch = Resume.query.filter(Resume.id > last_id).order_by(Resume.id).limit(batch_size).all()
+        if not batch:
+            break
+        encoded += embed_resume_rows(batch)
+        last_id = batch[-1].id
+        db.session.expunge_all()
+    store = get_embedding_store('resumes')
+    click.echo(f'Encoded {encoded} resumes; matrix has {len(store)} rows')
+    if compact:
+        click.echo(f'Dropped {store.compact()} superseded rows')
+
+@app.cli.command('build-ann-index')
+@click.option('--nlist', type=int, default=None, help='IVF cells (default: about 4 * sqrt(resumes))')
+@click.option('--nprobe', type=int, default=None, help='Default cells probed per query')
+@click.option('--compact', is_flag=True, help='First drop superseded and deleted embedding rows')
+def build_ann_index_command(nlist, nprobe, compact):
+    """Train and save the IVF index over the resume embedding matrix."""
+    import time
+    from ann_index import ANN_CONFIG, IVFIndex, reset_ann_index
+    from embedding_index import get_embedding_store
+
+    store = get_embedding_store('resumes')
+    if compact:
+        click.echo(f'Dropped {store.compact()} superseded rows')
+    start = time.perf_counter()
+    index = IVFIndex.build(store, nlist=nlist, nprobe=nprobe or ANN_CONFIG['nprobe'])
+    path = index.save()
+    reset_ann_index(store)
+    stats = index.stats()
+    click.echo(f"Indexed {stats['indexed_rows']} rows into {stats['nlist']} cells "
+               f"(largest {stats['largest_cell']}) in {time.perf_counter() - start:.1f}s -> {path}")
+
+@app.cli.command('build-candidate-neighbors')
+@click.option('--batch-size', type=int, default=500, help='Candidates recomputed per commit')
+def build_candidate_neighbors_command(batch_size):
+    """Recompute the similar-candidates graph for every embedded candidate."""
+    import time
+    from candidate_neighbors import NEIGHBOR_CONFIG, rebuild_candidate_neighbors
+
+    start = time.perf_counter()
+    written = rebuild_candidate_neighbors(batch_size=batch_size)
+    click.echo(f"Stored the {NEIGHBOR_CONFIG['k']} nearest neighbours of {written} candidates "
+               f"in {time.perf_counter() - start:.1f}s")
+
+@app.cli.command('resume-jobs')
+@click.option('--workers', type=int, default=None, help='Worker threads (default: RESUME_JOB_WORKERS)')
+@click.option('--drain', is_flag=True, help='Exit once the queue is empty')
+def resume_jobs_command(workers, drain):
+    """Process queued resume jobs in the foreground."""
+    import time
+    from resume_jobs import FINAL_STATES, RESUME_JOB_CONFIG, ResumeJobRunner, stop_resume_job_runner
+
+    # This command's runner replaces the one started with the app
+    stop_resume_job_runner()
+    runner = ResumeJobRunner(app, workers=workers or max(RESUME_JOB_CONFIG['workers'], 1)).start()
+    click.echo(f'Processing resume jobs with {runner.workers} workers (Ctrl+C to stop)')
+    try:
+        while True:
+            time.sleep(runner.poll_seconds)
+            if drain:
+                pending = ResumeJob.query.filter(ResumeJob.status.notin_(FINAL_STATES)).count()
+                db.session.remove()
+                if not pending:
+                    break
+    except KeyboardInterrupt:
+        pass
+    runner.stop()
+    click.echo(f'Processed {runner.processed} jobs')
+
 if __name__ == '__main__':
     with app.app_context():
         # Only create tables if they don't exist
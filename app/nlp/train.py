@@ -10,16 +10,23 @@ from nltk.corpus import stopwords
 import string
 import pickle
 
-# Download required NLTK data
+from model_registry import register_model, get_model
+
+# Download required NLTK data (on first use via the model registry, not at import)
 def download_nltk_data():
-    nltk.download('punkt', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('stopwords', quiet=True)
+    for resource, path in [('punkt', 'tokenizers/punkt'), ('wordnet', 'corpora/wordnet'),
+                           ('stopwords', 'corpora/stopwords')]:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(resource, quiet=True)
+    return True
 
-download_nltk_data()
+register_model('nltk_chatbot_data', download_nltk_data)
 
 class NLPChatbot:
     def __init__(self):
+        get_model('nltk_chatbot_data')
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english') + list(string.punctuation))
         self.vectorizer = TfidfVectorizer(tokenizer=self._lemmatize_text, stop_words='english')
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the resume parsing and scoring pipeline.
+
+Run individual benchmarks as scripts from the repository root, e.g.
+``python benchmarks/bench_pipeline_views.py``.
+"""
@@ -0,0 +1,84 @@
+"""
+Benchmark: IVF approximate search vs. exact scan of the embedding matrix.
+
+Fills a temporary ``EmbeddingStore`` with N synthetic unit vectors drawn
+around random topic centres (resume embeddings cluster by role the same
+way), builds the IVF index, and runs queries near the centres. Reports
+build time, exact-scan latency, and for each ``nprobe`` the p50/p95
+query latency and recall@k against the exact top k.
+
+    python benchmarks/bench_ann_index.py [--vectors 300000] [--k 30] [--nprobe 4,8,16,32,64]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ann_index import IVFIndex
+from embedding_index import EMBEDDING_CONFIG, EmbeddingStore
+
+
+def synthetic_vectors(rng, count: int, dim: int, topics: int, spread: float) -> np.ndarray:
+    centres = rng.normal(size=(topics, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, topics, count)] + spread * rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def timed(call, repeats):
+    results, seconds = [], []
+    for i in range(repeats):
+        start = time.perf_counter()
+        results.append(call(i))
+        seconds.append(time.perf_counter() - start)
+    return results, np.array(seconds) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--vectors', type=int, default=300000)
+    arg_parser.add_argument('--dim', type=int, default=EMBEDDING_CONFIG['dim'])
+    arg_parser.add_argument('--topics', type=int, default=200, help='cluster centres the vectors are drawn around')
+    arg_parser.add_argument('--spread', type=float, default=0.6, help='noise around each centre')
+    arg_parser.add_argument('--queries', type=int, default=100)
+    arg_parser.add_argument('--k', type=int, default=30)
+    arg_parser.add_argument('--nlist', type=int, default=None)
+    arg_parser.add_argument('--nprobe', default='4,8,16,32,64')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    args = arg_parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingStore('bench', tmp, dim=args.dim)
+        for start in range(0, args.vectors, 100000):
+            count = min(100000, args.vectors - start)
+            ids = np.arange(start, start + count)
+            store.append(ids, ids, np.zeros(count, dtype=np.int64),
+                         synthetic_vectors(rng, count, args.dim, args.topics, args.spread))
+        queries = synthetic_vectors(rng, args.queries, args.dim, args.topics, args.spread)
+
+        start = time.perf_counter()
+        index = IVFIndex.build(store, nlist=args.nlist, seed=args.seed)
+        build_seconds = time.perf_counter() - start
+        stats = index.stats()
+
+        exact, exact_ms = timed(lambda i: {key for key, _, _ in store.top_k(queries[i], args.k)}, args.queries)
+        print(f"{args.vectors} vectors x {args.dim}, {stats['nlist']} cells (largest {stats['largest_cell']}), "
+              f"build {build_seconds:.1f}s, k={args.k}")
+        print(f"{'search':<14}{'p50 (ms)':>10}{'p95 (ms)':>10}{'recall@k':>10}")
+        print(f"{'exact':<14}{np.percentile(exact_ms, 50):>10.2f}{np.percentile(exact_ms, 95):>10.2f}{1.0:>10.3f}")
+        for nprobe in (int(n) for n in args.nprobe.split(',')):
+            found, ms = timed(lambda i: {key for key, _, _ in index.search(queries[i], args.k, nprobe=nprobe)},
+                              args.queries)
+            recall = np.mean([len(found[i] & exact[i]) / len(exact[i]) for i in range(args.queries)])
+            print(f"{f'ivf nprobe={nprobe}':<14}{np.percentile(ms, 50):>10.2f}{np.percentile(ms, 95):>10.2f}"
+                  f"{recall:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark: streaming DOCX extraction vs. the python-docx object model.
+
+Generates a synthetic DOCX corpus (resume paragraphs, a skills table and a
+text box, repeated to the requested size) and reports throughput and peak
+RSS for:
+
+* python-docx  - ``docx.Document(path).paragraphs`` (the previous extractor)
+* stream       - ``docx_text.extract_docx_text`` (iterparse over document.xml)
+
+Each mode runs in its own subprocess so peak RSS is not shared between
+them. Text boxes are written the way Word writes them (a DrawingML copy in
+``mc:Choice`` and a VML copy in ``mc:Fallback``); the streaming extractor
+must return each box's text exactly once.
+
+    python benchmarks/bench_docx_extraction.py [--docs 200] [--repeat 20]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import docx
+from docx.oxml import parse_xml
+from docx_text import extract_docx_text
+from benchmarks.fixtures import SAMPLE_RESUMES
+
+SKILL_ROWS = [
+    ('Languages', 'Python, JavaScript, TypeScript, Go'),
+    ('Frameworks', 'Django, Flask, React, Node.js'),
+    ('Cloud', 'AWS, Docker, Kubernetes, Terraform'),
+    ('Data', 'PostgreSQL, MongoDB, Redis, Kafka')
+]
+
+TEXT_BOX = 'Certifications: AWS Solutions Architect, CKA'
+
+TEXT_BOX_XML = (
+    '<mc:AlternateContent xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:Choice Requires="wps"><w:drawing><wp:anchor><a:graphic>'
+    '<a:graphicData uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">'
+    '<wps:wsp><wps:txbx><w:txbxContent><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:txbxContent></wps:txbx>'
+    '</wps:wsp></a:graphicData></a:graphic></wp:anchor></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent><w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>'
+    '</mc:AlternateContent>'
+)
+
+
+def add_text_box(document, text):
+    """Append a paragraph holding a text box in Word's Choice/Fallback form"""
+    run = document.add_paragraph().add_run()
+    run._r.append(parse_xml(TEXT_BOX_XML.format(text=text)))
+
+
+def python_docx_extract(file_path):
+    doc = docx.Document(file_path)
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip())
+
+
+MODES = {
+    'python-docx': python_docx_extract,
+    'stream': extract_docx_text
+}
+
+
+def write_corpus(directory, docs, repeat):
+    paths = []
+    for i in range(docs):
+        document = docx.Document()
+        for _ in range(repeat):
+            for line in SAMPLE_RESUMES[i % len(SAMPLE_RESUMES)].split('\n'):
+                document.add_paragraph(line)
+            table = document.add_table(rows=len(SKILL_ROWS), cols=2)
+            for row, (label, skills) in enumerate(SKILL_ROWS):
+                table.cell(row, 0).text = label
+                table.cell(row, 1).text = skills
+            add_text_box(document, TEXT_BOX)
+        path = os.path.join(directory, f'resume_{i:04d}.docx')
+        document.save(path)
+        paths.append(path)
+    return paths
+
+
+def peak_rss_kib():
+    """High-water RSS of this process image (``ru_maxrss`` survives fork+exec on Linux)"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_mode(mode, directory):
+    """Extract the whole corpus with one mode (in a fresh process)"""
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+    extract = MODES[mode]
+    baseline = peak_rss_kib()
+    start = time.perf_counter()
+    chars = sum(len(extract(path)) for path in paths)
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_kib()
+    print(json.dumps({
+        'elapsed': elapsed,
+        'chars': chars,
+        'peak_rss_kib': peak,
+        'growth_kib': peak - baseline
+    }))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--docs', type=int, default=200)
+    arg_parser.add_argument('--repeat', type=int, default=20, help='copies of the resume body per document')
+    arg_parser.add_argument('--run-mode', choices=sorted(MODES), help=argparse.SUPPRESS)
+    arg_parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args.run_mode, args.corpus)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_corpus(tmp, args.docs, args.repeat)
+        boxes = extract_docx_text(paths[0]).count(TEXT_BOX)
+        if boxes != args.repeat:
+            raise SystemExit(f"stream extractor returned {boxes} text box copies, expected {args.repeat}")
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"{args.docs} documents, {size / 2 ** 20:.1f} MiB on disk")
+        print(f"{'mode':<13}{'docs/s':>9}{'MiB/s':>9}{'peak RSS (MiB)':>16}{'growth (MiB)':>14}{'chars':>11}")
+
+        for mode in MODES:
+            output = subprocess.run([sys.executable, __file__, '--run-mode', mode, '--corpus', tmp],
+                                    check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            elapsed = result['elapsed']
+            print(f"{mode:<13}{args.docs / elapsed:>9.1f}{size / 2 ** 20 / elapsed:>9.2f}"
+                  f"{result['peak_rss_kib'] / 1024:>16.1f}{result['growth_kib'] / 1024:>14.1f}"
+                  f"{result['chars']:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark suite: ResumeParser stages on a synthetic multi-format corpus.
+
+Generates a seeded corpus of TXT, DOCX and PDF resumes in several sizes
+(see ``benchmarks/corpus.py``) and measures, per stage and format:
+
+* p50 / p95 latency per document (ms)
+* throughput (documents per second)
+* peak Python memory of a single call (tracemalloc, in a separate pass so
+  tracing does not distort the timings)
+
+Stages: ``parse_resume`` end to end, then ``extract_text``, ``extract_name``,
+``_extract_sections``, ``extract_skills`` and ``analyze_resume`` (against the
+fixture job description) on the text extracted from each file. Each
+document is parsed once up front; ``analyze_resume`` is timed on a fresh
+copy of that parse, so it measures the analysis alone.
+
+``--save`` writes the results as a JSON baseline; ``--compare`` prints the
+change against a saved baseline and exits non-zero if any p50 regressed by
+more than ``--tolerance``.
+
+    python benchmarks/bench_parser_suite.py [--per-size 5] [--save baseline.json]
+    python benchmarks/bench_parser_suite.py --compare baseline.json
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from resume_parser import PARSER_VERSION, ResumeData, ResumeParser
+from benchmarks.corpus import FORMATS, SIZES, write_corpus
+from benchmarks.fixtures import SAMPLE_JOB_DESCRIPTION
+
+STAGES = ['parse_resume', 'extract_text', 'extract_name', '_extract_sections', 'extract_skills',
+          'analyze_resume']
+
+
+def _no_setup():
+    return None
+
+
+def stage_calls(parser: ResumeParser, document, text: str, parsed: Dict) -> Dict[str, Tuple[Callable, Callable]]:
+    """``(setup, run)`` per stage on one document; only ``run(setup())`` is measured"""
+    return {
+        'parse_resume': (_no_setup, lambda _: parser.parse_resume(document.path)),
+        'extract_text': (_no_setup, lambda _: parser.extract_text(document.path)),
+        'extract_name': (_no_setup, lambda _: parser.extract_name(text)),
+        '_extract_sections': (_no_setup, lambda _: parser._extract_sections(text)),
+        'extract_skills': (_no_setup, lambda _: parser.extract_skills(text)),
+        # A fresh copy of the parse each time, so repeated analyses do not accumulate
+        'analyze_resume': (lambda: ResumeData.from_dict(copy.deepcopy(parsed), raw_text=text),
+                           lambda resume_data: parser.analyze_resume(resume_data, SAMPLE_JOB_DESCRIPTION))
+    }
+
+
+def run_suite(documents, rounds: int, trace_memory: bool = True) -> Dict:
+    # No parse cache and no sandbox: measure the parser itself, in-process
+    parser = ResumeParser()
+    texts = {document.path: parser.extract_text(document.path) for document in documents}
+    # Parsed once, outside every timer; analyze_resume runs on copies
+    parsed = {path: parser.parse_text(text).to_dict() for path, text in texts.items()}
+
+    def calls(document):
+        return stage_calls(parser, document, texts[document.path], parsed[document.path])
+
+    # Warm up models and lazily built state (spaCy, job profile) once
+    for setup, run in calls(documents[0]).values():
+        run(setup())
+
+    timings: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for _ in range(rounds):
+        for document in documents:
+            for stage, (setup, run) in calls(document).items():
+                arg = setup()
+                start = time.perf_counter()
+                run(arg)
+                timings[stage][document.format].append(time.perf_counter() - start)
+
+    peaks: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    if trace_memory:
+        for document in documents:
+            for stage, (setup, run) in calls(document).items():
+                arg = setup()
+                tracemalloc.start()
+                run(arg)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                peaks[stage][document.format] = max(peaks[stage][document.format], peak)
+
+    results = {}
+    for stage in STAGES:
+        results[stage] = {}
+        for fmt, samples in timings[stage].items():
+            samples = np.array(samples)
+            results[stage][fmt] = {
+                'n': len(samples),
+                'p50_ms': round(float(np.percentile(samples, 50)) * 1000, 3),
+                'p95_ms': round(float(np.percentile(samples, 95)) * 1000, 3),
+                'docs_per_second': round(len(samples) / float(samples.sum()), 2),
+                'peak_kib': round(peaks[stage][fmt] / 1024, 1) if trace_memory else None
+            }
+    return results
+
+
+def print_results(results: Dict) -> None:
+    print(f"{'stage':<19}{'format':<7}{'p50 (ms)':>10}{'p95 (ms)':>10}{'docs/s':>10}{'peak (KiB)':>12}")
+    for stage, formats in results.items():
+        for fmt, row in formats.items():
+            peak = f"{row['peak_kib']:>12.1f}" if row['peak_kib'] is not None else f"{'-':>12}"
+            print(f"{stage:<19}{fmt:<7}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+                  f"{row['docs_per_second']:>10.1f}{peak}")
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> bool:
+    """Print p50/p95 changes against a baseline; False if any p50 regressed past ``tolerance``"""
+    ok = True
+    print(f"\nvs. baseline from {baseline['meta']['created_at']} "
+          f"(parser version {baseline['meta']['parser_version']})")
+    print(f"{'stage':<19}{'format':<7}{'p50 change':>12}{'p95 change':>12}")
+    for stage, formats in results.items():
+        for fmt, row in formats.items():
+            before = baseline['results'].get(stage, {}).get(fmt)
+            if not before:
+                continue
+            p50 = row['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0.0
+            p95 = row['p95_ms'] / before['p95_ms'] - 1 if before['p95_ms'] else 0.0
+            flag = ''
+            if p50 > tolerance:
+                flag = '  REGRESSION'
+                ok = False
+            print(f"{stage:<19}{fmt:<7}{p50:>+11.1%}{p95:>+12.1%}{flag}")
+    return ok
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--seed', type=int, default=42)
+    arg_parser.add_argument('--per-size', type=int, default=5, help='resumes per size and format')
+    arg_parser.add_argument('--sizes', default=','.join(SIZES))
+    arg_parser.add_argument('--formats', default=','.join(FORMATS))
+    arg_parser.add_argument('--rounds', type=int, default=3, help='timed passes over the corpus')
+    arg_parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    arg_parser.add_argument('--save', metavar='PATH', help='write the results as a JSON baseline')
+    arg_parser.add_argument('--compare', metavar='PATH', help='compare against a JSON baseline')
+    arg_parser.add_argument('--tolerance', type=float, default=0.10, help='allowed p50 slowdown (0.10 = 10%%)')
+    args = arg_parser.parse_args()
+
+    sizes = args.sizes.split(',')
+    formats = args.formats.split(',')
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = write_corpus(tmp, seed=args.seed, per_size=args.per_size, formats=formats, sizes=sizes)
+        print(f"{len(documents)} documents (seed {args.seed}; sizes {', '.join(sizes)}; "
+              f"formats {', '.join(formats)}), {args.rounds} rounds")
+        results = run_suite(documents, args.rounds, trace_memory=not args.no_memory)
+
+    print_results(results)
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'parser_version': PARSER_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'seed': args.seed,
+            'per_size': args.per_size,
+            'sizes': sizes,
+            'formats': formats,
+            'rounds': args.rounds
+        },
+        'results': results
+    }
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('seed') != args.seed or baseline['meta'].get('sizes') != sizes:
+            print("warning: baseline was recorded on a different corpus")
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: bounded streaming PDF extraction vs. unbounded concatenation.
+
+Generates a large text PDF (300 pages by default) and reports wall time and
+peak Python memory (tracemalloc) for:
+
+* legacy   - every page appended with ``text +=``
+* stream   - ResumeParser.extract_pdf_with_limits with limits lifted
+* bounded  - ResumeParser.extract_pdf_with_limits with the default limits
+
+    python benchmarks/bench_pdf_extraction.py [--pages 300]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import PyPDF2
+from resume_parser import ResumeParser
+from benchmarks.fixtures import SAMPLE_RESUMES
+from benchmarks.pdf_writer import write_text_pdf
+
+
+def legacy_extract(file_path):
+    """The original extract_text_from_pdf body"""
+    text = ""
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        for i, page in enumerate(reader.pages, 1):
+            page_text = page.extract_text()
+            if page_text:
+                text += f"\n--- Page {i} ---\n{page_text}\n"
+    return text.strip()
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--pages', type=int, default=300)
+    args = arg_parser.parse_args()
+
+    lines = [line for text in SAMPLE_RESUMES for line in text.split('\n') if line.strip()]
+    pages = [lines[(i * 50) % len(lines):] + lines[:(i * 50) % len(lines)] for i in range(args.pages)]
+    pages = [page[:60] for page in pages]
+
+    parser = ResumeParser()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'large.pdf')
+        write_text_pdf(path, pages)
+        print(f"{args.pages}-page PDF, {os.path.getsize(path) / 1024:.0f} KiB")
+        print(f"{'mode':<10}{'time (s)':>10}{'peak (MiB)':>12}{'chars':>10}  stopped by")
+
+        runs = {
+            'legacy': lambda: (legacy_extract(path), {'stopped_by': None}),
+            'stream': lambda: parser.extract_pdf_with_limits(path, max_pages=10 ** 6, max_chars=10 ** 9,
+                                                             time_budget=10 ** 6, max_words=10 ** 9),
+            'bounded': lambda: parser.extract_pdf_with_limits(path),
+        }
+        for mode, run in runs.items():
+            elapsed, peak, (text, info) = measure(run)
+            print(f"{mode:<10}{elapsed:>10.2f}{peak / 2 ** 20:>12.1f}{len(text):>10}  {info['stopped_by']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: page-parallel vs. serial PDF extraction by document length.
+
+Generates text PDFs of increasing page counts and times serial extraction
+against ``pdf_parallel.iter_pages_parallel`` on a warm pool, checking both
+return the same pages. The crossover is the shortest document for which
+the parallel path wins; ``PDF_PARALLEL['min_pages']`` should sit near it.
+
+A second table covers the common early stop: ``extract_pdf_with_limits``
+reads at most ``max_pages + 1`` pages but usually stops on the ATS word
+limit after a few. It reads ``--stop-after`` pages of such a document with
+different ``ahead`` windows and times both the read and the drain (the
+ranges still running behind the stop), i.e. the work thrown away.
+
+    python benchmarks/bench_pdf_parallel.py [--pages 5,10,20,40,80,160] [--workers 4] [--stop-after 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pdf_parallel import PDF_PARALLEL, extract_page_range, get_page_pool, iter_pages_parallel, shutdown_page_pool
+from resume_parser import PDF_EXTRACTION_LIMITS
+from benchmarks.fixtures import SAMPLE_RESUMES
+from benchmarks.pdf_writer import write_text_pdf
+
+
+def best_of(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def warm_pool(workers):
+    pool = get_page_pool(workers)
+    # Start every worker before timing anything
+    list(pool.map(abs, range(workers * 4)))
+    return pool
+
+
+def drain_seconds(workers):
+    """Seconds until ranges still running finish, measured by a waiting pool shutdown"""
+    start = time.perf_counter()
+    shutdown_page_pool(wait=True)
+    seconds = time.perf_counter() - start
+    warm_pool(workers)
+    return seconds
+
+
+def early_stop(path, page_count, stop_after, workers, ahead, idle_shutdown):
+    """Seconds to read ``stop_after`` pages, and spent afterwards on ranges already running"""
+    start = time.perf_counter()
+    pages = iter_pages_parallel(path, page_count, workers=workers, ahead=ahead)
+    for page_number, _ in pages:
+        if page_number >= stop_after:
+            break
+    pages.close()
+    read = time.perf_counter() - start
+    return read, max(0.0, drain_seconds(workers) - idle_shutdown)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--pages', default='5,10,20,40,80,160', help='comma-separated page counts')
+    arg_parser.add_argument('--workers', type=int, default=PDF_PARALLEL['workers'])
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--stop-after', type=int, default=10, help='pages read before the early stop')
+    args = arg_parser.parse_args()
+
+    lines = [line for text in SAMPLE_RESUMES for line in text.split('\n') if line.strip()]
+    page_counts = [int(count) for count in args.pages.split(',')]
+    print(f"{args.workers} workers, {os.cpu_count()} CPUs, "
+          f"min_pages_per_task={PDF_PARALLEL['min_pages_per_task']}")
+
+    warm_pool(args.workers)
+
+    print(f"{'pages':>6}{'serial (s)':>12}{'parallel (s)':>14}{'speedup':>9}")
+    crossover = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in page_counts:
+            path = os.path.join(tmp, f'{count}.pdf')
+            write_text_pdf(path, [lines[(i * 7) % len(lines):][:60] for i in range(count)])
+
+            serial, serial_pages = best_of(lambda: extract_page_range(path, 1, count), args.repeat)
+            parallel, parallel_pages = best_of(
+                lambda: list(iter_pages_parallel(path, count, workers=args.workers)), args.repeat)
+            if serial_pages != parallel_pages:
+                raise SystemExit(f"{count} pages: parallel output differs from serial")
+            if crossover is None and parallel < serial:
+                crossover = count
+            print(f"{count:>6}{serial:>12.3f}{parallel:>14.3f}{serial / parallel:>8.2f}x")
+        print(f"crossover: {f'{crossover} pages' if crossover else 'none in this range'} "
+              f"(PDF_PARALLEL['min_pages'] = {PDF_PARALLEL['min_pages']})")
+
+        count = PDF_EXTRACTION_LIMITS['max_pages'] + 1
+        path = os.path.join(tmp, f'{count}.pdf')
+        write_text_pdf(path, [lines[(i * 7) % len(lines):][:60] for i in range(count)])
+        print(f"\nearly stop after {args.stop_after} of {count} pages")
+        print(f"{'read':<14}{'read (s)':>10}{'wasted (s)':>12}")
+        serial, _ = best_of(lambda: extract_page_range(path, 1, args.stop_after), args.repeat)
+        print(f"{'serial':<14}{serial:>10.3f}{0.0:>12.3f}")
+        # Shutting down an idle pool is the baseline of the drain measurement
+        idle_shutdown = min(drain_seconds(args.workers) for _ in range(args.repeat))
+        for ahead in sorted({1, args.workers - 1}):
+            runs = [early_stop(path, count, args.stop_after, args.workers, ahead, idle_shutdown)
+                    for _ in range(args.repeat)]
+            read, wasted = min(runs)
+            print(f"{f'ahead={ahead}':<14}{read:>10.3f}{wasted:>12.3f}")
+
+    shutdown_page_pool()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: trimmed spaCy pipeline views vs. the full pipeline.
+
+Runs the spaCy-backed stages of ResumeParser (extract_name,
+_extract_keywords) once with the stage-specific pipeline views and once
+through the full ``nlp()`` pipeline, checks the outputs are identical on the
+fixed corpus and reports CPU time per resume for each stage.
+
+    python benchmarks/bench_pipeline_views.py [--rounds 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from resume_parser import ResumeParser
+from benchmarks.fixtures import SAMPLE_RESUMES, SAMPLE_JOB_DESCRIPTION
+
+
+class FullPipelineParser(ResumeParser):
+    """Parser that runs every component for every stage (the previous behaviour)"""
+
+    def _process(self, view, text):
+        return self.nlp(text)
+
+    def _process_many(self, view, texts, batch_size=32):
+        return self.nlp.pipe(texts, batch_size=batch_size)
+
+
+STAGES = {
+    'extract_name': lambda p, text, sections: p.extract_name(text),
+    '_extract_keywords': lambda p, text, sections: sorted(p._extract_keywords(SAMPLE_JOB_DESCRIPTION)),
+}
+
+
+def time_stage(parser, stage, rounds):
+    """CPU seconds per resume for one stage, plus the outputs of the last round"""
+    func = STAGES[stage]
+    corpus = [(text, parser._extract_sections(text)) for text in SAMPLE_RESUMES]
+    outputs = []
+    start = time.process_time()
+    for _ in range(rounds):
+        outputs = [func(parser, text, sections) for text, sections in corpus]
+    elapsed = time.process_time() - start
+    return elapsed / (rounds * len(corpus)), outputs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--rounds', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    full, trimmed = FullPipelineParser(), ResumeParser()
+    print(f"Model pipeline: {', '.join(trimmed.nlp.pipe_names)}")
+    print(f"{'stage':<20}{'full (ms)':>12}{'view (ms)':>12}{'saved':>9}  identical")
+
+    total_full = total_view = 0.0
+    mismatches = []
+    for stage in STAGES:
+        full_time, full_out = time_stage(full, stage, args.rounds)
+        view_time, view_out = time_stage(trimmed, stage, args.rounds)
+        total_full += full_time
+        total_view += view_time
+        same = full_out == view_out
+        if not same:
+            mismatches.append(stage)
+        saved = (1 - view_time / full_time) * 100 if full_time else 0.0
+        print(f"{stage:<20}{full_time * 1000:>12.2f}{view_time * 1000:>12.2f}{saved:>8.1f}%  {same}")
+
+    print(f"{'per resume':<20}{total_full * 1000:>12.2f}{total_view * 1000:>12.2f}"
+          f"{(1 - total_view / total_full) * 100 if total_full else 0.0:>8.1f}%")
+
+    # Whole-resume output must not change either
+    for text in SAMPLE_RESUMES:
+        if full.parse_text(text, SAMPLE_JOB_DESCRIPTION) != trimmed.parse_text(text, SAMPLE_JOB_DESCRIPTION):
+            mismatches.append('parse_text')
+            break
+
+    if mismatches:
+        print(f"Output differs from the full pipeline in: {', '.join(mismatches)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: int8-quantized embedding scans with float32 rescoring vs. float32 scans.
+
+Fills a temporary ``EmbeddingStore`` with N synthetic unit vectors around
+random topic centres, then runs the same exact top-k queries with the
+store in float32 mode and in quantized mode (int8 first pass, best
+``rescore_factor * k`` rescored in float32). Each mode runs in its own
+subprocess so the memory-mapped pages it touches show up in its own RSS.
+Reports p50 query latency, RSS growth, recall@k and the largest score
+change against the float32 ranking, for a few rescore factors.
+
+    python benchmarks/bench_quantized_embeddings.py [--vectors 300000] [--k 30]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from embedding_index import EMBEDDING_CONFIG, EmbeddingStore
+
+
+def synthetic_vectors(rng, count: int, dim: int, topics: int, spread: float) -> np.ndarray:
+    centres = rng.normal(size=(topics, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, topics, count)] + spread * rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def rss_kib(field: str = 'VmHWM:') -> int:
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_mode(directory: str, quantized: bool, rescore_factor: int, k: int) -> None:
+    """Query an existing store in one mode (in a fresh process) and print the results as JSON"""
+    EMBEDDING_CONFIG['rescore_factor'] = rescore_factor
+    queries = np.load(os.path.join(directory, 'queries.npy'))
+    store = EmbeddingStore('bench', directory, dim=queries.shape[1], quantized=quantized)
+    store.refresh()
+    baseline = rss_kib()
+    results, seconds = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(store.top_k(query, k))
+        seconds.append(time.perf_counter() - start)
+    print(json.dumps({
+        'p50_ms': float(np.percentile(seconds, 50) * 1000),
+        'growth_kib': rss_kib() - baseline,
+        'keys': [[key for key, _, _ in result] for result in results],
+        'scores': [[score for _, _, score in result] for result in results]
+    }))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--vectors', type=int, default=300000)
+    arg_parser.add_argument('--dim', type=int, default=EMBEDDING_CONFIG['dim'])
+    arg_parser.add_argument('--topics', type=int, default=200)
+    arg_parser.add_argument('--spread', type=float, default=0.6)
+    arg_parser.add_argument('--queries', type=int, default=30)
+    arg_parser.add_argument('--k', type=int, default=30)
+    arg_parser.add_argument('--rescore-factors', default='1,2,4,8')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    arg_parser.add_argument('--run-mode', choices=['float32', 'int8'], help=argparse.SUPPRESS)
+    arg_parser.add_argument('--rescore-factor', type=int, default=4, help=argparse.SUPPRESS)
+    arg_parser.add_argument('--store', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args.store, args.run_mode == 'int8', args.rescore_factor, args.k)
+        return
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingStore('bench', tmp, dim=args.dim)
+        for start in range(0, args.vectors, 100000):
+            count = min(100000, args.vectors - start)
+            ids = np.arange(start, start + count)
+            store.append(ids, ids, np.zeros(count, dtype=np.int64),
+                         synthetic_vectors(rng, count, args.dim, args.topics, args.spread))
+        np.save(os.path.join(tmp, 'queries.npy'), synthetic_vectors(rng, args.queries, args.dim, args.topics,
+                                                                    args.spread))
+        sizes = store.memory_bytes()
+
+        def run(mode, rescore_factor=4):
+            output = subprocess.run([sys.executable, __file__, '--run-mode', mode, '--store', tmp,
+                                     '--rescore-factor', str(rescore_factor), '--k', str(args.k)],
+                                    check=True, capture_output=True, text=True).stdout
+            return json.loads(output.strip().splitlines()[-1])
+
+        exact = run('float32')
+        print(f"{args.vectors} vectors x {args.dim}, k={args.k}: scanned matrix "
+              f"{sizes['float32'] / 2 ** 20:.0f} MiB float32 vs {sizes['int8'] / 2 ** 20:.0f} MiB int8")
+        print(f"{'mode':<18}{'p50 (ms)':>10}{'RSS growth (MiB)':>18}{'recall@k':>10}{'max |d score|':>15}")
+        print(f"{'float32':<18}{exact['p50_ms']:>10.2f}{exact['growth_kib'] / 1024:>18.1f}{1.0:>10.3f}{0.0:>15.4f}")
+        for factor in (int(f) for f in args.rescore_factors.split(',')):
+            result = run('int8', factor)
+            recall = np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(result['keys'], exact['keys'])])
+            # Score drift at each rank position (rescored scores are exact, so this is ranking error)
+            drift = max(float(np.max(np.abs(np.array(a) - np.array(b)))) for a, b in zip(result['scores'], exact['scores']))
+            print(f"{f'int8 rescore x{factor}':<18}{result['p50_ms']:>10.2f}{result['growth_kib'] / 1024:>18.1f}"
+                  f"{recall:>10.3f}{drift:>15.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark: single-pass section splitting.
+
+Compares ResumeParser._extract_sections (one precompiled alternation per
+line) with the previous per-line loop over five uncompiled ``re.search``
+calls on 5-page and 50-page resumes built from the fixed corpus, and checks
+both produce the same sections.
+
+    python benchmarks/bench_sections.py [--rounds 50]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from resume_parser import ResumeParser
+from benchmarks.fixtures import SAMPLE_RESUMES
+
+WORDS_PER_PAGE = 500
+
+
+def legacy_extract_sections(text):
+    """The original implementation, kept as the reference for output and speed"""
+    sections = {}
+    current_section = "header"
+    section_patterns = {
+        'experience': r'(?i)(work\s*experience|employment\s*history|experience)',
+        'education': r'(?i)(education|academic\s*background|degrees)',
+        'skills': r'(?i)(skills?\s*(?:&|and)?\s*expertise|technical\s*skills?)',
+        'projects': r'(?i)(projects|portfolio|key\s*projects)',
+        'certifications': r'(?i)(certifications?|licenses?|certificates?)'
+    }
+    for section in section_patterns:
+        sections[section] = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        for section, pattern in section_patterns.items():
+            if re.search(pattern, line):
+                current_section = section
+                break
+        else:
+            if current_section and line:
+                sections.setdefault(current_section, []).append(line)
+    return {k: '\n'.join(v) for k, v in sections.items() if v}
+
+
+def resume_of_pages(pages):
+    """Concatenate corpus resumes until the text is roughly ``pages`` long"""
+    parts, words = [], 0
+    while words < pages * WORDS_PER_PAGE:
+        for text in SAMPLE_RESUMES:
+            parts.append(text)
+            words += len(text.split())
+    return '\n\n'.join(parts)
+
+
+def bench(func, text, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = func(text)
+    return (time.perf_counter() - start) / rounds, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--rounds', type=int, default=50)
+    args = arg_parser.parse_args()
+
+    parser = ResumeParser()
+    print(f"{'pages':>6}{'lines':>8}{'legacy (ms)':>14}{'single-pass (ms)':>18}{'speedup':>9}  identical")
+    failed = False
+    for pages in (5, 50):
+        text = resume_of_pages(pages)
+        legacy_time, legacy = bench(legacy_extract_sections, text, args.rounds)
+        new_time, new = bench(parser._extract_sections, text, args.rounds)
+        same = legacy == new
+        failed = failed or not same
+        print(f"{pages:>6}{text.count(chr(10)) + 1:>8}{legacy_time * 1000:>14.3f}{new_time * 1000:>18.3f}"
+              f"{legacy_time / new_time:>8.1f}x  {same}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
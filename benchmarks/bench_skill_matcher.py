@@ -0,0 +1,58 @@
+"""
+Benchmark: skill matching cost vs. taxonomy size.
+
+Pads the shipped skills taxonomy with synthetic skills (10k, 50k, ...) and
+times SkillMatcher.extract over the fixed resume corpus. Match time should
+stay flat as the taxonomy grows; only the one-off compile time scales.
+
+    python benchmarks/bench_skill_matcher.py [--sizes 10000 50000] [--rounds 50]
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from skill_matcher import SkillMatcher, DEFAULT_TAXONOMY_PATH
+from benchmarks.fixtures import SAMPLE_RESUMES
+
+
+def padded_taxonomy(base, size, seed=42):
+    """Base taxonomy plus random multi-word skills up to ``size`` entries"""
+    rng = random.Random(seed)
+    taxonomy = dict(base)
+    while len(taxonomy) < size:
+        words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        taxonomy[' '.join(words)] = {'category': 'synthetic', 'synonyms': [], 'importance': 0.5}
+    return taxonomy
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000])
+    arg_parser.add_argument('--rounds', type=int, default=50)
+    args = arg_parser.parse_args()
+
+    base = SkillMatcher.from_file(DEFAULT_TAXONOMY_PATH).taxonomy
+    print(f"{'skills':>8}{'compile (s)':>14}{'match (ms/resume)':>20}  found")
+    for size in [len(base)] + args.sizes:
+        start = time.perf_counter()
+        matcher = SkillMatcher(padded_taxonomy(base, size))
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            found = [matcher.extract(text) for text in SAMPLE_RESUMES]
+        match_time = (time.perf_counter() - start) / (args.rounds * len(SAMPLE_RESUMES))
+
+        counts = [len(f) for f in found]
+        print(f"{size:>8}{compile_time:>14.3f}{match_time * 1000:>20.3f}  {counts}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Seeded synthetic resume corpus for the benchmark suite.
+
+``generate_resume_text(rng, size)`` builds a plausible resume (contact
+block, summary, skills, experience, education, projects) from fixed word
+pools; ``write_corpus`` renders such resumes to TXT, DOCX and PDF files.
+The same seed always yields byte-identical texts, so timings from
+different runs and machines are measured on the same inputs.
+
+Sizes are in pages of roughly 45 lines: ``small`` (1), ``medium`` (3) and
+``large`` (10, e.g. an academic CV with a publication list).
+"""
+
+import os
+import random
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import docx
+
+from benchmarks.pdf_writer import write_text_pdf
+
+SIZES = {'small': 1, 'medium': 3, 'large': 10}
+FORMATS = ('txt', 'docx', 'pdf')
+LINES_PER_PAGE = 45
+
+FIRST_NAMES = ['Sarah', 'Michael', 'Priya', 'James', 'Ana', 'Wei', 'Fatima', 'Lukas', 'Olivia', 'Kenji',
+               'Amara', 'Diego', 'Noor', 'Ethan', 'Sofia', 'Ravi']
+LAST_NAMES = ['Johnson', 'Chen', 'Raman', 'Okafor', 'Silva', 'Novak', 'Haddad', 'Kim', 'Schmidt',
+              'Garcia', 'Tanaka', 'Mensah', 'Rossi', 'Patel', 'Larsen', 'Dubois']
+TITLES = ['Software Engineer', 'Senior Software Engineer', 'Data Scientist', 'DevOps Engineer',
+          'Backend Developer', 'Frontend Developer', 'Machine Learning Engineer', 'Engineering Manager']
+COMPANIES = ['Tech Solutions Inc.', 'WebDev Co.', 'Data Insights Co.', 'Analytics Pro', 'CloudScale Ltd.',
+             'Northwind Systems', 'Blue Harbor Labs', 'Quantum Retail', 'Acme Logistics', 'Helix Health']
+CITIES = ['San Francisco, CA', 'New York, NY', 'Austin, TX', 'Seattle, WA', 'Boston, MA', 'Chicago, IL']
+SKILLS = ['Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust', 'SQL', 'Django', 'Flask', 'React',
+          'Node.js', 'PostgreSQL', 'MongoDB', 'Redis', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP',
+          'TensorFlow', 'PyTorch', 'scikit-learn', 'Pandas', 'NumPy', 'Git', 'CI/CD', 'Terraform',
+          'GraphQL', 'REST', 'Kafka', 'Spark', 'Linux', 'Agile', 'Scrum', 'Machine Learning']
+VERBS = ['Led', 'Built', 'Designed', 'Migrated', 'Automated', 'Optimized', 'Maintained', 'Launched',
+         'Mentored', 'Refactored', 'Scaled', 'Introduced']
+OBJECTS = ['a payments API', 'the data pipeline', 'microservices on Kubernetes', 'the CI/CD pipeline',
+           'a recommendation model', 'the customer dashboard', 'a feature store', 'the search service',
+           'an internal developer platform', 'real-time event processing']
+OUTCOMES = ['cutting latency by {n}%', 'saving {n} engineering hours a month', 'for {n} million users',
+            'with {n}% fewer incidents', 'across {n} teams', 'improving conversion by {n}%']
+DEGREES = ['PhD in Computer Science', 'MSc in Computer Science', 'BSc in Computer Science',
+           'Bachelor of Engineering', 'Master of Data Science', 'Associate Degree in Information Technology']
+UNIVERSITIES = ['Stanford University', 'Massachusetts Institute of Technology', 'University of Toronto',
+                'Technical University of Munich', 'University of California, Berkeley', 'IIT Madras']
+VENUES = ['NeurIPS', 'ICML', 'KDD', 'VLDB', 'SIGMOD', 'OSDI', 'ACL', 'WWW']
+
+
+@dataclass
+class CorpusDocument:
+    path: str
+    format: str
+    size: str
+    text: str  # the text the file was rendered from
+
+
+def _bullet(rng: random.Random) -> str:
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(2, 60))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}, {outcome}"
+
+
+def generate_resume_text(rng: random.Random, size: str = 'small') -> str:
+    """One synthetic resume of about ``SIZES[size]`` pages"""
+    target_lines = SIZES[size] * LINES_PER_PAGE
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    current_year = 2024
+
+    lines = [
+        f"{first} {last}",
+        rng.choice(TITLES),
+        f"Email: {first.lower()}.{last.lower()}@example.com | Phone: (555) {rng.randint(100, 999)}-"
+        f"{rng.randint(1000, 9999)} | Location: {rng.choice(CITIES)}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(2, 15)}+ years of experience in "
+        f"{', '.join(rng.sample(SKILLS, 3))}.",
+        "",
+        "TECHNICAL SKILLS",
+        f"Programming: {', '.join(rng.sample(SKILLS[:7], 3))}",
+        f"Frameworks: {', '.join(rng.sample(SKILLS[7:13], 3))}",
+        f"Tools: {', '.join(rng.sample(SKILLS[13:], 5))}",
+        "",
+        "EXPERIENCE"
+    ]
+
+    # Roles going back in time until the experience section fills its share;
+    # long documents are padded with projects and publications instead
+    end_year = current_year
+    experience_lines = min(int(target_lines * 0.6), 60)
+    while len(lines) < experience_lines:
+        start_year = end_year - rng.randint(1, 4)
+        end = 'Present' if end_year == current_year else str(end_year)
+        lines += [rng.choice(TITLES), f"{rng.choice(COMPANIES)} | {start_year} - {end}"]
+        lines += [_bullet(rng) for _ in range(rng.randint(3, 6))]
+        lines.append("")
+        end_year = start_year
+
+    lines.append("EDUCATION")
+    for _ in range(rng.randint(1, 2)):
+        graduation = end_year - rng.randint(0, 2)
+        lines += [rng.choice(DEGREES), f"{rng.choice(UNIVERSITIES)} | {graduation - 4} - {graduation}", ""]
+
+    lines.append("PROJECTS")
+    while len(lines) < target_lines:
+        if size == 'large' and rng.random() < 0.6:
+            lines.append(f"{last}, {first[0]}. et al. \"{_bullet(rng)}\". {rng.choice(VENUES)} "
+                         f"{rng.randint(2010, current_year)}.")
+        else:
+            lines.append(f"{_bullet(rng)} using {', '.join(rng.sample(SKILLS, 2))}")
+    return "\n".join(lines)
+
+
+def _write_docx(path: str, text: str) -> None:
+    document = docx.Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def _write_pdf(path: str, text: str) -> None:
+    lines = text.split('\n')
+    write_text_pdf(path, [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)])
+
+
+def write_corpus(directory: str, seed: int = 42, per_size: int = 5,
+                 formats: Sequence[str] = FORMATS, sizes: Sequence[str] = tuple(SIZES)) -> List[CorpusDocument]:
+    """Render ``per_size`` resumes of each size in each format into ``directory``.
+
+    Every format gets the same texts, so per-format differences come from
+    extraction alone.
+    """
+    rng = random.Random(seed)
+    documents = []
+    for size in sizes:
+        for i in range(per_size):
+            text = generate_resume_text(rng, size)
+            for fmt in formats:
+                path = os.path.join(directory, f"{size}_{i:03d}.{fmt}")
+                if fmt == 'txt':
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(text)
+                elif fmt == 'docx':
+                    _write_docx(path, text)
+                elif fmt == 'pdf':
+                    _write_pdf(path, text)
+                else:
+                    raise ValueError(f"Unknown format: {fmt}")
+                documents.append(CorpusDocument(path=path, format=fmt, size=size, text=text))
+    return documents
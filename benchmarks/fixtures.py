@@ -0,0 +1,95 @@
+"""
+Fixed resume corpus shared by the benchmarks.
+
+The texts are deliberately stable: benchmarks that check optimized code
+paths for identical output compare against these exact inputs.
+"""
+
+SAMPLE_JOB_DESCRIPTION = """Senior Software Engineer
+We are looking for an experienced Senior Software Engineer with expertise in Python,
+Django, and modern web technologies. You will design REST APIs on AWS, run services
+in Docker and Kubernetes, and own our CI/CD pipelines at Amazon Web Services scale.
+Requirements: 5+ years of experience, a Bachelor's degree in Computer Science,
+PostgreSQL, React and Agile delivery."""
+
+SAMPLE_RESUMES = [
+    """Sarah Johnson
+Senior Software Engineer
+Email: sarah.johnson@example.com | Phone: (555) 123-4567 | Location: San Francisco, CA
+
+SUMMARY
+Experienced Senior Software Engineer with 5+ years of experience in full-stack development.
+Expertise in Python, Django, React, and cloud technologies. Led multiple projects to successful deployment.
+
+TECHNICAL SKILLS
+Programming: Python, JavaScript, TypeScript
+Frameworks: Django, React, Node.js
+Databases: PostgreSQL, MongoDB
+DevOps: Docker, Kubernetes, AWS, CI/CD
+Tools: Git, JIRA, Agile/Scrum
+
+EXPERIENCE
+Senior Software Engineer
+Tech Solutions Inc. | 2020 - Present
+Led a team of 5 developers in building scalable web applications
+Architected and implemented microservices using Django and React
+Improved application performance by 40% through code optimization
+
+Software Engineer
+WebDev Co. | 2018 - 2020
+Developed and maintained RESTful APIs using Django REST Framework
+
+EDUCATION
+MSc in Computer Science
+Stanford University | 2016 - 2018
+
+BSc in Computer Science
+University of California, Berkeley | 2012 - 2016""",
+    """Michael Chen
+Data Scientist
+Email: michael.chen@example.com | Phone: (555) 987-6543 | Location: New York, NY
+
+SUMMARY
+Data Scientist with 4+ years of experience in machine learning and data analysis.
+
+TECHNICAL SKILLS
+Programming: Python, R, SQL
+Machine Learning: TensorFlow, PyTorch, scikit-learn
+Cloud: AWS, Google Cloud Platform
+
+EXPERIENCE
+Data Scientist
+Data Insights Co. | 2019 - Present
+Developed and deployed machine learning models for predictive analytics
+Led a team of 3 junior data scientists
+
+Data Analyst
+Analytics Pro | 2017 - 2019
+Automated data pipelines using Python and SQL
+
+EDUCATION
+PhD in Data Science
+Massachusetts Institute of Technology | 2013 - 2017""",
+    """Priya Raman
+DevOps Engineer
+priya.raman@example.com | +1 555 222 3333
+
+SKILLS AND EXPERTISE
+Docker Compose, K8s, Amazon Web Services, Continuous Integration, Java, Node
+
+WORK EXPERIENCE
+DevOps Engineer at CloudOps Ltd
+2021 - Present
+Managed Kubernetes clusters serving 2M+ requests per day
+Reduced deployment time by 60%
+
+Systems Analyst at Infra Corp
+2016 - 2021
+
+CERTIFICATIONS
+AWS Certified Solutions Architect
+
+EDUCATION
+Bachelor of Engineering
+Anna University | 2012 - 2016""",
+]
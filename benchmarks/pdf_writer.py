@@ -0,0 +1,55 @@
+"""
+Minimal PDF writer for benchmark fixtures.
+
+Writes plain-text PDFs (one Helvetica text block per page) without any
+third-party dependency, so benchmarks can generate large documents that
+PyPDF2 extracts text from.
+"""
+
+from typing import List
+
+
+def _escape(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_text_pdf(path: str, pages: List[List[str]], font_size: int = 10) -> None:
+    """Write a PDF with one page per entry of ``pages`` (each a list of lines)"""
+    objects = []  # bodies of objects 1..N, in order
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b'')           # filled in once the page tree exists
+    pages_id = add(b'')
+    font_id = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    page_ids = []
+    for lines in pages:
+        text_ops = [f'BT /F1 {font_size} Tf {font_size + 2} TL 50 800 Td']
+        text_ops += [f'({_escape(line)}) Tj T*' for line in lines]
+        text_ops.append('ET')
+        stream = '\n'.join(text_ops).encode('latin-1', errors='replace')
+        content_id = add(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        page_ids.append(add(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] '
+            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>' % (pages_id, font_id, content_id)
+        ))
+
+    kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+    objects[catalog_id - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id
+
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.4\n')
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(f.tell())
+            f.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+        xref_offset = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b'%010d 00000 n \n' % offset)
+        f.write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                % (len(objects) + 1, catalog_id, xref_offset))
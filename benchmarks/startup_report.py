@@ -0,0 +1,89 @@
+"""
+Startup-time report: where does importing the app spend its time?
+
+Imports a module (default: the Flask app in app.py) in a fresh interpreter
+with ``python -X importtime`` and breaks the cost down per top-level module,
+then optionally warms up the model registry and reports per-model load
+times. Heavy models should not show up in the import breakdown at all.
+
+    python benchmarks/startup_report.py [--module app.py] [--top 20] [--warm-up]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+WARM_UP_SNIPPET = '''
+import json, runpy, sys, time
+start = time.perf_counter()
+runpy.run_path({path!r}, run_name='startup_report')
+imported = time.perf_counter() - start
+from model_registry import registry
+registry.warm_up()
+print(json.dumps({{'import_seconds': imported, 'status': registry.status()}}))
+'''
+
+
+def import_breakdown(path):
+    """Self and cumulative import microseconds per top-level package"""
+    code = f"import runpy; runpy.run_path({path!r}, run_name='startup_report')"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                          capture_output=True, text=True)
+    self_us = defaultdict(int)
+    cumulative_us = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        own, cumulative, indent, module = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        top = module.split('.')[0]
+        self_us[top] += own
+        # Outermost import of a package carries its cumulative cost
+        if len(indent) <= 1:
+            cumulative_us[top] = max(cumulative_us.get(top, 0), cumulative)
+    return self_us, cumulative_us, proc.returncode, proc.stderr
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument('--module', default='app.py', help='Script to import, relative to the repo root')
+    arg_parser.add_argument('--top', type=int, default=20)
+    arg_parser.add_argument('--warm-up', action='store_true', help='Also time each registered model')
+    args = arg_parser.parse_args()
+
+    path = os.path.join(ROOT, args.module)
+    self_us, cumulative_us, returncode, stderr = import_breakdown(path)
+    if returncode != 0:
+        print(f"Importing {args.module} failed:\n{stderr[-2000:]}")
+
+    total = sum(self_us.values())
+    print(f"Import cost of {args.module}: {total / 1e6:.2f}s total")
+    print(f"{'module':<30}{'self (ms)':>12}{'cumulative (ms)':>18}{'share':>8}")
+    for module, own in sorted(self_us.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{module:<30}{own / 1000:>12.1f}{cumulative_us.get(module, own) / 1000:>18.1f}"
+              f"{own / total * 100 if total else 0:>7.1f}%")
+
+    if args.warm_up:
+        proc = subprocess.run([sys.executable, '-c', WARM_UP_SNIPPET.format(path=path)], cwd=ROOT,
+                              capture_output=True, text=True)
+        try:
+            report = json.loads(proc.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            print(f"Warm-up failed:\n{proc.stderr[-2000:]}")
+            return
+        print(f"\nModel warm-up (after a {report['import_seconds']:.2f}s import):")
+        for name, info in report['status']['models'].items():
+            state = f"{info['load_seconds']:.2f}s" if info['loaded'] else f"failed: {info['error']}"
+            print(f"  {name:<24}{state}")
+
+
+if __name__ == '__main__':
+    main()
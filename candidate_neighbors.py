@@ -0,0 +1,239 @@
+"""
+Precomputed "similar candidates" graph.
+
+Each candidate keeps its ``k`` nearest neighbours in the
+``candidate_neighbors`` table, so the profile page reads them with one
+indexed query (``candidate_id, rank``). Similarity blends
+
+* the cosine of the candidates' latest resume embeddings (the ``resumes``
+  ``EmbeddingStore``), and
+* the Jaccard index of the skill names parsed from those resumes,
+
+weighted by ``NEIGHBOR_CONFIG``. Neighbours come from an embedding search
+(the IVF index once the store is large) for ``shortlist`` candidates,
+which are then re-ranked by the blended score.
+
+The graph is maintained incrementally: when a candidate's resume is added
+or replaced, ``update_candidate_neighbors`` recomputes that candidate's list
+and offers the candidate to the lists of everyone it was compared with
+(its shortlist, plus whoever listed it before). A list whose member got
+less similar than every other entry is recomputed in full, since someone
+outside it may now rank higher. Deleting a candidate removes every edge
+touching it (cascade); lists that lose an entry are refilled the next time
+they are updated. ``flask build-candidate-neighbors`` rebuilds the whole
+graph, e.g. after changing the weights.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+NEIGHBOR_CONFIG = {
+    'k': int(os.environ.get('RESUME_NEIGHBORS_K', 10)),
+    'shortlist': 50,  # embedding matches re-ranked by the blended score
+    'embedding_weight': 0.7,
+    'skill_weight': 0.3
+}
+
+
+@dataclass
+class NeighborEdge:
+    neighbor_id: int
+    score: float
+    embedding_similarity: float
+    skill_jaccard: float
+
+
+def skill_set(parsed_data) -> FrozenSet[str]:
+    """Lower-cased skill names of a resume's parsed data"""
+    skills = (parsed_data or {}).get('skills') or []
+    names = (skill.get('name') if isinstance(skill, dict) else skill for skill in skills)
+    return frozenset(name.strip().lower() for name in names if name and name.strip())
+
+
+def skill_jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def blended_score(embedding_similarity: float, jaccard: float) -> float:
+    return (NEIGHBOR_CONFIG['embedding_weight'] * embedding_similarity +
+            NEIGHBOR_CONFIG['skill_weight'] * jaccard)
+
+
+def _resume_skill_sets(resume_ids: Iterable[int]) -> Dict[int, FrozenSet[str]]:
+    """Skill sets of several resumes with one query"""
+    from models import db, Resume
+
+    resume_ids = list(set(resume_ids))
+    if not resume_ids:
+        return {}
+    rows = db.session.query(Resume.id, Resume.parsed_data).filter(Resume.id.in_(resume_ids)).all()
+    return {resume_id: skill_set(parsed_data) for resume_id, parsed_data in rows}
+
+
+def _edges(resume_id: int, matches: Sequence) -> List[NeighborEdge]:
+    """Blended edges from ``(key, owner, cosine)`` matches of one candidate's resume"""
+    skills = _resume_skill_sets([resume_id] + [key for key, _, _ in matches])
+    own = skills.get(resume_id, frozenset())
+    edges = []
+    for key, owner, similarity in matches:
+        jaccard = skill_jaccard(own, skills.get(key, frozenset()))
+        edges.append(NeighborEdge(owner, blended_score(similarity, jaccard), similarity, jaccard))
+    edges.sort(key=lambda edge: edge.score, reverse=True)
+    return edges
+
+
+def compute_neighbors(candidate_id: int, k: Optional[int] = None) -> List[NeighborEdge]:
+    """The ``k`` most similar candidates, best first; empty if the candidate has no embedding"""
+    from ann_index import search
+    from embedding_index import get_embedding_store
+
+    k = k or NEIGHBOR_CONFIG['k']
+    store = get_embedding_store('resumes')
+    row = store.owner_row(candidate_id)
+    if row is None:
+        return []
+    matches = search(store, store.read_vectors([row])[0], max(NEIGHBOR_CONFIG['shortlist'], k),
+                     exclude_owners=[candidate_id])
+    return _edges(int(store.keys[row]['key']), matches)[:k]
+
+
+def _load_lists(candidate_ids: Iterable[int]) -> Dict[int, List[NeighborEdge]]:
+    from models import db, CandidateNeighbor
+
+    lists: Dict[int, List[NeighborEdge]] = {candidate_id: [] for candidate_id in candidate_ids}
+    if not lists:
+        return lists
+    rows = (db.session.query(CandidateNeighbor.candidate_id, CandidateNeighbor.neighbor_id, CandidateNeighbor.score,
+                             CandidateNeighbor.embedding_similarity, CandidateNeighbor.skill_jaccard)
+            .filter(CandidateNeighbor.candidate_id.in_(list(lists)))
+            .order_by(CandidateNeighbor.candidate_id, CandidateNeighbor.rank)
+            .all())
+    for candidate_id, *edge in rows:
+        lists[candidate_id].append(NeighborEdge(*edge))
+    return lists
+
+
+def store_neighbors(candidate_id: int, edges: Sequence[NeighborEdge]) -> None:
+    """Replace a candidate's neighbour rows (the caller commits)"""
+    from models import db, CandidateNeighbor
+
+    CandidateNeighbor.query.filter_by(candidate_id=candidate_id).delete(synchronize_session='fetch')
+    for rank, edge in enumerate(edges, start=1):
+        db.session.add(CandidateNeighbor(candidate_id=candidate_id, neighbor_id=edge.neighbor_id, rank=rank,
+                                         score=edge.score, embedding_similarity=edge.embedding_similarity,
+                                         skill_jaccard=edge.skill_jaccard))
+
+
+def update_candidate_neighbors(candidate_id: int) -> int:
+    """Recompute a candidate's neighbours after its resume changed and patch the lists it
+    affects; returns the number of lists written (the caller commits)"""
+    from ann_index import search
+    from models import db, CandidateNeighbor
+    from embedding_index import get_embedding_store
+
+    k = NEIGHBOR_CONFIG['k']
+    store = get_embedding_store('resumes')
+    row = store.owner_row(candidate_id)
+    listed_by = [other for (other,) in db.session.query(CandidateNeighbor.candidate_id)
+                 .filter(CandidateNeighbor.neighbor_id == candidate_id)]
+    affected: Dict[int, Optional[NeighborEdge]] = {}
+    if row is None:
+        # No embedding (any more): drop the candidate from the graph
+        store_neighbors(candidate_id, [])
+        affected = {other: None for other in listed_by}
+    else:
+        matches = search(store, store.read_vectors([row])[0], max(NEIGHBOR_CONFIG['shortlist'], k),
+                         exclude_owners=[candidate_id])
+        shortlist = _edges(int(store.keys[row]['key']), matches)
+        store_neighbors(candidate_id, shortlist[:k])
+        # The score is symmetric, so each shortlisted edge is also the reverse edge
+        for edge in shortlist:
+            affected[edge.neighbor_id] = NeighborEdge(candidate_id, edge.score, edge.embedding_similarity,
+                                                      edge.skill_jaccard)
+        missing = [other for other in listed_by if other not in affected]
+        for other, edge in zip(missing, _pair_edges(store, candidate_id, missing)):
+            affected[other] = edge
+
+    written = 1
+    for other, current in _load_lists(affected).items():
+        edge = affected[other]
+        others = [e for e in current if e.neighbor_id != candidate_id]
+        was_listed = len(others) < len(current)
+        if edge is None or (was_listed and len(current) >= k and (not others or edge.score < others[-1].score)):
+            # Someone outside the list may now outrank this candidate
+            store_neighbors(other, compute_neighbors(other, k))
+            written += 1
+            continue
+        if not was_listed and len(current) >= k and edge.score <= current[-1].score:
+            continue
+        merged = sorted(others + [edge], key=lambda e: e.score, reverse=True)[:k]
+        store_neighbors(other, merged)
+        written += 1
+    return written
+
+
+def _pair_edges(store, candidate_id: int, others: Sequence[int]) -> List[Optional[NeighborEdge]]:
+    """Edges from each of ``others`` to ``candidate_id`` (None where either has no embedding)"""
+    row = store.owner_row(candidate_id)
+    rows = [store.owner_row(other) for other in others]
+    present = [r for r in rows if r is not None]
+    if row is None or not present:
+        return [None] * len(others)
+    keys = store.keys
+    similarities = store.read_vectors(present) @ store.read_vectors([row])[0]
+    resume_id = int(keys[row]['key'])
+    skills = _resume_skill_sets([resume_id] + [int(keys[r]['key']) for r in present])
+    own = skills.get(resume_id, frozenset())
+    edges: List[Optional[NeighborEdge]] = []
+    similarity_of = dict(zip(present, similarities))
+    for r in rows:
+        if r is None:
+            edges.append(None)
+            continue
+        similarity = float(similarity_of[r])
+        jaccard = skill_jaccard(own, skills.get(int(keys[r]['key']), frozenset()))
+        edges.append(NeighborEdge(candidate_id, blended_score(similarity, jaccard), similarity, jaccard))
+    return edges
+
+
+def rebuild_candidate_neighbors(batch_size: int = 500) -> int:
+    """Recompute every embedded candidate's list (committing per batch); returns lists written"""
+    from models import db, CandidateNeighbor
+    from embedding_index import get_embedding_store
+
+    store = get_embedding_store('resumes')
+    store.refresh()
+    owners = [int(owner) for owner in np.unique(store.keys['owner'][store.live])]
+    # Lists of candidates no longer embedded go first
+    listed = {candidate_id for (candidate_id,) in db.session.query(CandidateNeighbor.candidate_id).distinct()}
+    stale = sorted(listed.difference(owners))
+    for start in range(0, len(stale), batch_size):
+        (CandidateNeighbor.query.filter(CandidateNeighbor.candidate_id.in_(stale[start:start + batch_size]))
+         .delete(synchronize_session=False))
+    db.session.commit()
+    written = 0
+    for start in range(0, len(owners), batch_size):
+        for owner in owners[start:start + batch_size]:
+            store_neighbors(owner, compute_neighbors(owner))
+            written += 1
+        db.session.commit()
+    return written
+
+
+def similar_candidates(candidate_id: int, limit: int = 5) -> list:
+    """Candidates most similar to ``candidate_id`` from the precomputed graph, best first"""
+    from sqlalchemy.orm import joinedload
+    from models import CandidateNeighbor
+
+    links = (CandidateNeighbor.query
+             .options(joinedload(CandidateNeighbor.neighbor))
+             .filter(CandidateNeighbor.candidate_id == candidate_id)
+             .order_by(CandidateNeighbor.rank)
+             .limit(limit)
+             .all())
+    return [link.neighbor for link in links]
@@ -0,0 +1,116 @@
+"""
+Streaming DOCX text extraction.
+
+A .docx file is a zip archive whose body text lives in ``word/document.xml``.
+Rather than building the python-docx object model for the whole document,
+``iter_docx_blocks`` streams that part with ``iterparse`` and yields text
+in document order, clearing elements as soon as they are consumed:
+
+* each non-empty paragraph outside a table is one block;
+* each table row is one block, its non-empty cells joined with `` | ``
+  (paragraphs inside a cell are joined with a space).
+
+Tables matter for resumes: many templates keep skills and contact
+details in them, and python-docx's ``Document.paragraphs`` skips them.
+Paragraphs in text boxes are yielded as their own blocks. Word stores each
+text box twice, as a DrawingML shape in ``mc:AlternateContent/mc:Choice``
+and as a VML copy in ``mc:Fallback``; only the first copy is read, so text
+box contents are not counted twice.
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List
+
+DOCUMENT_PART = 'word/document.xml'
+CELL_SEPARATOR = ' | '
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_P, _T, _TC, _TR, _BODY = _W + 'p', _W + 't', _W + 'tc', _W + 'tr', _W + 'body'
+_TAB, _PTAB, _BR, _CR, _NB_HYPHEN = _W + 'tab', _W + 'ptab', _W + 'br', _W + 'cr', _W + 'noBreakHyphen'
+_BR_TYPE = _W + 'type'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# Errors meaning the file is not a readable WordprocessingML package
+DOCX_FORMAT_ERRORS = (zipfile.BadZipFile, KeyError, ET.ParseError)
+
+
+def iter_docx_blocks(file_path: str) -> Iterator[str]:
+    """Yield paragraph and table-row text of a .docx in document order"""
+    with zipfile.ZipFile(file_path) as archive, archive.open(DOCUMENT_PART) as part:
+        paragraphs: List[List[str]] = []  # open paragraphs (text boxes nest them)
+        cells: List[List[str]] = []       # paragraph texts of open table cells
+        rows: List[List[str]] = []        # cell texts of open table rows
+        body = None
+        depth = 0
+        fallback = 0  # open mc:Fallback elements (duplicate copies of text boxes)
+
+        for event, elem in ET.iterparse(part, events=('start', 'end')):
+            tag = elem.tag
+            if event == 'start':
+                depth += 1
+                if tag == _MC_FALLBACK:
+                    fallback += 1
+                elif fallback:
+                    pass
+                elif tag == _P:
+                    paragraphs.append([])
+                elif tag == _TC:
+                    cells.append([])
+                elif tag == _TR:
+                    rows.append([])
+                elif tag == _BODY:
+                    body = elem
+                continue
+
+            depth -= 1
+            if tag == _MC_FALLBACK:
+                fallback -= 1
+            elif fallback:
+                pass
+            elif tag == _T:
+                if paragraphs and elem.text:
+                    paragraphs[-1].append(elem.text)
+            elif tag in (_TAB, _PTAB):
+                if paragraphs:
+                    paragraphs[-1].append('\t')
+            elif tag == _BR:
+                if paragraphs and elem.get(_BR_TYPE, 'textWrapping') == 'textWrapping':
+                    paragraphs[-1].append('\n')
+            elif tag == _CR:
+                if paragraphs:
+                    paragraphs[-1].append('\n')
+            elif tag == _NB_HYPHEN:
+                if paragraphs:
+                    paragraphs[-1].append('-')
+            elif tag == _P:
+                text = ''.join(paragraphs.pop())
+                if text.strip():
+                    if cells:
+                        cells[-1].append(text.strip())
+                    else:
+                        yield text
+                elem.clear()
+            elif tag == _TC:
+                text = ' '.join(cells.pop())
+                if rows:
+                    rows[-1].append(text)
+                elem.clear()
+            elif tag == _TR:
+                text = CELL_SEPARATOR.join(cell for cell in rows.pop() if cell)
+                if text:
+                    if cells:
+                        # Row of a nested table: part of the enclosing cell
+                        cells[-1].append(text)
+                    else:
+                        yield text
+                elem.clear()
+
+            # Drop finished top-level blocks so memory stays flat on long documents
+            if depth == 2 and body is not None:
+                body.clear()
+
+
+def extract_docx_text(file_path: str) -> str:
+    """Text of a .docx, one block per line (see ``iter_docx_blocks``)"""
+    return '\n'.join(iter_docx_blocks(file_path))
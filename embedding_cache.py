@@ -0,0 +1,234 @@
+"""
+Content-addressed cache of sentence embeddings.
+
+Interview answers, question texts and job descriptions are compared with
+the same sentence encoder over and over, mostly on text that has not
+changed. Embeddings are cached by the SHA-256 of the normalized text
+(Unicode NFKC, whitespace collapsed) plus the model name, in two tiers
+like ``parse_cache``:
+
+* an in-process LRU of recently used vectors, and
+* an on-disk SQLite table of float32 BLOBs shared by every worker on the
+  host, bounded by total stored bytes (least recently used rows go first).
+
+``encode(texts)`` looks a whole batch up at once (one query for the
+memory misses) and runs the model once, on the texts still missing.
+Vectors are L2-normalised, so cosine similarity is a dot product. Cached
+vectors are shared and read-only; ``encode`` returns a fresh matrix.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+SENTENCE_ENCODER_MODEL = 'all-MiniLM-L6-v2'
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'embedding_cache.db')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_SQL_BATCH = 500  # keys per SELECT ... IN (...), below SQLite's parameter limit
+
+
+def normalize_text(text: str) -> str:
+    """Text as the cache sees it: NFKC, whitespace collapsed, stripped"""
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFKC', text or '')).strip()
+
+
+def encode_with_model(texts: List[str]) -> np.ndarray:
+    """Run the shared sentence encoder (no caching)"""
+    import ai_interview  # noqa: F401 -- registers the 'sentence_encoder' model
+    from model_registry import get_model
+
+    return get_model('sentence_encoder').encode(texts, batch_size=64, convert_to_numpy=True,
+                                                normalize_embeddings=True)
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) cache of normalized float32 text embeddings"""
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_CACHE_PATH, model: str = SENTENCE_ENCODER_MODEL,
+                 encoder: Callable[[List[str]], np.ndarray] = encode_with_model,
+                 max_memory_entries: int = 4096, max_disk_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.model = model
+        self.encoder = encoder
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.encode_calls = 0
+
+        if self.db_path:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            with self._connect() as conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS embedding_cache (
+                        key TEXT PRIMARY KEY,
+                        vector BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS ix_embedding_cache_accessed ON embedding_cache (accessed_at)')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection that commits on success and is always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def make_key(self, normalized: str) -> str:
+        return f"{self.model}:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()}"
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Embeddings (len(texts) x dim) for ``texts``; the model only sees texts not cached yet"""
+        normalized = [normalize_text(text) for text in texts]
+        keys = [self.make_key(text) for text in normalized]
+        found = self._get_many(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, normalized):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            vectors = np.asarray(self.encoder(list(missing.values())), dtype=np.float32)
+            computed = dict(zip(missing, vectors))
+            for vector in computed.values():
+                vector.flags.writeable = False
+            self._put_many(computed)
+            found.update(computed)
+            with self._lock:
+                self.encode_calls += 1
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def encode_one(self, text: str) -> np.ndarray:
+        return self.encode([text])[0]
+
+    def _get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+        memory_hits = sum(1 for key in keys if key in found)
+
+        wanted = list(dict.fromkeys(key for key in keys if key not in found))
+        if wanted and self.db_path:
+            try:
+                with self._connect() as conn:
+                    now = time.time()
+                    for i in range(0, len(wanted), _SQL_BATCH):
+                        chunk = wanted[i:i + _SQL_BATCH]
+                        placeholders = ','.join('?' * len(chunk))
+                        rows = conn.execute(
+                            f'SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})', chunk
+                        ).fetchall()
+                        for key, blob in rows:
+                            found[key] = np.frombuffer(blob, dtype=np.float32)
+                        if rows:
+                            conn.executemany('UPDATE embedding_cache SET accessed_at = ? WHERE key = ?',
+                                             [(now, key) for key, _ in rows])
+            except sqlite3.Error as e:
+                print(f"Embedding cache read failed: {str(e)}")
+
+        hits = sum(1 for key in keys if key in found)
+        with self._lock:
+            for key in wanted:
+                if key in found:
+                    self._remember(key, found[key])
+            self.memory_hits += memory_hits
+            self.disk_hits += hits - memory_hits
+            self.misses += len(keys) - hits
+        return found
+
+    def _put_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+
+        if not self.db_path:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO embedding_cache (key, vector, size, accessed_at) VALUES (?, ?, ?, ?)',
+                    [(key, vector.tobytes(), vector.nbytes, now) for key, vector in vectors.items()]
+                )
+                self._evict_disk(conn)
+        except sqlite3.Error as e:
+            print(f"Embedding cache write failed: {str(e)}")
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the memory LRU (caller holds the lock)"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used rows until under the size budget"""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM embedding_cache').fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in conn.execute('SELECT key, size FROM embedding_cache ORDER BY accessed_at').fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            conn.execute('DELETE FROM embedding_cache WHERE key = ?', (key,))
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM embedding_cache')
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'model': self.model,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'encode_calls': self.encode_calls,
+                'memory_entries': len(self._memory)
+            }
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide cache instance (path configurable via EMBEDDING_CACHE_PATH)"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = EmbeddingCache(os.environ.get('EMBEDDING_CACHE_PATH', DEFAULT_CACHE_PATH))
+    return _default_cache
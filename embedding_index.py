@@ -0,0 +1,530 @@
+"""
+Precomputed sentence embeddings for semantic candidate-job ranking.
+
+``NLPAnalyzer.get_semantic_similarity`` compares one pair of texts, which
+is fine for an interview answer but not for ranking every candidate
+against a job. Here each resume is encoded once, when it is parsed (upload job,
+bulk ingest or ``flask embed-resumes``), with the same
+``all-MiniLM-L6-v2`` encoder. The unit-length float32 vectors are appended
+to a flat file on disk and memory-mapped, so all web workers share one
+page-cached copy and appending never rewrites existing rows.
+
+An ``EmbeddingStore`` is two append-only files plus a small JSON header:
+
+* ``<name>.f32``  -- N x dim float32 rows
+* ``<name>.keys`` -- N records of (key, owner, tag) int64
+
+For resumes the key is the resume id, the owner the candidate id and the
+tag a fingerprint of the embedded text. A newer row for the same owner
+supersedes older ones (a candidate is ranked by their latest resume), so
+re-embedding is an append; deleting an owner appends a tombstone row, and
+``compact()`` drops superseded and deleted rows.
+
+Job postings are stored the same way (key and owner are the posting id);
+a posting whose text changed since it was embedded gets a new row on the
+next lookup.
+
+With ``RESUME_EMBEDDING_QUANTIZED=1`` scans read per-vector-scaled int8
+codes (``<name>.i8`` / ``<name>.scale``, written alongside the float32
+rows) instead of the float32 matrix, a quarter of the memory, and only
+the best few candidates are rescored from the float32 file.
+
+``rank_candidates`` scores every candidate for a posting with one
+matrix-vector product and takes the top k with ``argpartition``; past
+``ANN_CONFIG['min_rows']`` resumes it searches the IVF index of
+``ann_index`` instead.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from embedding_cache import SENTENCE_ENCODER_MODEL, get_embedding_cache
+
+EMBEDDING_CONFIG = {
+    'directory': os.environ.get('RESUME_EMBEDDING_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'cache', 'embeddings'),
+    'model': SENTENCE_ENCODER_MODEL,
+    'dim': 384,
+    'max_chars': 4000,  # the encoder reads 256 word pieces; longer texts are truncated anyway
+    # Scan int8 codes instead of float32 vectors (about 4x less memory), rescoring the best
+    # rescore_factor * k rows in float32
+    'quantized': os.environ.get('RESUME_EMBEDDING_QUANTIZED', '0') == '1',
+    'rescore_factor': int(os.environ.get('RESUME_EMBEDDING_RESCORE_FACTOR', 4)),
+    'scan_chunk_rows': 4096
+}
+
+KEY_DTYPE = np.dtype([('key', '<i8'), ('owner', '<i8'), ('tag', '<i8')])
+TOMBSTONE = -1  # tag of a row that deletes its owner
+
+
+def text_fingerprint(text: str) -> int:
+    """Signed 63-bit fingerprint of an embedded text"""
+    return int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'little') >> 1
+
+
+def resume_embedding_text(resume_data) -> str:
+    """What a resume is embedded as: titles and skills first, then the raw text"""
+    parts = [exp.get('title', '') for exp in (resume_data.experience or [])]
+    parts.append(', '.join(skill['name'] for skill in (resume_data.skills or [])))
+    parts += [edu.get('degree', '') for edu in (resume_data.education or [])]
+    parts.append(resume_data.raw_text or '')
+    return '\n'.join(part for part in parts if part)[:EMBEDDING_CONFIG['max_chars']]
+
+
+def job_embedding_text(job_posting) -> str:
+    from job_profile import job_posting_text
+    return f"{job_posting.title}\n{job_posting_text(job_posting)}"[:EMBEDDING_CONFIG['max_chars']]
+
+
+def quantize_vectors(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-vector int8 codes and float32 scales (vector ~= codes * scale)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = (np.abs(vectors).max(axis=1) / 127).astype(np.float32) if len(vectors) else np.zeros(0, np.float32)
+    codes = np.rint(vectors / np.maximum(scales, 1e-12)[:, None]).astype(np.int8)
+    return codes, scales
+
+
+def _lock_exclusive(lock_file) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return
+    # msvcrt.locking gives up after about 10 seconds; keep waiting like flock does
+    lock_file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock(lock_file) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest finite scores, best first"""
+    k = min(k, int(np.count_nonzero(np.isfinite(scores))))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def encode_texts(texts: Sequence[str]) -> np.ndarray:
+    """L2-normalised float32 embeddings (len(texts) x dim), through the shared embedding cache"""
+    if not texts:
+        return np.zeros((0, EMBEDDING_CONFIG['dim']), dtype=np.float32)
+    return get_embedding_cache().encode(texts)
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped matrix of unit vectors with (key, owner, tag) rows"""
+
+    def __init__(self, name: str, directory: str = None, dim: int = EMBEDDING_CONFIG['dim'],
+                 model: str = EMBEDDING_CONFIG['model'], quantized: Optional[bool] = None):
+        self.name = name
+        self.directory = directory or EMBEDDING_CONFIG['directory']
+        self.dim = dim
+        self.model = model
+        self.quantized = EMBEDDING_CONFIG['quantized'] if quantized is None else quantized
+        self.vectors_path = os.path.join(self.directory, f"{name}.f32")
+        self.keys_path = os.path.join(self.directory, f"{name}.keys")
+        self.codes_path = os.path.join(self.directory, f"{name}.i8")
+        self.scales_path = os.path.join(self.directory, f"{name}.scale")
+        self.meta_path = os.path.join(self.directory, f"{name}.json")
+        self._lock = threading.Lock()
+        self._writer_lock = threading.RLock()
+        self._lock_depth = 0
+        self._rows = 0
+        self._inode = None
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._vectors_fd: Optional[int] = None
+        self._live: Optional[np.ndarray] = None
+        self._by_key: Dict[int, int] = {}
+        self._by_owner: Dict[int, int] = {}
+        os.makedirs(self.directory, exist_ok=True)
+        self._check_meta()
+
+    def _check_meta(self) -> None:
+        """Start a fresh store when the files were written by another encoder"""
+        meta = {'model': self.model, 'dim': self.dim}
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                if json.load(f) == meta:
+                    return
+        except (OSError, ValueError):
+            pass
+        with self._file_lock():
+            for path in (self.vectors_path, self.keys_path, self.codes_path, self.scales_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            with open(self.meta_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(self.meta_path + '.tmp', self.meta_path)
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared by every process writing this store (re-entrant within one)"""
+        with self._writer_lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with open(os.path.join(self.directory, f"{self.name}.lock"), 'w') as lock_file:
+                _lock_exclusive(lock_file)
+                self._lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth = 0
+                    _unlock(lock_file)
+
+    def _stored_rows(self) -> int:
+        # Another process may be mid-append: only rows present in both files count
+        try:
+            vector_rows = os.path.getsize(self.vectors_path) // (4 * self.dim)
+            key_rows = os.path.getsize(self.keys_path) // KEY_DTYPE.itemsize
+        except OSError:
+            return 0
+        return min(vector_rows, key_rows)
+
+    def _code_rows(self) -> int:
+        try:
+            return min(os.path.getsize(self.codes_path) // self.dim, os.path.getsize(self.scales_path) // 4)
+        except OSError:
+            return 0
+
+    def _append_codes(self, rows: int, vectors: np.ndarray) -> None:
+        """Write int8 codes for rows ``rows`` onwards (caller holds the file lock)"""
+        codes, scales = quantize_vectors(vectors)
+        for path, itemsize, data in ((self.codes_path, self.dim, codes), (self.scales_path, 4, scales)):
+            with open(path, 'ab') as f:
+                f.truncate(rows * itemsize)
+                f.write(data.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _sync_codes(self, rows: int) -> None:
+        """Quantize rows that have no codes yet (stores written before codes existed)"""
+        with self._file_lock():
+            code_rows = self._code_rows()
+            if code_rows >= rows:
+                return
+            vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+            chunk = EMBEDDING_CONFIG['scan_chunk_rows']
+            for start in range(code_rows, rows, chunk):
+                self._append_codes(start, vectors[start:min(start + chunk, rows)])
+
+    def file_inode(self) -> Optional[int]:
+        """Inode of the vectors file; it changes when the store is compacted"""
+        try:
+            return os.stat(self.vectors_path).st_ino
+        except OSError:
+            return None
+
+    def refresh(self) -> int:
+        """Map rows appended since the last call (by any process); returns the row count"""
+        rows = self._stored_rows()
+        inode = self.file_inode()
+        if rows == self._rows and inode == self._inode and self._vectors is not None:
+            return rows
+        with self._lock:
+            if inode != self._inode:
+                # New file (first use, or compacted by some process): rebuild the indexes
+                self._by_key, self._by_owner, self._rows = {}, {}, 0
+                self._inode = inode
+                if self._vectors_fd is not None:
+                    os.close(self._vectors_fd)
+                self._vectors_fd = os.open(self.vectors_path, os.O_RDONLY) if inode is not None else None
+            if rows == 0:
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+                self._keys = np.zeros(0, dtype=KEY_DTYPE)
+            else:
+                self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+                self._keys = np.memmap(self.keys_path, dtype=KEY_DTYPE, mode='r', shape=(rows,))
+            if self.quantized:
+                if self._code_rows() < rows:
+                    self._sync_codes(rows)
+                self._codes = (np.memmap(self.codes_path, dtype=np.int8, mode='r', shape=(rows, self.dim))
+                               if rows else np.zeros((0, self.dim), dtype=np.int8))
+                self._scales = (np.memmap(self.scales_path, dtype=np.float32, mode='r', shape=(rows,))
+                                if rows else np.zeros(0, dtype=np.float32))
+            for row in range(self._rows, rows):
+                key, owner, tag = self._keys[row]
+                if tag == TOMBSTONE:
+                    deleted = self._by_owner.pop(int(owner), None)
+                    if deleted is not None:
+                        self._by_key.pop(int(self._keys[deleted]['key']), None)
+                    continue
+                self._by_key[int(key)] = row
+                self._by_owner[int(owner)] = row
+            live = np.zeros(rows, dtype=bool)
+            live[list(self._by_owner.values())] = True
+            self._live = live
+            self._rows = rows
+        return rows
+
+    def __len__(self) -> int:
+        return self.refresh()
+
+    @property
+    def vectors(self) -> np.ndarray:
+        self.refresh()
+        return self._vectors
+
+    @property
+    def keys(self) -> np.ndarray:
+        self.refresh()
+        return self._keys
+
+    @property
+    def live(self) -> np.ndarray:
+        """Rows that are the latest for their (not deleted) owner"""
+        self.refresh()
+        return self._live
+
+    def get(self, key: int) -> Optional[Tuple[np.ndarray, int]]:
+        """(vector, tag) of the latest row for ``key``"""
+        self.refresh()
+        row = self._by_key.get(int(key))
+        if row is None:
+            return None
+        return self.read_vectors([row])[0], int(self._keys[row]['tag'])
+
+    def owner_row(self, owner: int) -> Optional[int]:
+        self.refresh()
+        return self._by_owner.get(int(owner))
+
+    def append(self, keys: Sequence[int], owners: Sequence[int], tags: Sequence[int], vectors: np.ndarray) -> None:
+        """Append rows; later rows supersede earlier ones with the same owner"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if not len(vectors):
+            return
+        records = np.zeros(len(vectors), dtype=KEY_DTYPE)
+        records['key'], records['owner'], records['tag'] = keys, owners, tags
+        with self._file_lock():
+            # Truncate a torn append left by a crashed writer before adding rows
+            rows = self._stored_rows()
+            for path, itemsize, data in ((self.vectors_path, 4 * self.dim, vectors), (self.keys_path, KEY_DTYPE.itemsize, records)):
+                with open(path, 'ab') as f:
+                    f.truncate(rows * itemsize)
+                    f.write(data.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            # Codes are written in every mode, so a store can be switched to int8 scans at any time
+            if self._code_rows() >= rows:
+                self._append_codes(rows, vectors)
+        self.refresh()
+
+    def delete(self, owners: Sequence[int]) -> None:
+        """Remove owners (e.g. purged candidates) by appending tombstone rows"""
+        owners = [int(owner) for owner in owners]
+        if owners:
+            self.append([TOMBSTONE] * len(owners), owners, [TOMBSTONE] * len(owners),
+                        np.zeros((len(owners), self.dim), dtype=np.float32))
+
+    def compact(self) -> int:
+        """Rewrite the store without superseded and deleted rows; returns how many were dropped"""
+        with self._file_lock():
+            self.refresh()
+            keep = np.flatnonzero(self._live)
+            dropped = self._rows - len(keep)
+            if dropped:
+                vectors, keys = np.array(self._vectors[keep]), np.array(self._keys[keep])
+                codes, scales = quantize_vectors(vectors)
+                # Vectors last: readers notice the compaction by its new inode
+                for path, data in ((self.codes_path, codes), (self.scales_path, scales), (self.keys_path, keys),
+                                   (self.vectors_path, vectors)):
+                    with open(path + '.tmp', 'wb') as f:
+                        f.write(data.tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(path + '.tmp', path)
+                self._vectors = self._keys = None
+        self.refresh()
+        return dropped
+
+    def approximate_scores(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine of ``query`` to ``rows`` (default: all) from the int8 codes, in bounded chunks"""
+        query = np.asarray(query, dtype=np.float32)
+        chunk = EMBEDDING_CONFIG['scan_chunk_rows']
+        count = self._rows if rows is None else len(rows)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, chunk):
+            stop = min(start + chunk, count)
+            index = slice(start, stop) if rows is None else rows[start:stop]
+            scores[start:stop] = (self._codes[index].astype(np.float32) @ query) * self._scales[index]
+        return scores
+
+    def read_vectors(self, rows: Sequence[int]) -> np.ndarray:
+        """Float32 vectors of a few rows, read with ``pread``.
+
+        Faulting scattered rows in through the memory map would map (and keep
+        resident) whole readahead windows around each of them.
+        """
+        if not hasattr(os, 'pread'):  # Windows
+            return np.array(self._vectors[np.asarray(rows, dtype=np.int64)], dtype=np.float32)
+        row_bytes = 4 * self.dim
+        vectors = np.empty((len(rows), self.dim), dtype=np.float32)
+        for i, row in enumerate(rows):
+            vectors[i] = np.frombuffer(os.pread(self._vectors_fd, row_bytes, int(row) * row_bytes), dtype=np.float32)
+        return vectors
+
+    def exact_scores(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine of ``query`` to ``rows`` (default: all) from the float32 vectors"""
+        query = np.asarray(query, dtype=np.float32)
+        if rows is None:
+            return self._vectors @ query
+        if self.quantized:
+            return self.read_vectors(rows) @ query
+        return self._vectors[rows] @ query
+
+    def best_rows(self, query: np.ndarray, k: int, rows: Optional[np.ndarray] = None,
+                  mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Up to ``k`` (rows, scores) closest to ``query``, best first.
+
+        Candidates are ``rows`` (sorted, default: all rows where ``mask``
+        is set). Quantized stores rank them by their int8 codes and rescore
+        the best ``rescore_factor * k`` with the float32 vectors, read row
+        by row, so the float32 matrix never becomes resident.
+        """
+        self.refresh()
+        if self.quantized:
+            scores = self.approximate_scores(query, rows)
+        else:
+            scores = self.exact_scores(query, rows)
+        if mask is not None:
+            scores[~mask] = -np.inf
+        if self.quantized:
+            shortlist = np.sort(_top(scores, k * EMBEDDING_CONFIG['rescore_factor']))
+            candidates = shortlist if rows is None else rows[shortlist]
+            scores = self.exact_scores(query, candidates)
+        else:
+            candidates = np.arange(len(scores)) if rows is None else rows
+        top = _top(scores, k)
+        return candidates[top], scores[top]
+
+    def top_k(self, query: np.ndarray, k: int, exclude_owners: Sequence[int] = ()) -> List[Tuple[int, int, float]]:
+        """(key, owner, cosine) of the ``k`` live rows closest to a unit ``query`` vector"""
+        self.refresh()
+        if not self._rows or k <= 0:
+            return []
+        mask = self._live.copy()
+        for owner in exclude_owners:
+            row = self._by_owner.get(int(owner))
+            if row is not None:
+                mask[row] = False
+        rows, scores = self.best_rows(query, k, mask=mask)
+        return [(int(self._keys[row]['key']), int(self._keys[row]['owner']), float(score))
+                for row, score in zip(rows, scores)]
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """Size of the matrix a full scan reads, per representation"""
+        rows = self.refresh()
+        return {'float32': rows * self.dim * 4, 'int8': rows * (self.dim + 4)}
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(name: str) -> EmbeddingStore:
+    """Process-wide store by name ('resumes' or 'jobs')"""
+    store = _stores.get(name)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(name)
+            if store is None:
+                store = _stores[name] = EmbeddingStore(name)
+    return store
+
+
+def embed_resumes(items: Sequence[Tuple[int, int, object]]) -> int:
+    """Embed and append ``(resume_id, candidate_id, ResumeData)`` items whose text changed.
+
+    Returns the number of resumes encoded.
+    """
+    store = get_embedding_store('resumes')
+    pending = []
+    for resume_id, candidate_id, resume_data in items:
+        text = resume_embedding_text(resume_data)
+        if not text:
+            continue
+        tag = text_fingerprint(text)
+        current = store.get(resume_id)
+        if current is not None and current[1] == tag:
+            continue
+        pending.append((resume_id, candidate_id, tag, text))
+    if not pending:
+        return 0
+    vectors = encode_texts([text for *_, text in pending])
+    store.append([p[0] for p in pending], [p[1] for p in pending], [p[2] for p in pending], vectors)
+    return len(pending)
+
+
+def embed_resume_rows(resumes) -> int:
+    """Embed Resume rows (from stored text; see ``resume_store``)"""
+    from resume_store import load_resume_data
+
+    items = []
+    for resume in resumes:
+        resume_data = load_resume_data(resume, persist=False)
+        if resume_data is not None:
+            items.append((resume.id, resume.candidate_id, resume_data))
+    return embed_resumes(items)
+
+
+def job_vector(job_posting) -> np.ndarray:
+    """Embedding of a posting, encoded once per version of its text"""
+    store = get_embedding_store('jobs')
+    text = job_embedding_text(job_posting)
+    tag = text_fingerprint(text)
+    current = store.get(job_posting.id)
+    if current is not None and current[1] == tag:
+        return current[0]
+    vector = encode_texts([text])
+    store.append([job_posting.id], [job_posting.id], [tag], vector)
+    return vector[0]
+
+
+@dataclass
+class CandidateMatch:
+    candidate_id: int
+    resume_id: int
+    similarity: float  # cosine, -1..1
+
+
+def rank_candidates(job_posting, k: int = 30, nprobe: Optional[int] = None) -> List[CandidateMatch]:
+    """The ``k`` candidates whose latest embedded resume is closest to the posting.
+
+    Large stores with a built IVF index are searched approximately
+    (``nprobe`` cells; see ``ann_index``), smaller ones exactly.
+    """
+    from ann_index import search
+
+    matches = search(get_embedding_store('resumes'), job_vector(job_posting), k, nprobe=nprobe)
+    return [CandidateMatch(candidate_id=owner, resume_id=key, similarity=score) for key, owner, score in matches]
@@ -0,0 +1,273 @@
+"""
+Sandboxed text extraction for SmartHire AI.
+
+PyPDF2 and python-docx can hang or balloon in memory on malformed or
+hostile files. Extraction of PDF/DOCX uploads therefore runs in a small
+pool of subprocesses under ``resource`` limits: a cap on address space and
+a CPU-seconds budget per document. The parent enforces a hard wall-clock
+timeout and kills workers that overrun it. Workers are recycled after a
+number of documents so slow leaks in the libraries cannot accumulate.
+
+Failures raise ``ExtractionError`` with a ``kind``:
+
+``timeout``   no answer within the wall-clock limit (worker killed)
+``cpu``       the worker hit its CPU-seconds limit
+``oom``       the worker ran out of its address-space limit
+``corrupt``   the file could not be parsed as its type
+``error``     any other exception inside the worker
+``crash``     the worker died for another reason (e.g. a segfault)
+``empty``     the file was read but contained no text (e.g. a scanned PDF)
+
+On platforms without the ``resource`` module (Windows) workers run
+without rlimits; the timeout still applies.
+"""
+
+import atexit
+import os
+import queue
+import signal
+import threading
+import zipfile
+import multiprocessing
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SANDBOX_LIMITS = {
+    'workers': 2,
+    'memory_bytes': 1024 * 1024 * 1024,  # address space per worker
+    'cpu_seconds': 15,                   # CPU time per document
+    'timeout_seconds': 20.0,             # wall clock per document
+    'docs_per_worker': 50,               # recycle after this many documents
+    'ingest_memory_bytes': 4 * 1024 * 1024 * 1024  # bulk-ingest workers (spaCy loaded)
+}
+
+FAILURE_KINDS = ('timeout', 'cpu', 'oom', 'corrupt', 'error', 'crash', 'empty')
+
+
+class ExtractionError(Exception):
+    """Text extraction failed; ``kind`` is one of FAILURE_KINDS"""
+
+    def __init__(self, kind: str, message: str, file_path: str = ""):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+        self.message = message
+        self.file_path = file_path
+
+
+@dataclass
+class SandboxLimits:
+    memory_bytes: int = SANDBOX_LIMITS['memory_bytes']
+    cpu_seconds: int = SANDBOX_LIMITS['cpu_seconds']
+    timeout_seconds: float = SANDBOX_LIMITS['timeout_seconds']
+    docs_per_worker: int = SANDBOX_LIMITS['docs_per_worker']
+
+
+def apply_memory_limit(memory_bytes: int) -> None:
+    """Cap the address space of the current process (MemoryError past it)"""
+    if resource is None or not memory_bytes:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        memory_bytes = min(memory_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+
+
+def set_cpu_budget(seconds: int) -> None:
+    """Allow the current process ``seconds`` more CPU time before SIGXCPU.
+
+    RLIMIT_CPU counts the whole process lifetime, so the soft limit is
+    moved forward before each document instead of being set once.
+    """
+    if resource is None or not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + seconds + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def classify_exception(error: BaseException) -> str:
+    """Failure kind of an exception raised while extracting"""
+    if isinstance(error, MemoryError):
+        return 'oom'
+    try:
+        from PyPDF2.errors import PyPdfError
+    except ImportError:
+        PyPdfError = ()
+    try:
+        from docx.opc.exceptions import OpcError
+    except ImportError:
+        OpcError = ()
+    if isinstance(error, (PyPdfError, OpcError, zipfile.BadZipFile, UnicodeDecodeError,
+                          KeyError, ValueError, EOFError)):
+        return 'corrupt'
+    return 'error'
+
+
+def classify_exit(exitcode: Optional[int]) -> str:
+    """Failure kind of a worker that died without answering"""
+    if exitcode is not None and exitcode < 0:
+        if -exitcode == getattr(signal, 'SIGXCPU', None):
+            return 'cpu'
+        if -exitcode == signal.SIGKILL:
+            # Only the kernel OOM killer sends SIGKILL to a worker that is
+            # not being stopped for a timeout
+            return 'oom'
+    return 'crash'
+
+
+def _worker_main(conn, limits: SandboxLimits) -> None:
+    """Worker loop: receive a path, send back ('ok', text) or ('error', kind, message)"""
+    # Read long PDFs serially: a nested page pool would escape the per-document
+    # CPU budget and outlive a worker killed on timeout
+    os.environ['RESUME_PDF_WORKERS'] = '0'
+    from resume_parser import ResumeParser
+    parser = ResumeParser()
+    # Capped after the imports so the limit bounds what a document allocates
+    apply_memory_limit(limits.memory_bytes)
+
+    while True:
+        try:
+            file_path = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if file_path is None:
+            break
+        set_cpu_budget(limits.cpu_seconds)
+        try:
+            conn.send(('ok', parser.extract_text_strict(file_path)))
+        except BaseException as e:
+            conn.send(('error', classify_exception(e), f"{type(e).__name__}: {str(e)}"))
+
+
+class _Worker:
+    def __init__(self, context, limits: SandboxLimits):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, limits),
+                                       name='resume-extractor', daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.documents = 0
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=2)
+        self.conn.close()
+
+
+class ExtractionSandbox:
+    """Fixed-size pool of rlimited extraction subprocesses, started lazily"""
+
+    def __init__(self, workers: int = SANDBOX_LIMITS['workers'], limits: Optional[SandboxLimits] = None):
+        self.limits = limits or SandboxLimits()
+        self._context = multiprocessing.get_context('spawn')
+        # Idle slots; None means "start a worker when this slot is used"
+        self._idle: 'queue.Queue[Optional[_Worker]]' = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(None)
+        self._all = set()
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {'ok': 0, 'recycled': 0, **{kind: 0 for kind in FAILURE_KINDS}}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def _start_worker(self) -> _Worker:
+        worker = _Worker(self._context, self.limits)
+        with self._lock:
+            self._all.add(worker)
+        return worker
+
+    def _discard(self, worker: _Worker, kill: bool = False) -> None:
+        with self._lock:
+            self._all.discard(worker)
+        worker.stop(kill=kill)
+
+    def extract(self, file_path: str) -> str:
+        """Extract text from a file in a worker; raises ExtractionError on failure"""
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.process.is_alive():
+                worker = self._start_worker()
+            worker.conn.send(os.path.abspath(file_path))
+
+            if not worker.conn.poll(self.limits.timeout_seconds):
+                self._discard(worker, kill=True)
+                worker = None
+                self._count('timeout')
+                raise ExtractionError('timeout', f"no result after {self.limits.timeout_seconds}s", file_path)
+            try:
+                reply = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.process.join(timeout=2)
+                kind = classify_exit(worker.process.exitcode)
+                exitcode = worker.process.exitcode
+                self._discard(worker, kill=True)
+                worker = None
+                self._count(kind)
+                raise ExtractionError(kind, f"worker exited with code {exitcode}", file_path)
+
+            worker.documents += 1
+            if worker.documents >= self.limits.docs_per_worker:
+                self._discard(worker)
+                worker = None
+                self._count('recycled')
+
+            if reply[0] == 'ok':
+                self._count('ok')
+                return reply[1]
+            _, kind, message = reply
+            if kind == 'oom' and worker is not None:
+                # The worker may be left fragmented after a MemoryError
+                self._discard(worker, kill=True)
+                worker = None
+            self._count(kind)
+            raise ExtractionError(kind, message, file_path)
+        finally:
+            self._idle.put(worker)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'workers_running': len(self._all), **self.counts}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            workers = list(self._all)
+            self._all.clear()
+        for worker in workers:
+            worker.stop()
+
+
+_default_sandbox: Optional[ExtractionSandbox] = None
+_default_sandbox_lock = threading.Lock()
+
+
+def get_extraction_sandbox() -> Optional[ExtractionSandbox]:
+    """Process-wide sandbox; RESUME_SANDBOX_WORKERS=0 disables it (returns None)"""
+    global _default_sandbox
+    workers = int(os.environ.get('RESUME_SANDBOX_WORKERS', SANDBOX_LIMITS['workers']))
+    if workers <= 0:
+        return None
+    if _default_sandbox is None:
+        with _default_sandbox_lock:
+            if _default_sandbox is None:
+                _default_sandbox = ExtractionSandbox(workers)
+                atexit.register(_default_sandbox.shutdown)
+    return _default_sandbox
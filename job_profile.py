@@ -0,0 +1,200 @@
+"""
+Compiled job profiles for SmartHire AI.
+
+Everything scoring needs from a job posting (NLP keywords, required skills,
+seniority level, education requirements) is computed once per posting
+version and reused for every resume scored against it. Profiles are cached
+by ``(job_posting.id, updated_at)``, so editing a posting (which bumps
+``updated_at``) makes the next lookup rebuild it.
+
+Ad-hoc job descriptions that are not stored as a ``JobPosting`` (the upload
+forms, ``parse_resume(..., job_description)``) are cached by a hash of
+their text instead.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional
+
+# Skills calculate_match_score looks for in a job description
+MATCH_SKILLS = {
+    'python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php',
+    'swift', 'kotlin', 'go', 'rust', 'typescript', 'html', 'css',
+    'django', 'flask', 'react', 'angular', 'vue', 'node', 'spring',
+    'rails', 'laravel', '.net', 'tensorflow', 'pytorch', 'pandas',
+    'numpy', 'docker', 'kubernetes', 'git', 'aws', 'azure', 'gcp',
+    'mongodb', 'postgresql', 'mysql', 'sql', 'nosql', 'linux', 'ci/cd',
+    'jenkins', 'github actions', 'rest', 'graphql', 'api'
+}
+
+# Checked in order; the first keyword found in the title or description wins
+SENIORITY_LEVELS = {
+    'junior': 1,
+    'mid-level': 2,
+    'senior': 3,
+    'lead': 4,
+    'principal': 5,
+    'architect': 5
+}
+DEFAULT_SENIORITY_LEVEL = 2
+
+EDUCATION_LEVELS = ['phd', 'master', 'bachelor', 'associate', 'diploma', 'certificate']
+
+
+@dataclass
+class JobProfile:
+    """Job-side inputs to resume scoring, computed once per posting version"""
+    title: str = ""
+    description: str = ""
+    keywords: List[str] = field(default_factory=list)         # spaCy noun chunks / entities
+    required_skills: List[str] = field(default_factory=list)  # listed skills, or MATCH_SKILLS found
+    taxonomy_skills: List[str] = field(default_factory=list)  # canonical skills-taxonomy names
+    seniority_level: int = DEFAULT_SENIORITY_LEVEL
+    education_requirements: List[str] = field(default_factory=list)
+    job_id: Optional[int] = None
+    version: str = ""  # posting updated_at, or a content hash for ad-hoc profiles
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.job_id,
+            'version': self.version,
+            'title': self.title,
+            'keywords': self.keywords,
+            'required_skills': self.required_skills,
+            'taxonomy_skills': self.taxonomy_skills,
+            'seniority_level': self.seniority_level,
+            'education_requirements': self.education_requirements
+        }
+
+
+def build_job_profile(title: str, description: str, parser=None,
+                      required_skills: Optional[List[str]] = None) -> JobProfile:
+    """Analyze a job description (runs the NLP pipeline once).
+
+    ``required_skills`` overrides the skills found in the description, for
+    jobs that list them explicitly.
+    """
+    if parser is None:
+        from resume_parser import get_resume_parser
+        parser = get_resume_parser()
+
+    title = title or ""
+    description = description or ""
+    title_lower = title.lower()
+    description_lower = description.lower()
+
+    seniority_level = DEFAULT_SENIORITY_LEVEL
+    for keyword, level in SENIORITY_LEVELS.items():
+        if keyword in title_lower or keyword in description_lower:
+            seniority_level = level
+            break
+
+    return JobProfile(
+        title=title,
+        description=description,
+        keywords=parser._extract_keywords(description),
+        required_skills=(list(dict.fromkeys(required_skills)) if required_skills is not None
+                         else sorted(skill for skill in MATCH_SKILLS if skill in description_lower)),
+        taxonomy_skills=[skill['name'] for skill in parser.extract_skills(description)],
+        seniority_level=seniority_level,
+        education_requirements=[level for level in EDUCATION_LEVELS if level in description_lower]
+    )
+
+
+def job_posting_text(job_posting) -> str:
+    """The text a posting is scored against: description plus requirements"""
+    return f"{job_posting.description}\n{job_posting.requirements or ''}"
+
+
+class JobProfileCache:
+    """Thread-safe LRU of compiled job profiles"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, JobProfile]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_or_build(self, key: Hashable, build) -> JobProfile:
+        with self._lock:
+            profile = self._entries.get(key)
+            if profile is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return profile
+            self.misses += 1
+
+        # Build outside the lock; a concurrent duplicate build is harmless
+        profile = build()
+        with self._lock:
+            self._entries[key] = profile
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return profile
+
+    def for_posting(self, job_posting) -> JobProfile:
+        """Profile for a ``JobPosting``, rebuilt whenever ``updated_at`` changes"""
+        version = job_posting.updated_at.isoformat() if job_posting.updated_at else ""
+
+        def build():
+            profile = build_job_profile(job_posting.title, job_posting_text(job_posting))
+            profile.job_id = job_posting.id
+            profile.version = version
+            return profile
+
+        # Drop profiles of older versions of this posting before adding the new one
+        key = ('job', job_posting.id, version)
+        with self._lock:
+            if key not in self._entries:
+                for stale in [k for k in self._entries if k[:2] == ('job', job_posting.id)]:
+                    del self._entries[stale]
+        return self._get_or_build(key, build)
+
+    def for_text(self, description: str, title: str = "",
+                 required_skills: Optional[List[str]] = None) -> JobProfile:
+        """Profile for an ad-hoc job description, keyed by its content"""
+        skills = "\0".join(required_skills) if required_skills is not None else "\1"
+        digest = hashlib.sha256(f"{title}\0{description}\0{skills}".encode('utf-8')).hexdigest()
+
+        def build():
+            profile = build_job_profile(title, description, required_skills=required_skills)
+            profile.version = digest[:16]
+            return profile
+
+        return self._get_or_build(('text', digest), build)
+
+    def invalidate(self, job_id: int) -> None:
+        """Forget every cached version of a posting (e.g. after it is deleted)"""
+        with self._lock:
+            for key in [k for k in self._entries if k[:2] == ('job', job_id)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+job_profile_cache = JobProfileCache()
+
+
+def get_job_profile(job_posting) -> JobProfile:
+    return job_profile_cache.for_posting(job_posting)
+
+
+def get_text_profile(description: str, title: str = "",
+                     required_skills: Optional[List[str]] = None) -> JobProfile:
+    return job_profile_cache.for_text(description, title, required_skills)
+
+
+def profile_from_keywords(keywords: List[str], description: str = "") -> JobProfile:
+    """Uncached profile around precomputed keywords (e.g. handed to ingest workers)"""
+    digest = hashlib.sha256("\0".join(keywords).encode('utf-8')).hexdigest()
+    return JobProfile(description=description, keywords=list(keywords), version=f"kw-{digest[:16]}")
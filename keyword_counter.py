@@ -0,0 +1,141 @@
+"""
+One-pass keyword counting for ATS keyword density.
+
+Job keywords come from spaCy noun chunks, so most of them are phrases
+("senior software engineer", "distributed systems"). ``KeywordCounter``
+compiles a keyword set, phrases included, into a trie over word tokens
+and gets every keyword count and the resume's word count in a single scan
+of the text.
+
+Tokens are ``\\w+`` runs of the lowercased text, so a keyword matches on
+word boundaries and punctuation between words is ignored ("node.js"
+matches "Node.js" and "node js"). The word count is the number of
+whitespace-separated words, as before (``len(text.split())``), and is
+taken from the same scan.
+"""
+
+import re
+import hashlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+# Word runs, whitespace runs and punctuation runs
+_SCAN_RE = re.compile(r'(\w+)|(\s+)|[^\w\s]+')
+_TOKEN_RE = re.compile(r'\w+')
+
+DENSITY_THRESHOLD = 0.5  # percent of the resume's words
+
+
+def keyword_tokens(keyword: str) -> Tuple[str, ...]:
+    return tuple(_TOKEN_RE.findall(keyword.lower()))
+
+
+def token_fingerprint(text: str) -> str:
+    """Hash of the token stream keyword matching sees (ignores spacing, case, punctuation)"""
+    return hashlib.sha256('\x1f'.join(_TOKEN_RE.findall(text.lower())).encode('utf-8')).hexdigest()
+
+
+class KeywordCounter:
+    """Counts occurrences of a fixed keyword set (words or phrases) in texts"""
+
+    _END = ''  # trie key marking a complete keyword (never a token)
+
+    def __init__(self, keywords: Iterable[str], match_threshold: float = 0.7):
+        """``match_threshold`` is the match ratio for ``is_qualified``
+        (``ATS_CONFIG['keyword_threshold']``)."""
+        self.keywords: List[str] = list(keywords)
+        self.match_threshold = match_threshold
+        # Distinct lowercased keywords, in first-seen order
+        self.normalized: List[str] = list(dict.fromkeys(k.lower() for k in self.keywords))
+        self._trie: Dict = {}
+        for index, keyword in enumerate(self.normalized):
+            tokens = keyword_tokens(keyword)
+            if not tokens:
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(self._END, []).append(index)
+
+    def count(self, text: str) -> Tuple[List[int], int]:
+        """Counts per ``normalized`` keyword and the word count, in one pass"""
+        counts = [0] * len(self.normalized)
+        word_count = 0
+        in_word = False
+        # Trie nodes of phrases still being matched
+        active: List[Dict] = []
+        trie, end = self._trie, self._END
+
+        for token, space in _SCAN_RE.findall(text.lower()):
+            if space:
+                in_word = False
+                continue
+            # A word is a whitespace-separated run, punctuation included
+            if not in_word:
+                word_count += 1
+                in_word = True
+            if not token:
+                continue
+            if active:
+                next_active = []
+                for node in active:
+                    child = node.get(token)
+                    if child is not None:
+                        for index in child.get(end, ()):
+                            counts[index] += 1
+                        if len(child) > (end in child):
+                            next_active.append(child)
+                active = next_active
+            child = trie.get(token)
+            if child is not None:
+                for index in child.get(end, ()):
+                    counts[index] += 1
+                if len(child) > (end in child):
+                    active.append(child)
+
+        return counts, word_count
+
+    def density(self, text: str) -> Dict:
+        """Same result shape as ``ResumeParser.calculate_keyword_density``"""
+        if not text or not self.keywords:
+            return {}
+
+        counts, word_count = self.count(text)
+        results = {}
+        matched_keywords = 0
+        for keyword, count in zip(self.normalized, counts):
+            density = (count / word_count) * 100 if word_count > 0 else 0
+            results[keyword] = {
+                'count': count,
+                'density': round(density, 4),
+                'matches_required': density >= DENSITY_THRESHOLD
+            }
+            if results[keyword]['matches_required']:
+                matched_keywords += 1
+
+        match_ratio = matched_keywords / len(self.keywords)
+        return {
+            'keywords': results,
+            'match_ratio': match_ratio,
+            'is_qualified': match_ratio >= self.match_threshold,
+            'word_count': word_count
+        }
+
+    def count_many(self, texts: Iterable[str]) -> Tuple[List[List[int]], List[int]]:
+        """Batch mode: (counts per text, word count per text)"""
+        all_counts, word_counts = [], []
+        for text in texts:
+            counts, word_count = self.count(text or '')
+            all_counts.append(counts)
+            word_counts.append(word_count)
+        return all_counts, word_counts
+
+    def density_many(self, texts: Iterable[str]) -> List[Dict]:
+        """Batch mode of ``density``; the keyword set is compiled only once"""
+        return [self.density(text) for text in texts]
+
+
+@lru_cache(maxsize=256)
+def compile_keywords(keywords: Tuple[str, ...], match_threshold: float = 0.7) -> KeywordCounter:
+    """Shared compiled counter for a keyword set (e.g. one job's keywords)"""
+    return KeywordCounter(keywords, match_threshold)
@@ -0,0 +1,121 @@
+"""store ats score components, resume text, resume jobs and candidate neighbors
+
+Revision ID: 169377a1c478
+Revises:
+Create Date: 2026-10-18 00:19:27.389829
+
+The app runs ``db.create_all()`` on start-up, which creates missing tables
+but never alters existing ones. So by the time ``flask db upgrade`` runs,
+the new tables may already exist while ``applications`` still lacks its
+new columns: only what is missing is added.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '169377a1c478'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+APPLICATION_COLUMNS = [
+    ('skill_score', sa.Float()),
+    ('experience_score', sa.Float()),
+    ('education_score', sa.Float()),
+    ('compliance_score', sa.Float()),
+    ('keyword_density_score', sa.Float()),
+    ('score_engine_version', sa.String(length=20)),
+    ('scored_at', sa.DateTime())
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if 'candidate_neighbors' not in tables:
+        op.create_table('candidate_neighbors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=False),
+        sa.Column('neighbor_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('embedding_similarity', sa.Float(), nullable=False),
+        sa.Column('skill_jaccard', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ),
+        sa.ForeignKeyConstraint(['neighbor_id'], ['candidates.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('candidate_id', 'neighbor_id', name='uq_candidate_neighbor')
+        )
+        with op.batch_alter_table('candidate_neighbors', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_candidate_neighbors_neighbor_id'), ['neighbor_id'], unique=False)
+            batch_op.create_index('ix_candidate_neighbors_rank', ['candidate_id', 'rank'], unique=False)
+
+    if 'resume_jobs' not in tables:
+        op.create_table('resume_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('file_name', sa.String(length=255), nullable=True),
+        sa.Column('delete_file', sa.Boolean(), nullable=True),
+        sa.Column('resume_id', sa.Integer(), nullable=True),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('job_posting_id', sa.Integer(), nullable=True),
+        sa.Column('job_title', sa.String(length=200), nullable=True),
+        sa.Column('job_description', sa.Text(), nullable=True),
+        sa.Column('required_skills', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('error_kind', sa.String(length=20), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ),
+        sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings.id'], ),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('resume_jobs', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_resume_jobs_status'), ['status'], unique=False)
+
+    if 'resume_texts' not in tables:
+        op.create_table('resume_texts',
+        sa.Column('resume_id', sa.Integer(), nullable=False),
+        sa.Column('text_compressed', sa.LargeBinary(), nullable=False),
+        sa.Column('text_length', sa.Integer(), nullable=False),
+        sa.Column('section_offsets', sa.JSON(), nullable=True),
+        sa.Column('token_fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('parser_version', sa.String(length=40), nullable=True),
+        sa.Column('extracted_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+        sa.PrimaryKeyConstraint('resume_id')
+        )
+
+    existing = {column['name'] for column in inspector.get_columns('applications')}
+    missing = [(name, type_) for name, type_ in APPLICATION_COLUMNS if name not in existing]
+    if missing:
+        with op.batch_alter_table('applications', schema=None) as batch_op:
+            for name, type_ in missing:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        for name, _ in reversed(APPLICATION_COLUMNS):
+            batch_op.drop_column(name)
+
+    op.drop_table('resume_texts')
+    with op.batch_alter_table('resume_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resume_jobs_status'))
+
+    op.drop_table('resume_jobs')
+    with op.batch_alter_table('candidate_neighbors', schema=None) as batch_op:
+        batch_op.drop_index('ix_candidate_neighbors_rank')
+        batch_op.drop_index(batch_op.f('ix_candidate_neighbors_neighbor_id'))
+
+    op.drop_table('candidate_neighbors')
@@ -0,0 +1,120 @@
+"""
+Process-wide registry of heavy resources (NLP models, corpora, data files).
+
+Modules register a loader under a name at import time, which costs nothing;
+the loader runs on the first ``get_model(name)`` call and the result is
+shared by every caller in the process. Nothing touches the disk-heavy
+libraries or the network while modules are being imported.
+
+For readiness probes, ``warm_up()`` loads everything up front (optionally in
+a background thread) and ``status()`` reports what is loaded and how long
+each resource took.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class ModelRegistry:
+    """Lazily loaded, thread-safe named resources"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._load_times: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self.warm_up_state = 'not_started'  # not_started, running, done, failed
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register (or replace) the loader for a resource; it is not called yet"""
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._models.pop(name, None)
+            self._errors.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the resource, loading it on first use"""
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under '{name}'")
+
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited
+            if name in self._models:
+                return self._models[name]
+            start = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._errors[name] = str(e)
+                raise
+            self._load_times[name] = time.perf_counter() - start
+            self._errors.pop(name, None)
+            self._models[name] = model
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def unload(self, name: str) -> None:
+        """Drop a loaded resource so the next ``get`` reloads it"""
+        with self._locks.get(name, self._registry_lock):
+            self._models.pop(name, None)
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """Load the given (default: all) resources now; returns errors by name"""
+        self.warm_up_state = 'running'
+        results = {}
+        for name in list(names or self._loaders):
+            try:
+                self.get(name)
+                results[name] = None
+            except Exception as e:
+                print(f"Warm-up failed for {name}: {str(e)}")
+                results[name] = str(e)
+        self.warm_up_state = 'failed' if any(results.values()) else 'done'
+        return results
+
+    def warm_up_async(self, names: Optional[Iterable[str]] = None) -> threading.Thread:
+        """Run ``warm_up`` in a daemon thread so startup is not blocked"""
+        thread = threading.Thread(target=self.warm_up, args=(names,), name='model-warm-up', daemon=True)
+        self.warm_up_state = 'running'
+        thread.start()
+        return thread
+
+    def status(self) -> Dict:
+        """Loaded state, load time and last error for every registered resource"""
+        return {
+            'warm_up': self.warm_up_state,
+            'models': {
+                name: {
+                    'loaded': name in self._models,
+                    'load_seconds': round(self._load_times[name], 3) if name in self._load_times else None,
+                    'error': self._errors.get(name)
+                }
+                for name in self._loaders
+            }
+        }
+
+
+registry = ModelRegistry()
+
+
+def register_model(name: str, loader: Callable[[], Any]) -> None:
+    registry.register(name, loader)
+
+
+def get_model(name: str) -> Any:
+    return registry.get(name)
+
+
+def warm_up(names: Optional[Iterable[str]] = None, background: bool = False):
+    """Explicit warm-up hook, e.g. before a readiness probe reports ready"""
+    if background:
+        return registry.warm_up_async(names)
+    return registry.warm_up(names)
@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
+import zlib
 from werkzeug.security import generate_password_hash, check_password_hash
 
 db = SQLAlchemy()
@@ -82,6 +83,109 @@ class Resume(db.Model):
     skills = db.relationship('Skill', secondary='resume_skills', backref=db.backref('resumes', lazy=True))
     experiences = db.relationship('Experience', backref='resume', lazy=True)
     education = db.relationship('Education', backref='resume', lazy=True)
+    # Extracted plain text, in its own table so listing resumes never loads it
+    text_record = db.relationship('ResumeText', backref='resume', uselist=False, lazy='select',
+                                  cascade='all, delete-orphan')
+
+class ResumeText(db.Model):
+    """Plain text extracted from a resume file at upload time (zlib-compressed).
+    
+    Analyzers read the text from here instead of re-opening and re-parsing
+    the original PDF/DOCX.
+    """
+    __tablename__ = 'resume_texts'
+    
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), primary_key=True)
+    text_compressed = db.Column(db.LargeBinary, nullable=False)
+    text_length = db.Column(db.Integer, nullable=False)  # characters, uncompressed
+    section_offsets = db.Column(db.JSON, nullable=True)
+    token_fingerprint = db.Column(db.String(64), nullable=False)
+    parser_version = db.Column(db.String(40), nullable=True)
+    extracted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @property
+    def text(self):
+        return zlib.decompress(self.text_compressed).decode('utf-8')
+    
+    @text.setter
+    def text(self, value):
+        self.text_compressed = zlib.compress(value.encode('utf-8'), 6)
+        self.text_length = len(value)
+
+class ResumeJob(db.Model):
+    """Background parse-and-score job for an uploaded resume (see resume_jobs).
+
+    Jobs live in the database so queued and interrupted work is picked up
+    again after a web worker restart.
+    """
+    __tablename__ = 'resume_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, extracting, analyzing, done, failed
+    file_path = db.Column(db.String(500), nullable=False)
+    file_name = db.Column(db.String(255), nullable=True)
+    delete_file = db.Column(db.Boolean, default=False)  # remove the upload once the job ends
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=True)
+    job_posting_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), nullable=True)
+    job_title = db.Column(db.String(200), nullable=True)
+    job_description = db.Column(db.Text, nullable=True)
+    required_skills = db.Column(db.JSON, nullable=True)
+    result = db.Column(db.JSON, nullable=True)  # filled in stage by stage
+    error = db.Column(db.Text, nullable=True)
+    error_kind = db.Column(db.String(20), nullable=True)
+    attempts = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # last progress of the worker holding it
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    resume = db.relationship('Resume', backref=db.backref('jobs', lazy=True))
+    candidate = db.relationship('Candidate', backref=db.backref('resume_jobs', lazy=True))
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'file_name': self.file_name,
+            'resume_id': self.resume_id,
+            'candidate_id': self.candidate_id,
+            'job_posting_id': self.job_posting_id,
+            'result': self.result,
+            'error': self.error,
+            'error_kind': self.error_kind,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class CandidateNeighbor(db.Model):
+    """One edge of the precomputed similar-candidates graph (see candidate_neighbors).
+
+    Each candidate keeps its k nearest neighbours, ranked by a blend of
+    resume embedding similarity and skill-set Jaccard.
+    """
+    __tablename__ = 'candidate_neighbors'
+    __table_args__ = (
+        db.UniqueConstraint('candidate_id', 'neighbor_id', name='uq_candidate_neighbor'),
+        db.Index('ix_candidate_neighbors_rank', 'candidate_id', 'rank'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=False)
+    neighbor_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=False, index=True)
+    rank = db.Column(db.Integer, nullable=False)  # 1 = most similar
+    score = db.Column(db.Float, nullable=False)
+    embedding_similarity = db.Column(db.Float, nullable=False)
+    skill_jaccard = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Both directions cascade, so deleting a candidate removes every edge touching it
+    candidate = db.relationship('Candidate', foreign_keys=[candidate_id],
+                                backref=db.backref('neighbor_links', lazy=True, cascade='all, delete-orphan'))
+    neighbor = db.relationship('Candidate', foreign_keys=[neighbor_id],
+                               backref=db.backref('neighbor_of_links', lazy=True, cascade='all, delete-orphan'))
 
 class Skill(db.Model):
     __tablename__ = 'skills'
@@ -145,6 +249,14 @@ class Application(db.Model):
     resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False)
     status = db.Column(db.String(50), default='applied')  # applied, in_review, interview, offered, hired, rejected
     ats_score = db.Column(db.Float, nullable=True)
+    # ATS score components (0-100), so weight changes can be applied without re-parsing
+    skill_score = db.Column(db.Float, nullable=True)
+    experience_score = db.Column(db.Float, nullable=True)
+    education_score = db.Column(db.Float, nullable=True)
+    compliance_score = db.Column(db.Float, nullable=True)
+    keyword_density_score = db.Column(db.Float, nullable=True)  # keyword match ratio (0-1)
+    score_engine_version = db.Column(db.String(20), nullable=True)
+    scored_at = db.Column(db.DateTime, nullable=True)
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
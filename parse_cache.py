@@ -0,0 +1,198 @@
+"""
+Content-addressed cache for parsed resumes.
+
+The same file is uploaded again and again (re-applications, recruiter
+re-uploads), so parse results are cached by the SHA-256 of the file bytes
+plus the parser version tag. There are two tiers:
+
+* an in-process LRU of recently used entries, and
+* an on-disk SQLite table shared by every worker on the host.
+
+Entries expire after ``max_age_seconds``; the memory tier is bounded by
+entry count and the disk tier by total stored bytes (least recently used
+rows go first).
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'parse_cache.db')
+
+
+class ParseCache:
+    """Two-tier (memory LRU + SQLite) cache of parsed resume payloads"""
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_CACHE_PATH, max_memory_entries: int = 256,
+                 max_disk_bytes: int = 512 * 1024 * 1024, max_age_seconds: int = 30 * 24 * 3600):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.max_age_seconds = max_age_seconds
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            with self._connect() as conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS parse_cache (
+                        key TEXT PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS ix_parse_cache_accessed ON parse_cache (accessed_at)')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection that commits on success and is always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(digest: str, version: str) -> str:
+        return f"{version}:{digest}"
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """SHA-256 of a file, read in chunks so large uploads are not loaded at once"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.max_age_seconds is not None and time.time() - created_at > self.max_age_seconds
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return ``{'data': ..., 'text': ...}`` for a key, or None on a miss"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                payload, created_at = entry
+                if not self._expired(created_at):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return payload
+                del self._memory[key]
+
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        'SELECT data, text, created_at FROM parse_cache WHERE key = ?', (key,)
+                    ).fetchone()
+                    if row and not self._expired(row[2]):
+                        conn.execute('UPDATE parse_cache SET accessed_at = ? WHERE key = ?', (time.time(), key))
+                        payload = {'data': json.loads(row[0]), 'text': row[1]}
+                        with self._lock:
+                            self.disk_hits += 1
+                            self._remember(key, payload, row[2])
+                        return payload
+                    if row:
+                        conn.execute('DELETE FROM parse_cache WHERE key = ?', (key,))
+            except sqlite3.Error as e:
+                print(f"Parse cache read failed: {str(e)}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: Dict, text: str) -> None:
+        """Store a parse result in both tiers"""
+        now = time.time()
+        payload = {'data': data, 'text': text}
+        with self._lock:
+            self._remember(key, payload, now)
+
+        if not self.db_path:
+            return
+        try:
+            serialized = json.dumps(data)
+            size = len(serialized) + len(text.encode('utf-8'))
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO parse_cache (key, data, text, size, created_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, serialized, text, size, now, now)
+                )
+                self._evict_disk(conn, now)
+        except sqlite3.Error as e:
+            print(f"Parse cache write failed: {str(e)}")
+
+    def _remember(self, key: str, payload: Dict, created_at: float) -> None:
+        """Insert into the memory LRU (caller holds the lock)"""
+        self._memory[key] = (payload, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired rows, then least recently used rows until under the size budget"""
+        if self.max_age_seconds is not None:
+            conn.execute('DELETE FROM parse_cache WHERE created_at < ?', (now - self.max_age_seconds,))
+
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM parse_cache').fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in conn.execute('SELECT key, size FROM parse_cache ORDER BY accessed_at').fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            conn.execute('DELETE FROM parse_cache WHERE key = ?', (key,))
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM parse_cache')
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory)
+            }
+
+
+_default_cache: Optional[ParseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """Process-wide cache instance (path configurable via RESUME_PARSE_CACHE_PATH)"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ParseCache(os.environ.get('RESUME_PARSE_CACHE_PATH', DEFAULT_CACHE_PATH))
+    return _default_cache
@@ -0,0 +1,185 @@
+"""
+Per-stage timings and counters for resume parsing.
+
+``ResumeParser.parse_resume``, ``parse_text`` and ``analyze_resume`` open a
+trace with ``start_trace()``. A sampled trace times each stage with
+``perf_counter`` and records counters (bytes read, pages, tokens,
+entities, skills found). When it finishes it is attached to the returned
+``ResumeData.metrics`` and folded into the process-wide histogram
+registry, which ``/api/admin/parse-metrics`` dumps.
+
+Unsampled parses get ``NULL_TRACE``, whose methods do nothing, so the cost
+with sampling off is one random draw per parse. The sample rate comes
+from ``RESUME_METRICS_SAMPLE_RATE`` (0 turns tracing off, 1 traces every
+parse).
+"""
+
+import os
+import time
+import random
+import bisect
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+METRICS_CONFIG = {
+    'sample_rate': float(os.environ.get('RESUME_METRICS_SAMPLE_RATE', 0.1))
+}
+
+# Upper bucket bounds; the last bucket is unbounded
+TIME_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+COUNT_BUCKETS = [0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000,
+                 100000, 200000, 500000, 1000000, 5000000]
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max"""
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile (q in 0-100)"""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.total, 3),
+            'mean': round(self.total / self.count, 3) if self.count else None,
+            'min': round(self.min, 3) if self.min is not None else None,
+            'max': round(self.max, 3) if self.max is not None else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': {('+inf' if i == len(self.bounds) else str(self.bounds[i])): n
+                        for i, n in enumerate(self.buckets) if n}
+        }
+
+
+class MetricsRegistry:
+    """Process-wide histograms of stage timings (ms) and per-parse counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Histogram] = {}
+        self.counts: Dict[str, Histogram] = {}
+        self.traces = 0
+
+    def record(self, stages_ms: Dict[str, float], counts: Dict[str, int]) -> None:
+        with self._lock:
+            self.traces += 1
+            for name, value in stages_ms.items():
+                histogram = self.stages.get(name)
+                if histogram is None:
+                    histogram = self.stages[name] = Histogram(TIME_BUCKETS_MS)
+                histogram.observe(value)
+            for name, value in counts.items():
+                histogram = self.counts.get(name)
+                if histogram is None:
+                    histogram = self.counts[name] = Histogram(COUNT_BUCKETS)
+                histogram.observe(value)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'sample_rate': METRICS_CONFIG['sample_rate'],
+                'traces': self.traces,
+                'stages_ms': {name: h.to_dict() for name, h in sorted(self.stages.items())},
+                'counts': {name: h.to_dict() for name, h in sorted(self.counts.items())}
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+            self.counts.clear()
+            self.traces = 0
+
+
+metrics_registry = MetricsRegistry()
+
+
+class ParseTrace:
+    """Stage timings and counters of one sampled parse"""
+
+    active = True
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages_ms: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages_ms[name] = self.stages_ms.get(name, 0.0) + elapsed
+
+    def count(self, name: str, value: int) -> None:
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def finish(self, resume_data=None) -> Dict:
+        """Record the trace and attach it to ``resume_data.metrics`` (merging with any there)"""
+        self.stages_ms['total'] = (time.perf_counter() - self.started) * 1000
+        metrics_registry.record(self.stages_ms, self.counts)
+        metrics = {'stages_ms': {name: round(ms, 3) for name, ms in self.stages_ms.items()},
+                   'counts': dict(self.counts)}
+        if resume_data is not None:
+            if resume_data.metrics:
+                resume_data.metrics['stages_ms'].update(metrics['stages_ms'])
+                resume_data.metrics['counts'].update(metrics['counts'])
+            else:
+                resume_data.metrics = metrics
+        return metrics
+
+
+_NULL_STAGE = nullcontext()
+
+
+class _NullTrace:
+    """Trace of an unsampled parse: every method is a no-op"""
+
+    active = False
+
+    def stage(self, name: str):
+        return _NULL_STAGE
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+    def finish(self, resume_data=None) -> None:
+        return None
+
+
+NULL_TRACE = _NullTrace()
+
+
+def start_trace():
+    """A new ``ParseTrace`` for a sampled parse, ``NULL_TRACE`` otherwise"""
+    rate = METRICS_CONFIG['sample_rate']
+    if rate > 0 and (rate >= 1 or random.random() < rate):
+        return ParseTrace()
+    return NULL_TRACE
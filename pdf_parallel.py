@@ -0,0 +1,139 @@
+"""
+Page-parallel PDF text extraction.
+
+PyPDF2 extracts pages one after another, so a 200-page academic CV takes
+200 times as long as a one-page resume. Documents with at least
+``PDF_PARALLEL['min_pages']`` pages are split into contiguous page ranges
+that are extracted on a shared process pool. Each task opens the file
+itself, so only the path and page numbers cross the process boundary.
+Results are consumed in page order: callers see exactly the pages a serial
+pass would produce. Ranges are submitted lazily, a fixed number ahead of
+the one being consumed, so a caller that stops early (e.g. on a word
+limit) only wastes the ranges already running.
+
+``RESUME_PDF_WORKERS`` overrides the worker count; 0 or 1 disables the
+parallel path (e.g. inside processes that are already one of many
+workers). Sandbox extraction workers always read serially, so the page
+pool only runs for extraction outside the sandbox.
+"""
+
+import os
+import time
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from typing import Deque, Iterator, List, Optional, Tuple
+
+import PyPDF2
+
+PDF_PARALLEL = {
+    'min_pages': 30,           # documents shorter than this are read serially
+    'workers': min(4, os.cpu_count() or 1),
+    'min_pages_per_task': 8    # ranges are never split finer than this
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def configured_workers() -> int:
+    return int(os.environ.get('RESUME_PDF_WORKERS', PDF_PARALLEL['workers']))
+
+
+def should_parallelize(page_count: int, workers: Optional[int] = None) -> bool:
+    workers = configured_workers() if workers is None else workers
+    return workers > 1 and page_count >= PDF_PARALLEL['min_pages']
+
+
+def page_ranges(page_count: int, workers: int,
+                min_pages_per_task: int = PDF_PARALLEL['min_pages_per_task']) -> List[Tuple[int, int]]:
+    """Split pages ``1..page_count`` into at most ``workers`` contiguous ``(first, last)`` ranges"""
+    tasks = max(1, min(workers, page_count // max(1, min_pages_per_task)))
+    size, extra = divmod(page_count, tasks)
+    ranges, first = [], 1
+    for i in range(tasks):
+        last = first + size - 1 + (1 if i < extra else 0)
+        ranges.append((first, last))
+        first = last + 1
+    return ranges
+
+
+def extract_page_range(file_path: str, first: int, last: int) -> List[Tuple[int, str]]:
+    """``(page_number, text)`` for pages ``first..last`` that have text (runs in a pool worker)"""
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        pages = []
+        for page_number in range(first, min(last, len(reader.pages)) + 1):
+            page_text = reader.pages[page_number - 1].extract_text()
+            if page_text:
+                pages.append((page_number, page_text))
+        return pages
+
+
+def get_page_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool shared by all page-parallel extractions, started on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers or configured_workers(),
+                                            mp_context=multiprocessing.get_context('spawn'))
+                atexit.register(shutdown_page_pool)
+    return _pool
+
+
+def shutdown_page_pool(wait: bool = False) -> None:
+    """Stop the pool; pass ``wait`` when the calling process is about to exit"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+            _pool = None
+
+
+def iter_pages_parallel(file_path: str, page_count: int, workers: Optional[int] = None,
+                        deadline: Optional[float] = None, ahead: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """Yield ``(page_number, text)`` for pages ``1..page_count`` in order, extracted in parallel.
+
+    Pages are read in ranges of ``min_pages_per_task``; ``ahead`` ranges
+    (default ``workers - 1``, i.e. the whole pool) run beyond the one being
+    consumed. Callers likely to stop early should pass a small ``ahead``.
+    Stops quietly when the next range is not ready by ``deadline``
+    (a ``time.monotonic()`` value). Closing the generator cancels the
+    submitted ranges not yet started.
+    """
+    workers = workers or configured_workers()
+    ahead = workers - 1 if ahead is None else max(0, ahead)
+    pool = get_page_pool(workers)
+    path = os.path.abspath(file_path)
+    # Ranges of about min_pages_per_task pages, so an early stop wastes little
+    ranges = iter(page_ranges(page_count, page_count))
+    futures: Deque = deque()
+
+    def submit_next() -> None:
+        page_range = next(ranges, None)
+        if page_range is not None:
+            futures.append(pool.submit(extract_page_range, path, *page_range))
+
+    for _ in range(ahead + 1):
+        submit_next()
+    try:
+        while futures:
+            future = futures.popleft()
+            submit_next()
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                pages = future.result(timeout=timeout)
+            except FutureTimeout:
+                return
+            except BrokenProcessPool:
+                # A worker died (e.g. inside PyPDF2); start a fresh pool next time
+                shutdown_page_pool()
+                raise
+            yield from pages
+    finally:
+        for future in futures:
+            future.cancel()
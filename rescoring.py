@@ -0,0 +1,205 @@
+"""
+Re-weighting stored ATS scores.
+
+Each application stores the component scores of its ATS score (skills,
+experience, education, compliance, keyword density; see
+``scoring_engine``). When the ATS weights change, the new
+``Application.ats_score`` is a dot product of the stored components with
+the new weights. It is computed for all applications in one NumPy pass and
+written back in bulk, without touching a resume file.
+
+``reweight_applications(..., dry_run=True)`` computes the new scores and
+reports how rankings within each job would shift, without writing
+anything. ``backfill_score_components`` fills the components for
+applications scored before they were stored, from the stored resume text.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from scoring_engine import SCHEMES
+
+COMPONENTS = ['skills', 'experience', 'education', 'compliance', 'keyword_density']
+
+# Application column holding each component
+COMPONENT_COLUMNS = {
+    'skills': 'skill_score',
+    'experience': 'experience_score',
+    'education': 'education_score',
+    'compliance': 'compliance_score',
+    'keyword_density': 'keyword_density_score'
+}
+
+
+def store_score_components(application, result) -> None:
+    """Copy an ``ats`` ``ScoreResult`` onto an Application row (no commit)"""
+    for component, column in COMPONENT_COLUMNS.items():
+        setattr(application, column, result.components[component])
+    application.ats_score = result.score
+    application.score_engine_version = result.engine_version
+    application.scored_at = datetime.utcnow()
+
+
+@dataclass
+class JobRankShift:
+    """How one job's applicant ranking changes under new weights"""
+    job_posting_id: int
+    applications: int
+    moved: int = 0                 # applications whose rank changed
+    max_rank_shift: int = 0
+    entered_top: List[int] = field(default_factory=list)  # application ids
+    left_top: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_posting_id': self.job_posting_id,
+            'applications': self.applications,
+            'moved': self.moved,
+            'max_rank_shift': self.max_rank_shift,
+            'entered_top': self.entered_top,
+            'left_top': self.left_top
+        }
+
+
+@dataclass
+class RescoreReport:
+    weights: Dict[str, float]
+    dry_run: bool
+    applications: int = 0
+    changed: int = 0
+    mean_abs_delta: float = 0.0
+    max_abs_delta: float = 0.0
+    skipped: int = 0               # applications without stored components
+    jobs: List[JobRankShift] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            'weights': self.weights,
+            'dry_run': self.dry_run,
+            'applications': self.applications,
+            'changed': self.changed,
+            'mean_abs_delta': round(self.mean_abs_delta, 4),
+            'max_abs_delta': round(self.max_abs_delta, 4),
+            'skipped': self.skipped,
+            'jobs': [job.to_dict() for job in self.jobs]
+        }
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """1-based rank of each score, best first; ties keep row order"""
+    order = np.argsort(-scores, kind='stable')
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    return ranks
+
+
+def compute_rank_shifts(ids: np.ndarray, job_ids: np.ndarray, old_scores: np.ndarray,
+                        new_scores: np.ndarray, top: int = 10) -> List[JobRankShift]:
+    """Per-job comparison of the rankings under old and new scores"""
+    shifts = []
+    for job_id in np.unique(job_ids):
+        rows = np.flatnonzero(job_ids == job_id)
+        old_ranks = _ranks(old_scores[rows])
+        new_ranks = _ranks(new_scores[rows])
+        delta = np.abs(old_ranks - new_ranks)
+        old_top = set(ids[rows][old_ranks <= top].tolist())
+        new_top = set(ids[rows][new_ranks <= top].tolist())
+        shifts.append(JobRankShift(
+            job_posting_id=int(job_id),
+            applications=len(rows),
+            moved=int(np.count_nonzero(delta)),
+            max_rank_shift=int(delta.max()) if len(delta) else 0,
+            entered_top=sorted(new_top - old_top),
+            left_top=sorted(old_top - new_top)
+        ))
+    return shifts
+
+
+def reweight_applications(weights: Optional[Dict[str, float]] = None, job_posting_id: Optional[int] = None,
+                          dry_run: bool = False, top: int = 10, batch_size: int = 1000) -> RescoreReport:
+    """Recompute ``Application.ats_score`` from stored components.
+
+    Components missing from ``weights`` keep the current ``ats`` weight of
+    the scoring engine. Must be called inside an application context.
+    """
+    from sqlalchemy import or_
+    from models import db, Application
+
+    weights = {**{name: SCHEMES['ats']['weights'][name] for name in COMPONENTS}, **(weights or {})}
+    unknown = set(weights) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown score components: {', '.join(sorted(unknown))}")
+    report = RescoreReport(weights=weights, dry_run=dry_run)
+
+    query = Application.query
+    if job_posting_id is not None:
+        query = query.filter(Application.job_posting_id == job_posting_id)
+    columns = [getattr(Application, COMPONENT_COLUMNS[name]) for name in COMPONENTS]
+    report.skipped = query.filter(or_(*[column.is_(None) for column in columns])).count()
+
+    rows = (query.filter(*[column.isnot(None) for column in columns])
+            .with_entities(Application.id, Application.job_posting_id, Application.ats_score, *columns)
+            .all())
+    report.applications = len(rows)
+    if not rows:
+        return report
+
+    data = np.array([[value if value is not None else np.nan for value in row] for row in rows], dtype=np.float64)
+    ids = data[:, 0].astype(np.int64)
+    job_ids = data[:, 1].astype(np.int64)
+    old_scores = np.nan_to_num(data[:, 2])
+    components = np.nan_to_num(data[:, 3:])
+    weight_vector = np.array([weights.get(name, 0.0) for name in COMPONENTS])
+
+    new_scores = np.round(components @ weight_vector, SCHEMES['ats']['precision'])
+    delta = np.abs(new_scores - old_scores)
+    changed = np.flatnonzero(delta > 0)
+    report.changed = len(changed)
+    report.mean_abs_delta = float(delta.mean())
+    report.max_abs_delta = float(delta.max())
+    report.jobs = compute_rank_shifts(ids, job_ids, old_scores, new_scores, top)
+
+    if not dry_run and len(changed):
+        for start in range(0, len(changed), batch_size):
+            chunk = changed[start:start + batch_size]
+            db.session.bulk_update_mappings(Application, [
+                {'id': int(ids[row]), 'ats_score': float(new_scores[row])} for row in chunk
+            ])
+        db.session.commit()
+    return report
+
+
+def backfill_score_components(job_posting_id: Optional[int] = None, limit: Optional[int] = None,
+                              commit_every: int = 100) -> int:
+    """Score applications missing any stored component; returns how many were scored"""
+    from sqlalchemy import or_
+    from models import db, Application, Resume
+    from job_profile import get_job_profile
+    from resume_store import load_resume_data
+    from scoring_engine import score_resume
+
+    columns = [getattr(Application, column) for column in COMPONENT_COLUMNS.values()]
+    query = Application.query.filter(or_(*[column.is_(None) for column in columns]))
+    if job_posting_id is not None:
+        query = query.filter(Application.job_posting_id == job_posting_id)
+    if limit:
+        query = query.limit(limit)
+
+    scored = 0
+    for application in query.all():
+        resume = Resume.query.get(application.resume_id)
+        if not resume or not application.job_posting:
+            continue
+        resume_data = load_resume_data(resume)
+        if resume_data is None:
+            continue
+        result = score_resume(resume_data, get_job_profile(application.job_posting), 'ats')
+        store_score_components(application, result)
+        scored += 1
+        if scored % commit_every == 0:
+            db.session.commit()
+    db.session.commit()
+    return scored
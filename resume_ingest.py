@@ -0,0 +1,266 @@
+"""
+Bulk resume ingestion for SmartHire AI.
+
+Large drops of resumes (career-fair exports, agency dumps) are parsed by a
+pool of warm worker processes. Each worker loads the spaCy model once and
+handles files in chunks: text extraction runs per file, then the NER and
+tokenization stages of the whole chunk go through ``nlp.pipe`` in one go
+(see ``ResumeParser.parse_texts``). Finished chunks are streamed back to the
+caller as soon as they are ready so they can be written to the database
+while the rest of the drop is still being parsed.
+
+Usage from Python::
+
+    stats = ingest_resumes('/data/career_fair', workers=8)
+    print(f"{stats.files_per_second:.1f} files/s")
+
+or from the command line (see ``flask ingest-resumes --help``).
+"""
+
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
+
+# Parser instance owned by each worker process (set by _init_worker)
+_worker_parser = None
+
+
+@dataclass
+class IngestResult:
+    """Outcome of parsing a single resume file"""
+    file_path: str
+    resume_data: Optional[object] = None  # ResumeData
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and self.resume_data is not None
+
+
+@dataclass
+class IngestStats:
+    """Running totals for an ingestion run"""
+    files: int = 0
+    parsed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'files': self.files,
+            'parsed': self.parsed,
+            'failed': self.failed,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'files_per_second': round(self.files_per_second, 2)
+        }
+
+
+def collect_resume_files(source: str) -> List[str]:
+    """Resolve a directory or a manifest into a list of resume file paths.
+
+    A manifest is either a JSON list of paths or a text file with one path
+    per line (blank lines and ``#`` comments are ignored). Relative paths in
+    a manifest are resolved against the manifest's directory.
+    """
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                    paths.append(os.path.join(root, name))
+        return sorted(paths)
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    if source.lower().endswith('.json'):
+        entries = json.loads(content)
+    else:
+        entries = [line.strip() for line in content.splitlines()
+                   if line.strip() and not line.strip().startswith('#')]
+
+    return [p if os.path.isabs(p) else os.path.join(base_dir, p) for p in entries]
+
+
+def _init_worker() -> None:
+    """Load the parser (and with it the spaCy model) once per worker process.
+
+    Ingest workers are already separate processes, so they extract in-process
+    under the sandbox memory cap instead of through a nested sandbox pool,
+    and read long PDFs serially instead of on a nested page pool.
+    """
+    global _worker_parser
+    from resume_parser import get_resume_parser
+    from model_registry import get_model
+    from extraction_sandbox import SANDBOX_LIMITS, apply_memory_limit
+    os.environ['RESUME_SANDBOX_WORKERS'] = '0'
+    os.environ['RESUME_PDF_WORKERS'] = '0'
+    _worker_parser = get_resume_parser()
+    get_model('spacy_en')
+    # Set after loading the model so the cap only bounds per-file growth
+    apply_memory_limit(SANDBOX_LIMITS['ingest_memory_bytes'])
+
+
+def _parse_chunk(file_paths: List[str], job_description: str, batch_size: int,
+                 job_keywords: Optional[List[str]] = None) -> List[Tuple[str, Optional[object], str]]:
+    """Extract and parse one chunk of files inside a worker process"""
+    from extraction_sandbox import classify_exception
+    texts = []
+    errors = {}
+    for path in file_paths:
+        try:
+            texts.append(_worker_parser.extract_text_strict(path))
+        except Exception as e:
+            texts.append("")
+            errors[path] = f"extraction failed ({classify_exception(e)}): {str(e)}"
+
+    parsed = _worker_parser.parse_texts(texts, job_description, batch_size=batch_size,
+                                         job_keywords=job_keywords)
+
+    results = []
+    for path, text, resume_data in zip(file_paths, texts, parsed):
+        if path in errors:
+            results.append((path, None, errors[path]))
+        elif not text:
+            results.append((path, None, "no text could be extracted"))
+        else:
+            results.append((path, resume_data, ""))
+    return results
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def iter_parsed_resumes(file_paths: List[str], workers: Optional[int] = None,
+                        batch_size: int = 32,
+                        job_description: str = "",
+                        job_keywords: Optional[List[str]] = None) -> Iterator[IngestResult]:
+    """Parse files on a process pool, yielding results as chunks complete.
+
+    Results are yielded in completion order, not input order. Pass the
+    ``job_keywords`` of a compiled job profile so workers do not each
+    re-analyze the job description.
+    """
+    if not file_paths:
+        return
+    workers = workers or os.cpu_count() or 1
+
+    # spawn keeps workers clear of the parent's DB connections and model state
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(_parse_chunk, chunk, job_description, batch_size, job_keywords): chunk
+            for chunk in _chunks(file_paths, batch_size)
+        }
+        for future in as_completed(futures):
+            try:
+                chunk_results = future.result()
+            except Exception as e:
+                # The worker died (e.g. crashed inside a native library)
+                chunk_results = [(path, None, f"worker failed: {str(e)}") for path in futures[future]]
+            for path, resume_data, error in chunk_results:
+                yield IngestResult(file_path=path, resume_data=resume_data, error=error)
+
+
+def ingest_resumes(source, workers: Optional[int] = None, batch_size: int = 32,
+                   job_description: str = "",
+                   job_keywords: Optional[List[str]] = None,
+                   on_result: Optional[Callable[[IngestResult], None]] = None) -> IngestStats:
+    """Parse a directory, manifest or list of resume files in bulk.
+
+    ``on_result`` is called for every file as soon as its chunk finishes,
+    which is where callers persist results (see ``store_ingest_result``).
+    """
+    file_paths = collect_resume_files(source) if isinstance(source, str) else list(source)
+    stats = IngestStats()
+    start = time.perf_counter()
+
+    for result in iter_parsed_resumes(file_paths, workers, batch_size,
+                                      job_description, job_keywords):
+        stats.files += 1
+        if result.ok:
+            stats.parsed += 1
+        else:
+            stats.failed += 1
+            stats.errors[result.file_path] = result.error
+        if on_result:
+            on_result(result)
+        stats.elapsed = time.perf_counter() - start
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def _placeholder_email(file_path: str) -> str:
+    """Stable stand-in for resumes without an email (Candidate.email is required)"""
+    digest = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+    return f"unknown-{digest[:12]}@ingest.invalid"
+
+
+def store_ingest_result(result: IngestResult, commit: bool = True):
+    """Create or update the Candidate and Resume rows for a parsed file.
+
+    Must be called inside an application context. Candidates are matched
+    on email so re-ingesting a drop does not create duplicates.
+    Returns the Resume row, or None when the file failed to parse.
+    """
+    from models import db, Candidate, Resume
+    from resume_parser import get_resume_parser
+    from resume_store import store_resume_text
+
+    if not result.ok:
+        return None
+
+    resume_data = result.resume_data
+    email = resume_data.email or _placeholder_email(result.file_path)
+    name_parts = (resume_data.name or '').split()
+    if not name_parts or resume_data.name == 'Unknown':
+        name_parts = ['Unknown', 'Candidate']
+
+    candidate = Candidate.query.filter_by(email=email).first()
+    if not candidate:
+        candidate = Candidate(
+            first_name=name_parts[0][:50],
+            last_name=' '.join(name_parts[1:])[:50] or '-',
+            email=email,
+            phone=(resume_data.phone or None),
+            status='new',
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        db.session.add(candidate)
+    if resume_data.ats_score:
+        candidate.ats_score = resume_data.ats_score
+
+    resume = Resume(
+        candidate=candidate,
+        file_name=os.path.basename(result.file_path),
+        file_path=result.file_path,
+        file_type=os.path.splitext(result.file_path)[1].lstrip('.').lower(),
+        file_size=os.path.getsize(result.file_path),
+        parsed_data=resume_data.to_dict(),
+        created_at=datetime.utcnow()
+    )
+    store_resume_text(resume, resume_data, get_resume_parser().cache_version)
+    db.session.add(resume)
+
+    if commit:
+        db.session.commit()
+    return resume
@@ -0,0 +1,387 @@
+"""
+Background resume processing for SmartHire AI.
+
+Upload routes save the file, create a ``ResumeJob`` row and return its id
+immediately. A ``ResumeJobRunner``, started with each app process (or run
+on its own by ``flask resume-jobs``), works through queued jobs on a
+small thread pool that shares the warm, process-wide
+parser (PDF/DOCX extraction itself runs in the extraction sandbox).
+
+A job moves through ``queued -> extracting -> analyzing -> done`` (or
+``failed``). Each stage writes what it has learned to ``ResumeJob.result``
+so a status poll sees partial results (e.g. the parsed contact details
+before scoring has finished). The ``Resume``, ``Application`` and
+``Candidate.ats_score`` updates are committed when the job completes,
+after which the resume is embedded for semantic ranking
+(``embedding_index``).
+
+Jobs are claimed with a conditional UPDATE, so several web processes can
+share one queue. While a job runs, its worker refreshes ``heartbeat_at``
+every ``heartbeat_seconds``; a job whose heartbeat stopped (the process
+was restarted mid-job) is put back in the queue after ``lease_seconds``,
+up to ``max_attempts`` tries.
+"""
+
+import os
+import copy
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+RESUME_JOB_CONFIG = {
+    'workers': int(os.environ.get('RESUME_JOB_WORKERS', 2)),
+    'poll_seconds': 2.0,      # how often the dispatcher looks for work without a wake-up
+    'lease_seconds': 300,     # in-progress jobs without a heartbeat for this long are requeued
+    'heartbeat_seconds': 30,  # how often a worker refreshes the heartbeat of its running job
+    'max_attempts': 3
+}
+
+JOB_STATES = ('queued', 'extracting', 'analyzing', 'done', 'failed')
+ACTIVE_STATES = ('extracting', 'analyzing')
+FINAL_STATES = ('done', 'failed')
+
+
+def create_resume_job(file_path: str, file_name: str = "", resume=None, candidate=None,
+                      job_posting_id: Optional[int] = None, job_title: str = "", job_description: str = "",
+                      required_skills: Optional[List[str]] = None, delete_file: bool = False):
+    """Add a queued ``ResumeJob`` to the session (the caller commits, then calls ``notify``)"""
+    from models import db, ResumeJob
+
+    job = ResumeJob(
+        id=uuid.uuid4().hex,
+        status='queued',
+        file_path=file_path,
+        file_name=file_name or os.path.basename(file_path),
+        delete_file=delete_file,
+        resume=resume,
+        candidate=candidate,
+        job_posting_id=job_posting_id,
+        job_title=job_title or None,
+        job_description=job_description or None,
+        required_skills=required_skills,
+        result={},
+        attempts=0,
+        created_at=datetime.utcnow()
+    )
+    db.session.add(job)
+    return job
+
+
+def _set_state(job, status: str, **result) -> None:
+    """Move a job to ``status``, merge ``result`` into its partial results and commit"""
+    from models import db
+
+    job.status = status
+    job.heartbeat_at = datetime.utcnow()
+    if result:
+        # Reassign so the JSON column is marked dirty
+        job.result = {**(job.result or {}), **result}
+    if status in FINAL_STATES:
+        job.finished_at = job.heartbeat_at
+    db.session.commit()
+
+
+def process_resume_job(job_id: str) -> None:
+    """Extract, parse and score one claimed job. Runs inside an application context."""
+    from models import db, ResumeJob, JobPosting, Application
+    from extraction_sandbox import ExtractionError
+    from job_profile import get_job_profile, get_text_profile, job_posting_text
+    from rescoring import store_score_components
+    from resume_parser import ResumeData, get_resume_parser
+    from resume_store import store_resume_text
+    from scoring_engine import score_resume
+
+    job = ResumeJob.query.get(job_id)
+    if job is None:
+        return
+    parser = get_resume_parser()
+
+    try:
+        # Same content-addressed parse cache as parse_resume, so a re-uploaded file is not re-parsed
+        cache, cache_key, cached = parser.cache, None, None
+        if cache is not None:
+            cache_key = cache.make_key(cache.hash_file(job.file_path), parser.cache_version)
+            cached = cache.get(cache_key)
+        if cached is not None:
+            text = cached['text']
+            _set_state(job, 'analyzing', chars=len(text))
+            resume_data = ResumeData.from_dict(copy.deepcopy(cached['data']), raw_text=text)
+        else:
+            # queued -> extracting happened when the job was claimed
+            text = parser.extract_text(job.file_path)
+            if not text:
+                raise ExtractionError('empty', 'no text could be extracted', job.file_path)
+            _set_state(job, 'analyzing', chars=len(text))
+
+            resume_data = parser.parse_text(text)
+            if cache_key is not None:
+                cache.put(cache_key, resume_data.to_dict(), text)
+        _set_state(job, 'analyzing', name=resume_data.name, email=resume_data.email, phone=resume_data.phone,
+                   skills=[skill['name'] for skill in resume_data.skills],
+                   experience=resume_data.experience, education=resume_data.education)
+
+        scores: Dict = {}
+        job_posting = JobPosting.query.get(job.job_posting_id) if job.job_posting_id else None
+        if job_posting is not None:
+            result = score_resume(resume_data, get_job_profile(job_posting), 'ats')
+            scores['ats_score'] = result.score
+            if job.resume_id:
+                for application in Application.query.filter_by(resume_id=job.resume_id,
+                                                               job_posting_id=job_posting.id):
+                    store_score_components(application, result)
+        elif job.job_description or job.job_title:
+            description = job.job_description or job.job_title
+            parser.analyze_resume(resume_data, description)
+            scores['ats_score'] = resume_data.ats_score
+        if job.required_skills:
+            description = job_posting_text(job_posting) if job_posting else (job.job_description or "")
+            profile = get_text_profile(description, job.job_title or "", job.required_skills)
+            match = score_resume(resume_data, profile, 'skill_overlap')
+            scores['match_score'] = int(match.components['required_skills'])
+            scores['matched_skills'] = match.matched_skills
+            scores['missing_skills'] = match.missing_skills
+
+        if job.resume is not None:
+            job.resume.parsed_data = resume_data.to_dict()
+            store_resume_text(job.resume, resume_data, parser.cache_version)
+        candidate = job.candidate or (job.resume.candidate if job.resume is not None else None)
+        if candidate is not None and 'ats_score' in scores:
+            candidate.ats_score = scores['ats_score']
+        _set_state(job, 'done', **scores)
+
+        if job.resume is not None:
+            # Embed for semantic ranking now, so /api/top-candidates never encodes resumes,
+            # and refresh the candidate's place in the similar-candidates graph
+            try:
+                from candidate_neighbors import update_candidate_neighbors
+                from embedding_index import embed_resumes
+                if embed_resumes([(job.resume.id, job.resume.candidate_id, resume_data)]):
+                    update_candidate_neighbors(job.resume.candidate_id)
+                    db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Could not embed resume {job.resume_id}: {str(e)}")
+
+    except ExtractionError as e:
+        db.session.rollback()
+        job.error, job.error_kind = e.message, e.kind
+        _set_state(job, 'failed')
+    except Exception as e:
+        db.session.rollback()
+        print(f"Resume job {job_id} failed: {str(e)}")
+        job.error, job.error_kind = str(e), 'error'
+        _set_state(job, 'failed')
+    finally:
+        remove_job_upload(job)
+
+
+def remove_job_upload(job) -> None:
+    """Delete the upload of a finished job that owns its file (``delete_file``)"""
+    if job.delete_file and job.status in FINAL_STATES:
+        try:
+            os.remove(job.file_path)
+        except OSError:
+            pass
+
+
+def claim_job(job_id: str) -> bool:
+    """Atomically move a queued job to ``extracting``; False if another worker got it"""
+    from models import db, ResumeJob
+
+    now = datetime.utcnow()
+    claimed = (ResumeJob.query
+               .filter(ResumeJob.id == job_id, ResumeJob.status == 'queued')
+               .update({'status': 'extracting', 'started_at': now, 'heartbeat_at': now,
+                        'attempts': ResumeJob.attempts + 1}, synchronize_session=False))
+    db.session.commit()
+    return claimed == 1
+
+
+def touch_job(job_id: str) -> bool:
+    """Refresh the heartbeat of an in-progress job; False once it is no longer in progress"""
+    from models import db, ResumeJob
+
+    touched = (ResumeJob.query
+               .filter(ResumeJob.id == job_id, ResumeJob.status.in_(ACTIVE_STATES))
+               .update({'heartbeat_at': datetime.utcnow()}, synchronize_session=False))
+    db.session.commit()
+    return touched == 1
+
+
+def release_job(job_id: str) -> None:
+    """Put a claimed job that never started back in the queue, without using up an attempt"""
+    from models import db, ResumeJob
+
+    (ResumeJob.query
+     .filter(ResumeJob.id == job_id, ResumeJob.status == 'extracting')
+     .update({'status': 'queued', 'attempts': ResumeJob.attempts - 1}, synchronize_session=False))
+    db.session.commit()
+
+
+def requeue_stale_jobs(lease_seconds: int = RESUME_JOB_CONFIG['lease_seconds'],
+                       max_attempts: int = RESUME_JOB_CONFIG['max_attempts']) -> int:
+    """Requeue in-progress jobs whose worker went away; returns how many were touched"""
+    from models import db, ResumeJob
+
+    cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+    stale = (ResumeJob.query
+             .filter(ResumeJob.status.in_(ACTIVE_STATES), ResumeJob.heartbeat_at < cutoff)
+             .all())
+    abandoned = []
+    for job in stale:
+        if (job.attempts or 0) >= max_attempts:
+            job.status, job.error_kind = 'failed', 'abandoned'
+            job.error = f"worker stopped responding {job.attempts} times"
+            job.finished_at = datetime.utcnow()
+            abandoned.append(job)
+        else:
+            job.status = 'queued'
+    if stale:
+        db.session.commit()
+    for job in abandoned:
+        remove_job_upload(job)
+    return len(stale)
+
+
+class ResumeJobRunner:
+    """Dispatcher thread plus worker pool that processes queued resume jobs"""
+
+    def __init__(self, app, workers: int = RESUME_JOB_CONFIG['workers'],
+                 poll_seconds: float = RESUME_JOB_CONFIG['poll_seconds'],
+                 heartbeat_seconds: float = RESUME_JOB_CONFIG['heartbeat_seconds']):
+        self.app = app
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='resume-job')
+        self._slots = threading.Semaphore(workers)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.processed = 0
+
+    def start(self) -> 'ResumeJobRunner':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._dispatch_loop, name='resume-job-dispatcher', daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def notify(self) -> None:
+        """Wake the dispatcher (call after committing a new job)"""
+        self._wake.set()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=wait)
+
+    def _dispatch_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    self.dispatch_once()
+            except Exception as e:
+                print(f"Resume job dispatcher error: {str(e)}")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def dispatch_once(self) -> int:
+        """Requeue stale jobs and hand queued ones to free workers; returns jobs started"""
+        from models import db, ResumeJob
+
+        requeue_stale_jobs()
+        started = 0
+        while self._slots.acquire(blocking=False):
+            candidates = (ResumeJob.query.with_entities(ResumeJob.id)
+                          .filter(ResumeJob.status == 'queued')
+                          .order_by(ResumeJob.created_at)
+                          .limit(self.workers).all())
+            job_id = next((row.id for row in candidates if claim_job(row.id)), None)
+            db.session.remove()
+            if job_id is None:
+                self._slots.release()
+                break
+            try:
+                self._executor.submit(self._run, job_id)
+            except RuntimeError:
+                # The interpreter is shutting down: leave the job to another process
+                release_job(job_id)
+                db.session.remove()
+                self._slots.release()
+                break
+            started += 1
+        return started
+
+    def _run(self, job_id: str) -> None:
+        from models import db
+        finished = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(job_id, finished),
+                                     name='resume-job-heartbeat', daemon=True)
+        heartbeat.start()
+        try:
+            with self.app.app_context():
+                try:
+                    process_resume_job(job_id)
+                finally:
+                    db.session.remove()
+            self.processed += 1
+        finally:
+            finished.set()
+            heartbeat.join()
+            self._slots.release()
+            self._wake.set()
+
+    def _heartbeat_loop(self, job_id: str, finished: threading.Event) -> None:
+        """Keep a running job's lease alive, however long a stage takes"""
+        from models import db
+        while not finished.wait(self.heartbeat_seconds):
+            try:
+                with self.app.app_context():
+                    try:
+                        if not touch_job(job_id):
+                            return
+                    finally:
+                        db.session.remove()
+            except Exception as e:
+                print(f"Resume job {job_id} heartbeat failed: {str(e)}")
+
+    def stats(self) -> Dict:
+        return {'running': self.running, 'workers': self.workers, 'processed': self.processed}
+
+
+_runner: Optional[ResumeJobRunner] = None
+_runner_pid: Optional[int] = None
+_runner_lock = threading.Lock()
+
+
+def get_resume_job_runner(app) -> Optional[ResumeJobRunner]:
+    """This process's runner, started on first use; None when ``RESUME_JOB_WORKERS`` is 0
+    (jobs are then only processed by ``flask resume-jobs``).
+
+    A process forked after the runner started (e.g. ``gunicorn --preload``)
+    has none of its threads, so it starts a runner of its own.
+    """
+    global _runner, _runner_pid
+    if _runner_pid != os.getpid() and RESUME_JOB_CONFIG['workers'] > 0:
+        with _runner_lock:
+            if _runner_pid != os.getpid():
+                _runner = ResumeJobRunner(app).start()
+                _runner_pid = os.getpid()
+    return _runner
+
+
+def stop_resume_job_runner() -> None:
+    """Stop this process's runner, waiting for its running jobs"""
+    global _runner, _runner_pid
+    with _runner_lock:
+        if _runner is not None and _runner_pid == os.getpid():
+            _runner.stop()
+        _runner, _runner_pid = None, None
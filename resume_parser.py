@@ -1,15 +1,28 @@
 import os
 import re
+import copy
 import json
+import hashlib
+import threading
 import mimetypes
-import spacy
 import PyPDF2
 import docx
 import math
+import time
 from collections import Counter
-from typing import Dict, List, Optional, Union, Tuple, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Tuple, Set
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
+from skill_matcher import SkillMatcher, DEFAULT_TAXONOMY_PATH
+from keyword_counter import compile_keywords
+from docx_text import extract_docx_text, DOCX_FORMAT_ERRORS
+from pdf_parallel import should_parallelize, iter_pages_parallel
+from parse_metrics import NULL_TRACE, start_trace
+from model_registry import register_model, get_model
+from extraction_sandbox import ExtractionError
+
+# Bump whenever extraction/parsing output changes so cached parses are not reused
+PARSER_VERSION = '4'
 
 # ATS Configuration
 ATS_CONFIG = {
@@ -24,6 +37,52 @@ ATS_CONFIG = {
     'required_sections': ['experience', 'education', 'skills']
 }
 
+# Bounds for PDF text extraction, so one huge or pathological document cannot
+# pin a worker. Extraction also stops once the text is ats_overrun_factor times
+# past ATS_CONFIG['max_resume_length'] words.
+PDF_EXTRACTION_LIMITS = {
+    'max_pages': 50,
+    'max_chars': 300000,
+    'time_budget_seconds': 15.0,
+    'ats_overrun_factor': 2
+}
+
+DOCX_MIME_TYPES = ('application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+                   'application/msword')
+
+# spaCy components each parsing stage actually needs; everything else is skipped
+# (see ResumeParser._pipeline_view). Noun chunks need POS tags and dependencies,
+# so the parser view also runs the tagger and attribute ruler.
+PIPELINE_VIEWS = {
+    'ner': ['ner'],                                                 # extract_name
+    'parser_ner': ['tagger', 'attribute_ruler', 'parser', 'ner'],   # _extract_keywords
+}
+
+# Common section headers with variations, in priority order: a line that
+# mentions several sections belongs to the first one listed here.
+# ``[^\S\n]`` is whitespace other than a newline, so a header never spans lines.
+SECTION_PATTERNS = {
+    'experience': r'work[^\S\n]*experience|employment[^\S\n]*history|experience',
+    'education': r'education|academic[^\S\n]*background|degrees',
+    'skills': r'skills?[^\S\n]*(?:&|and)?[^\S\n]*expertise|technical[^\S\n]*skills?',
+    'projects': r'projects|portfolio|key[^\S\n]*projects',
+    'certifications': r'certifications?|licenses?|certificates?'
+}
+SECTION_PRIORITY = {name: rank for rank, name in enumerate(SECTION_PATTERNS)}
+
+# One alternation with a named group per section finds every header keyword
+# in a single scan. It runs over lowercased text, which is much faster than
+# IGNORECASE; the case-insensitive variant covers text whose length changes
+# when lowercased (offsets must stay valid for the original text). The leading
+# lookahead on the keywords' first letters (every alternative starts with a
+# literal) lets the engine skip most positions without trying each branch.
+_SECTION_FIRST_CHARS = ''.join(sorted({alt[0] for p in SECTION_PATTERNS.values() for alt in p.split('|')}))
+SECTION_HEADER_RE = re.compile(
+    f'(?=[{_SECTION_FIRST_CHARS}])(?:' +
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in SECTION_PATTERNS.items()) + ')'
+)
+SECTION_HEADER_RE_IGNORECASE = re.compile(SECTION_HEADER_RE.pattern, re.IGNORECASE)
+
 # Try to use python-magic-bin if available, otherwise fall back to file extensions
 try:
     import magic
@@ -31,14 +90,18 @@ try:
 except (ImportError, OSError):
     USE_MAGIC = False
 
-# Load the English language model for spaCy
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading language model for the spaCy (en_core_web_sm)...")
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+def _load_spacy_model():
+    """Load the English language model for spaCy (on first use, not at import)"""
+    import spacy
+    try:
+        return spacy.load("en_core_web_sm")
+    except OSError:
+        print("Downloading language model for the spaCy (en_core_web_sm)...")
+        from spacy.cli import download
+        download("en_core_web_sm")
+        return spacy.load("en_core_web_sm")
+
+register_model('spacy_en', _load_spacy_model)
 
 @dataclass
 class ResumeData:
@@ -60,6 +123,12 @@ class ResumeData:
     keyword_matches: Dict[str, float] = field(default_factory=dict)
     compliance_issues: List[str] = field(default_factory=list)
     
+    # Character spans of each section in raw_text, computed once at parse time
+    section_offsets: Dict[str, List[List[int]]] = field(default_factory=dict)
+    
+    # Stage timings and counters of a sampled parse (see parse_metrics); not persisted
+    metrics: Optional[Dict] = None
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
         return {
@@ -72,16 +141,65 @@ class ResumeData:
             'ats_score': self.ats_score,
             'missing_skills': self.missing_skills,
             'keyword_matches': self.keyword_matches,
-            'compliance_issues': self.compliance_issues
+            'compliance_issues': self.compliance_issues,
+            'section_offsets': self.section_offsets
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict, raw_text: str = "") -> 'ResumeData':
+        """Rebuild from ``to_dict`` output (raw text is stored separately)"""
+        known = {f for f in cls.__dataclass_fields__ if f != 'raw_text'}
+        return cls(raw_text=raw_text, **{k: v for k, v in data.items() if k in known})
 
 class ResumeParser:
-    def __init__(self):
-        self.nlp = nlp
-        self.skills_db = self._load_skills_database()
+    def __init__(self, cache=None, taxonomy_path: Optional[str] = None, sandbox=None):
+        """``cache`` is an optional ``parse_cache.ParseCache`` for file parses;
+        ``taxonomy_path`` overrides the skills taxonomy file; ``sandbox`` is an
+        optional ``extraction_sandbox.ExtractionSandbox`` for PDF/DOCX files."""
+        self.cache = cache
+        self.sandbox = sandbox
+        self._views = {}
+        self._cache_version = (None, '')
+        self.taxonomy_path = taxonomy_path or DEFAULT_TAXONOMY_PATH
+        self.skill_matcher = SkillMatcher(self._load_skills_database())
+        
+    @property
+    def skills_db(self) -> Dict[str, Dict]:
+        # Read through the matcher so a reload swaps taxonomy and automaton together
+        return self.skill_matcher.taxonomy
+    
+    def reload_taxonomy(self, taxonomy_path: Optional[str] = None) -> int:
+        """Re-read the skills taxonomy and recompile the matcher.
         
+        The new matcher is built off to the side and swapped in with a single
+        assignment, so parses running in other threads keep a consistent
+        taxonomy. Returns the number of skills loaded.
+        """
+        if taxonomy_path:
+            self.taxonomy_path = taxonomy_path
+        self.skill_matcher = SkillMatcher(self._load_skills_database())
+        return len(self.skill_matcher)
+    
+    @property
+    def cache_version(self) -> str:
+        """Parse cache version: parser version plus a taxonomy fingerprint"""
+        matcher = self.skill_matcher
+        if self._cache_version[0] is not matcher:
+            taxonomy = json.dumps(matcher.taxonomy, sort_keys=True).encode('utf-8')
+            self._cache_version = (matcher, f"{PARSER_VERSION}-{hashlib.sha256(taxonomy).hexdigest()[:12]}")
+        return self._cache_version[1]
+    
     def _load_skills_database(self) -> Dict[str, Dict]:
-        """Load a categorized database of skills with synonyms and importance"""
+        """Load the categorized skills taxonomy with synonyms and importance.
+        
+        Falls back to a small built-in set if the taxonomy file is missing.
+        """
+        try:
+            with open(self.taxonomy_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load skills taxonomy from {self.taxonomy_path}: {str(e)}")
+        
         return {
             # Programming Languages
             'Python': {'category': 'programming', 'synonyms': ['Python 3', 'Python 2'], 'importance': 0.9},
@@ -103,78 +221,208 @@ class ResumeParser:
             'CI/CD': {'category': 'devops', 'synonyms': ['Continuous Integration', 'Continuous Deployment'], 'importance': 0.8}
         }
         
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded by the model registry on first use"""
+        return get_model('spacy_en')
+    
+    def _pipeline_view(self, view: str) -> List[Tuple[str, object]]:
+        """Pipeline components for a named view, in pipeline order.
+        
+        A shared ``tok2vec`` is added when one of the selected components
+        listens to it; components missing from the loaded model are ignored.
+        """
+        if view not in self._views:
+            wanted = set(PIPELINE_VIEWS[view])
+            if 'tok2vec' in self.nlp.pipe_names:
+                listeners = getattr(self.nlp.get_pipe('tok2vec'), 'listening_components', [])
+                if wanted.intersection(listeners):
+                    wanted.add('tok2vec')
+            self._views[view] = [(name, proc) for name, proc in self.nlp.pipeline if name in wanted]
+        return self._views[view]
+    
+    def _process(self, view: str, text: str):
+        """Run text through the tokenizer and only the components of a view"""
+        doc = self.nlp.make_doc(text)
+        for _, proc in self._pipeline_view(view):
+            doc = proc(doc)
+        return doc
+    
+    def _process_many(self, view: str, texts: Iterable[str], batch_size: int = 32) -> Iterator:
+        """Batched ``_process``, streaming docs through each component like ``nlp.pipe``"""
+        docs = (self.nlp.make_doc(text) for text in texts)
+        for _, proc in self._pipeline_view(view):
+            if hasattr(proc, 'pipe'):
+                docs = proc.pipe(docs, batch_size=batch_size)
+            else:
+                docs = map(proc, docs)
+        return docs
+        
     def _get_skill_info(self, skill_name: str) -> Optional[Dict]:
         """Get skill information from the database with case-insensitive matching"""
-        skill_lower = skill_name.lower()
-        for skill, info in self.skills_db.items():
-            if (skill.lower() == skill_lower or 
-                any(s.lower() == skill_lower for s in info['synonyms'])):
-                return {'name': skill, **info}
-        return None
+        return self.skill_matcher.lookup(skill_name)
+
+    def iter_pdf_pages(self, file_path: str, page_limit: Optional[int] = None,
+                       deadline: Optional[float] = None, ahead: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Lazily yield ``(page_number, text)`` for each page with text, in order.
+        
+        Only pages up to ``page_limit`` are read. Long documents are
+        extracted in page ranges on the ``pdf_parallel`` pool, ``ahead``
+        ranges beyond the one being consumed; ``deadline``
+        (``time.monotonic()``) bounds the wait for each range there.
+        """
+        with open(file_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            page_count = len(reader.pages)
+            if page_limit is not None:
+                page_count = min(page_count, page_limit)
+            
+            if not should_parallelize(page_count):
+                for i in range(page_count):
+                    page_text = reader.pages[i].extract_text()
+                    if page_text:
+                        yield i + 1, page_text
+                return
+        
+        yield from iter_pages_parallel(file_path, page_count, deadline=deadline, ahead=ahead)
+
+    def extract_pdf_with_limits(self, file_path: str, max_pages: Optional[int] = None,
+                                max_chars: Optional[int] = None,
+                                time_budget: Optional[float] = None,
+                                max_words: Optional[int] = None) -> Tuple[str, Dict]:
+        """Extract PDF text page by page, stopping early when a limit is hit.
+        
+        Limits default to ``PDF_EXTRACTION_LIMITS``. Extraction also stops once
+        the word count is clearly past the ATS length limit, since the rest of
+        the document cannot change the outcome. Returns the text and a dict
+        with ``pages_read`` and ``stopped_by`` (None when the whole document
+        was read).
+        """
+        max_pages = max_pages or PDF_EXTRACTION_LIMITS['max_pages']
+        max_chars = max_chars or PDF_EXTRACTION_LIMITS['max_chars']
+        time_budget = time_budget or PDF_EXTRACTION_LIMITS['time_budget_seconds']
+        max_words = max_words or ATS_CONFIG['max_resume_length'] * PDF_EXTRACTION_LIMITS['ats_overrun_factor']
+        
+        parts = []
+        chars = words = pages_read = 0
+        stopped_by = None
+        deadline = time.monotonic() + time_budget
+        
+        # One page past max_pages is read so a longer document reports 'max_pages'. The word
+        # limit usually stops the read after a few ranges, so only one range runs ahead.
+        for page_number, page_text in self.iter_pdf_pages(file_path, max_pages + 1, deadline, ahead=1):
+            if page_number > max_pages:
+                stopped_by = 'max_pages'
+                break
+            part = f"\n--- Page {page_number} ---\n{page_text}\n"
+            if chars + len(part) > max_chars:
+                parts.append(part[:max_chars - chars])
+                stopped_by = 'max_chars'
+                break
+            parts.append(part)
+            chars += len(part)
+            words += len(page_text.split())
+            pages_read = page_number
+            if words > max_words:
+                stopped_by = 'ats_length'
+                break
+            if time.monotonic() > deadline:
+                stopped_by = 'time_budget'
+                break
+        else:
+            # The parallel path stops without raising when a range misses the deadline
+            if time.monotonic() > deadline:
+                stopped_by = 'time_budget'
+        
+        return ''.join(parts).strip(), {'pages_read': pages_read, 'stopped_by': stopped_by}
+
+    def _pdf_text(self, file_path: str) -> str:
+        text, info = self.extract_pdf_with_limits(file_path)
+        if info['stopped_by']:
+            print(f"PDF extraction of {file_path} stopped early ({info['stopped_by']}) "
+                  f"after {info['pages_read']} pages")
+        return text
+
+    def _docx_text(self, file_path: str) -> str:
+        # Stream word/document.xml (paragraphs and tables); fall back to the
+        # python-docx object model for packages the fast path cannot read
+        try:
+            return extract_docx_text(file_path)
+        except DOCX_FORMAT_ERRORS as e:
+            print(f"DOCX fast path failed for {file_path} ({type(e).__name__}), using python-docx")
+        doc = docx.Document(file_path)
+        return "\n".join(
+            paragraph.text for paragraph in doc.paragraphs 
+            if paragraph.text.strip()
+        )
 
     def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file with page numbers and basic formatting"""
-        text = ""
         try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for i, page in enumerate(reader.pages, 1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += f"\n--- Page {i} ---\n{page_text}\n"
+            return self._pdf_text(file_path)
         except Exception as e:
             print(f"Error extracting text from PDF: {str(e)}")
-        return text.strip()
+            return ""
 
     def extract_text_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file with paragraph structure"""
         try:
-            doc = docx.Document(file_path)
-            return "\n".join(
-                paragraph.text for paragraph in doc.paragraphs 
-                if paragraph.text.strip()
-            )
+            return self._docx_text(file_path)
         except Exception as e:
             print(f"Error extracting text from DOCX: {str(e)}")
             return ""
             
-    def _extract_sections(self, text: str) -> Dict[str, str]:
-        """Identify and extract common resume sections"""
-        sections = {}
-        current_section = "header"
+    def _section_offsets(self, text: str) -> Dict[str, List[List[int]]]:
+        """Split resume text into sections in a single scan for header lines.
         
-        # Common section headers with variations
-        section_patterns = {
-            'experience': r'(?i)(work\s*experience|employment\s*history|experience)',
-            'education': r'(?i)(education|academic\s*background|degrees)',
-            'skills': r'(?i)(skills?\s*(?:&|and)?\s*expertise|technical\s*skills?)',
-            'projects': r'(?i)(projects|portfolio|key\s*projects)',
-            'certifications': r'(?i)(certifications?|licenses?|certificates?)'
-        }
+        Any line mentioning a section keyword is a header. Returns
+        ``{section: [[start, end], ...]}`` character spans of the text between
+        headers (header lines themselves are excluded). Text before the
+        first header belongs to ``header``.
+        """
+        searchable, header_re = text.lower(), SECTION_HEADER_RE
+        if len(searchable) != len(text):
+            searchable, header_re = text, SECTION_HEADER_RE_IGNORECASE
         
-        # Initialize sections
-        for section in section_patterns:
-            sections[section] = []
-            
-        # Split text into lines and process
-        lines = text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line:
+        # [line_start, line_end, section] for every header line
+        headers = []
+        for match in header_re.finditer(searchable):
+            if headers and match.start() < headers[-1][1]:
+                # Another keyword on the same line: the higher-priority section wins
+                if SECTION_PRIORITY[match.lastgroup] < SECTION_PRIORITY[headers[-1][2]]:
+                    headers[-1][2] = match.lastgroup
                 continue
-                
-            # Check for section headers
-            for section, pattern in section_patterns.items():
-                if re.search(pattern, line):
-                    current_section = section
-                    break
-            else:
-                # Add line to current section
-                if current_section and line:
-                    sections.setdefault(current_section, []).append(line)
-                    
-        # Join lines for each section
-        return {k: '\n'.join(v) for k, v in sections.items() if v}
+            line_start = searchable.rfind('\n', 0, match.start()) + 1
+            line_end = searchable.find('\n', match.end())
+            headers.append([line_start, len(text) if line_end == -1 else line_end, match.lastgroup])
+        
+        offsets = {}
+        current_section = "header"
+        span_start = 0
+        for line_start, line_end, section in headers:
+            if text[span_start:line_start].strip():
+                offsets.setdefault(current_section, []).append([span_start, line_start])
+            current_section = section
+            span_start = line_end
+            
+        if text[span_start:].strip():
+            offsets.setdefault(current_section, []).append([span_start, len(text)])
+        return offsets
+    
+    @staticmethod
+    def _sections_from_offsets(text: str, offsets: Dict[str, List[List[int]]]) -> Dict[str, str]:
+        """Section texts (stripped, non-empty lines joined) for precomputed offsets"""
+        sections = {}
+        for section, spans in offsets.items():
+            lines = [line.strip() for start, end in spans for line in text[start:end].split('\n')]
+            body = '\n'.join(line for line in lines if line)
+            if body:
+                sections[section] = body
+        return sections
+            
+    def _extract_sections(self, text: str) -> Dict[str, str]:
+        """Identify and extract common resume sections"""
+        return self._sections_from_offsets(text, self._section_offsets(text))
 
     def _get_file_type(self, file_path: str) -> str:
         """Get the MIME type of the file"""
@@ -187,20 +435,40 @@ class ResumeParser:
             return mime_type or 'application/octet-stream'
 
     def extract_text(self, file_path: str) -> str:
-        """Extract text from file based on its type"""
+        """Extract text from file based on its type.
+        
+        With a sandbox attached, PDF and DOCX files are extracted in its
+        resource-limited workers and failures raise ``ExtractionError``;
+        without one, PDF/DOCX errors are printed and "" is returned.
+        """
         file_type = self._get_file_type(file_path)
         
         if file_type == 'application/pdf':
+            if self.sandbox is not None:
+                return self.sandbox.extract(file_path)
             return self.extract_text_from_pdf(file_path)
-        elif file_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                          'application/msword']:
+        elif file_type in DOCX_MIME_TYPES:
+            if self.sandbox is not None:
+                return self.sandbox.extract(file_path)
             return self.extract_text_from_docx(file_path)
         else:
             with open(file_path, 'r', encoding='utf-8') as file:
                 return file.read()
 
-    def analyze_ats_compliance(self, text: str) -> Dict:
-        """Check resume for ATS compliance issues"""
+    def extract_text_strict(self, file_path: str) -> str:
+        """Extract text in this process, raising on any failure (used by sandbox workers)"""
+        file_type = self._get_file_type(file_path)
+        
+        if file_type == 'application/pdf':
+            return self._pdf_text(file_path)
+        elif file_type in DOCX_MIME_TYPES:
+            return self._docx_text(file_path)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+
+    def analyze_ats_compliance(self, text: str, sections: Optional[Dict[str, str]] = None) -> Dict:
+        """Check resume for ATS compliance issues (``sections`` avoids re-splitting the text)"""
         issues = []
         
         # Check length
@@ -209,7 +477,8 @@ class ResumeParser:
             issues.append(f"Resume is too long ({word_count} words, recommended max: {ATS_CONFIG['max_resume_length']})")
             
         # Check for required sections
-        sections = self._extract_sections(text)
+        if sections is None:
+            sections = self._extract_sections(text)
         missing_sections = [s for s in ATS_CONFIG['required_sections'] if s not in sections]
         if missing_sections:
             issues.append(f"Missing recommended sections: {', '.join(missing_sections)}")
@@ -230,46 +499,26 @@ class ResumeParser:
         }
         
     def calculate_keyword_density(self, text: str, keywords: List[str]) -> Dict[str, float]:
-        """Calculate keyword density and match ratio"""
+        """Calculate keyword density and match ratio.
+        
+        Multi-word keywords (noun chunks) are counted as phrases; see
+        ``keyword_counter``. The compiled counter is shared across calls
+        with the same keywords.
+        """
         if not text or not keywords:
             return {}
-            
-        word_count = len(text.split())
-        keyword_counts = {k.lower(): 0 for k in keywords}
+        counter = compile_keywords(tuple(keywords), ATS_CONFIG['keyword_threshold'])
+        return counter.density(text)
         
-        # Count keyword occurrences (case-insensitive)
-        words = re.findall(r'\b\w+\b', text.lower())
-        for word in words:
-            if word in keyword_counts:
-                keyword_counts[word] += 1
-                
-        # Calculate density and match ratio
-        results = {}
-        matched_keywords = 0
-        
-        for kw, count in keyword_counts.items():
-            density = (count / word_count) * 100 if word_count > 0 else 0
-            results[kw] = {
-                'count': count,
-                'density': round(density, 4),
-                'matches_required': density >= 0.5  # At least 0.5% density
-            }
-            if results[kw]['matches_required']:
-                matched_keywords += 1
-                
-        match_ratio = matched_keywords / len(keywords) if keywords else 0
-        
-        return {
-            'keywords': results,
-            'match_ratio': match_ratio,
-            'is_qualified': match_ratio >= ATS_CONFIG['keyword_threshold']
-        }
+    def extract_name(self, text: str, doc=None) -> str:
+        """Extract candidate name from resume text using NLP.
         
-    def extract_name(self, text: str) -> str:
-        """Extract candidate name from resume text using NLP"""
+        ``doc`` may be a pre-processed spaCy doc of the first ten lines
+        (see ``parse_texts``), in which case the model is not run again.
+        """
         # First try to find name in the first few lines
-        first_lines = '\n'.join(text.split('\n')[:10])
-        doc = self.nlp(first_lines)
+        if doc is None:
+            doc = self._process('ner', self._head_lines(text))
         
         # Look for person names in the document
         for ent in doc.ents:
@@ -284,6 +533,11 @@ class ResumeParser:
                 
         return "Unknown"
 
+    @staticmethod
+    def _head_lines(text: str, count: int = 10) -> str:
+        """Return the first ``count`` lines of the text, where the name usually is"""
+        return '\n'.join(text.split('\n')[:count])
+
     def extract_email(self, text: str) -> str:
         """Extract email address from resume text"""
         email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
@@ -296,23 +550,9 @@ class ResumeParser:
         match = re.search(phone_pattern, text)
         return match.group(0) if match else ""
 
-    def extract_skills(self, text: str) -> List[str]:
-        """Extract skills from resume text"""
-        doc = self.nlp(text.lower())
-        found_skills = set()
-        
-        # Check for exact matches
-        for token in doc:
-            if token.text in self.skills:
-                found_skills.add(token.text)
-        
-        # Check for n-grams (phrases)
-        for i in range(len(doc) - 1):
-            phrase = f"{doc[i].text} {doc[i+1].text}"
-            if phrase in self.skills:
-                found_skills.add(phrase)
-        
-        return list(found_skills)
+    def extract_skills(self, text: str) -> List[Dict]:
+        """Extract canonical skills ({name, category}) from resume text in one pass"""
+        return self.skill_matcher.extract(text)
 
     def extract_experience(self, text: str) -> List[Dict]:
         """Extract work experience from resume text"""
@@ -342,76 +582,204 @@ class ResumeParser:
             
         return experience
 
+    def extract_education(self, text: str) -> List[Dict]:
+        """Extract education entries from the education section"""
+        # Simplified in the same spirit as extract_experience
+        degree_pattern = re.compile(
+            r'(?i)\b(ph\.?d|doctorate|master|m\.?sc|m\.?s\.|mba|bachelor|b\.?sc|b\.?s\.|b\.?tech|'
+            r'associate|diploma|certificate)'
+        )
+        education = []
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        
+        for i, line in enumerate(lines):
+            if not degree_pattern.search(line):
+                continue
+            entry = {'degree': line}
+            
+            # The institution and years usually follow on the next line
+            if i + 1 < len(lines) and not degree_pattern.search(lines[i + 1]):
+                entry['institution'] = lines[i + 1].split('|')[0].strip()
+                years = re.findall(r'\b(?:19|20)\d{2}\b', lines[i + 1])
+                if years:
+                    entry['year'] = int(years[-1])
+            education.append(entry)
+            
+        return education
+
     def parse_resume(self, file_path: str, job_description: str = "") -> ResumeData:
-        """Parse resume file and return structured data with ATS analysis"""
+        """Parse resume file and return structured data with ATS analysis.
+        
+        Raises ``ExtractionError`` when sandboxed extraction of the file fails.
+        """
+        trace = start_trace()
         try:
+            cache_key = None
+            if self.cache is not None:
+                with trace.stage('cache_lookup'):
+                    cache_key = self.cache.make_key(self.cache.hash_file(file_path), self.cache_version)
+                    cached = self.cache.get(cache_key)
+                if cached is not None:
+                    trace.count('cache_hits', 1)
+                    # Copy so analysis of this resume cannot mutate the cached entry
+                    resume_data = ResumeData.from_dict(copy.deepcopy(cached['data']), raw_text=cached['text'])
+                    if job_description:
+                        self.analyze_resume(resume_data, job_description, trace=trace)
+                    trace.finish(resume_data)
+                    return resume_data
+            
             # Extract text from resume
-            text = self.extract_text(file_path)
+            with trace.stage('extract_text'):
+                text = self.extract_text(file_path)
+            if trace.active:
+                trace.count('bytes_read', os.path.getsize(file_path))
+                trace.count('pages', text.count('--- Page '))
+                trace.count('chars', len(text))
             if not text:
+                trace.finish()
                 return ResumeData()
-                
-            # Initialize resume data with raw text
-            resume_data = ResumeData(raw_text=text)
             
-            # Extract basic information
-            resume_data.name = self.extract_name(text)
-            resume_data.email = self.extract_email(text)
-            resume_data.phone = self.extract_phone(text)
-            
-            # Extract structured data
-            sections = self._extract_sections(text)
-            resume_data.skills = self.extract_skills(sections.get('skills', ''))
-            resume_data.experience = self.extract_experience(sections.get('experience', ''))
-            resume_data.education = self.extract_education(sections.get('education', ''))
-            
-            # Perform ATS analysis if job description is provided
+            # Cache the job-independent parse; ATS analysis depends on the job
+            resume_data = self._parse_text(text, trace)
+            if cache_key is not None:
+                self.cache.put(cache_key, resume_data.to_dict(), text)
             if job_description:
-                self.analyze_resume(resume_data, job_description)
-            
+                self.analyze_resume(resume_data, job_description, trace=trace)
+            trace.finish(resume_data)
             return resume_data
             
+        except ExtractionError:
+            # Sandboxed extraction failed (timeout, oom, corrupt...); let the caller report it
+            raise
         except Exception as e:
             print(f"Error parsing resume: {str(e)}")
             import traceback
             traceback.print_exc()
             return ResumeData()
+
+    def parse_text(self, text: str, job_description: str = "") -> ResumeData:
+        """Parse already-extracted resume text and return structured data"""
+        if not text:
+            return ResumeData()
+        
+        trace = start_trace()
+        resume_data = self._parse_text(text, trace)
+        
+        # Perform ATS analysis if job description is provided
+        if job_description:
+            self.analyze_resume(resume_data, job_description, trace=trace)
+        
+        trace.finish(resume_data)
+        return resume_data
+
+    def _parse_text(self, text: str, trace=NULL_TRACE) -> ResumeData:
+        with trace.stage('sections'):
+            section_offsets = self._section_offsets(text)
+        return self._build_resume_data(text, section_offsets, trace=trace)
+
+    def parse_texts(self, texts: List[str], job_description: str = "",
+                    batch_size: int = 32,
+                    job_keywords: Optional[List[str]] = None) -> List[ResumeData]:
+        """Parse many resume texts at once.
+        
+        The NER stage over the first lines is streamed through its pipeline
+        view in batches instead of one ``nlp()`` call per resume, and the job
+        description is analyzed once (or not at all when ``job_keywords`` from
+        a compiled job profile are passed in). Resumes that fail to parse come
+        back as an empty ``ResumeData`` so results stay aligned with ``texts``.
+        """
+        texts = [text or "" for text in texts]
+        if job_description and job_keywords is None:
+            from job_profile import get_text_profile
+            job_keywords = get_text_profile(job_description).keywords
+        offsets = [self._section_offsets(text) for text in texts]
+        
+        name_docs = self._process_many('ner', (self._head_lines(text) for text in texts), batch_size)
+        
+        results = []
+        for text, text_offsets, name_doc in zip(texts, offsets, name_docs):
+            if not text:
+                results.append(ResumeData())
+                continue
+            try:
+                resume_data = self._build_resume_data(text, text_offsets, name_doc)
+                if job_description:
+                    self.analyze_resume(resume_data, job_description, job_keywords=job_keywords)
+                results.append(resume_data)
+            except Exception as e:
+                print(f"Error parsing resume: {str(e)}")
+                results.append(ResumeData())
+                
+        return results
+
+    def _build_resume_data(self, text: str, section_offsets: Dict[str, List[List[int]]],
+                           name_doc=None, trace=NULL_TRACE) -> ResumeData:
+        """Run the extraction stages over text whose sections are already split"""
+        # Initialize resume data with raw text
+        resume_data = ResumeData(raw_text=text, section_offsets=section_offsets)
+        sections = self._sections_from_offsets(text, section_offsets)
+        
+        # Extract basic information
+        with trace.stage('ner'):
+            if name_doc is None and trace.active:
+                # Run the model here so its tokens and entities can be counted
+                name_doc = self._process('ner', self._head_lines(text))
+            resume_data.name = self.extract_name(text, doc=name_doc)
+        with trace.stage('contact'):
+            resume_data.email = self.extract_email(text)
+            resume_data.phone = self.extract_phone(text)
+        
+        # Extract structured data
+        with trace.stage('skills'):
+            resume_data.skills = self.extract_skills(sections.get('skills', ''))
+        with trace.stage('experience'):
+            resume_data.experience = self.extract_experience(sections.get('experience', ''))
+        with trace.stage('education'):
+            resume_data.education = self.extract_education(sections.get('education', ''))
+        
+        if trace.active:
+            trace.count('sections', len(section_offsets))
+            trace.count('tokens', len(name_doc) if name_doc is not None else 0)
+            trace.count('entities', len(name_doc.ents) if name_doc is not None else 0)
+            trace.count('skills_found', len(resume_data.skills))
+        return resume_data
             
-    def analyze_resume(self, resume_data: ResumeData, job_description: str) -> None:
-        """Perform ATS analysis on the resume"""
-        # 1. Check ATS compliance
-        compliance = self.analyze_ats_compliance(resume_data.raw_text)
-        resume_data.compliance_issues = compliance['issues']
-        
-        # 2. Extract keywords from job description
-        job_keywords = self._extract_keywords(job_description)
-        
-        # 3. Calculate keyword matches
-        keyword_analysis = self.calculate_keyword_density(
-            resume_data.raw_text, 
-            job_keywords
-        )
-        resume_data.keyword_matches = keyword_analysis
-        
-        # 4. Calculate overall ATS score (weighted average of different factors)
-        skill_score = self._calculate_skill_score(resume_data.skills, job_keywords)
-        exp_score = self._calculate_experience_score(resume_data.experience)
-        edu_score = self._calculate_education_score(resume_data.education)
-        
-        # Calculate weighted score (adjust weights as needed)
-        weights = {
-            'skills': 0.4,
-            'experience': 0.3,
-            'education': 0.2,
-            'compliance': 0.1
-        }
+    def analyze_resume(self, resume_data: ResumeData, job_description: str,
+                       job_keywords: Optional[List[str]] = None, trace=None) -> None:
+        """Perform ATS analysis on the resume (``ats`` scheme of ``scoring_engine``).
         
-        resume_data.ats_score = round(
-            (skill_score * weights['skills']) +
-            (exp_score * weights['experience']) +
-            (edu_score * weights['education']) +
-            (compliance['score'] * weights['compliance']),
-            2
-        )
+        ``job_keywords`` defaults to the keywords of the cached job profile
+        for ``job_description`` (see ``job_profile``), so the description is
+        only run through spaCy once however many resumes are scored.
+        ``trace`` is the parse trace of the caller; without one, the analysis
+        is sampled on its own.
+        """
+        from job_profile import get_text_profile, profile_from_keywords
+        from scoring_engine import score_resume
+        
+        own_trace = trace is None
+        if own_trace:
+            trace = start_trace()
+        
+        # Job keywords come from the cached job profile (once per distinct description)
+        with trace.stage('job_profile'):
+            if job_keywords is None:
+                job_profile = get_text_profile(job_description)
+            else:
+                job_profile = profile_from_keywords(job_keywords, job_description)
+        
+        with trace.stage('scoring'):
+            result = score_resume(resume_data, job_profile, 'ats')
+        # The result may be a shared memo entry: hand the resume its own copies
+        resume_data.compliance_issues = list(result.compliance_issues)
+        resume_data.keyword_matches = copy.deepcopy(result.keyword_matches)
+        resume_data.ats_score = result.score
+        
+        if trace.active:
+            trace.count('job_keywords', len(job_profile.keywords))
+            trace.count('compliance_issues', len(result.compliance_issues))
+        if own_trace:
+            trace.finish(resume_data)
         
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract important keywords from text using NLP"""
@@ -419,7 +787,7 @@ class ResumeParser:
             return []
             
         # Remove stopwords and get noun chunks
-        doc = self.nlp(text.lower())
+        doc = self._process('parser_ner', text.lower())
         keywords = set()
         
         # Add noun chunks
@@ -436,81 +804,57 @@ class ResumeParser:
         
     def _calculate_skill_score(self, skills: List[Dict], job_keywords: List[str]) -> float:
         """Calculate skill match score (0-100)"""
-        if not skills or not job_keywords:
-            return 0.0
-            
-        # Convert to lowercase for case-insensitive matching
-        skill_names = {s['name'].lower() for s in skills}
-        job_keywords_lower = {k.lower() for k in job_keywords}
-        
-        # Calculate match ratio
-        matched = skill_names.intersection(job_keywords_lower)
-        match_ratio = len(matched) / len(job_keywords_lower) if job_keywords_lower else 0
-        
-        # Scale to 0-100
-        return min(100, match_ratio * 100)
+        from scoring_engine import skill_score
+        return skill_score(skills, job_keywords)
         
     def _calculate_experience_score(self, experience: List[Dict]) -> float:
         """Calculate experience score based on duration and relevance"""
-        if not experience:
-            return 0.0
-            
-        total_years = 0
-        current_year = datetime.now().year
-        
-        for exp in experience:
-            try:
-                start_year = int(exp.get('start_date', str(current_year))[:4])
-                end_year = int(exp.get('end_date', str(current_year))[:4] if exp.get('end_date') else current_year)
-                years = end_year - start_year
-                
-                # Apply time-based weighting
-                if current_year - end_year <= 2:
-                    weight = ATS_CONFIG['experience_weights']['recent']
-                elif current_year - end_year <= 5:
-                    weight = ATS_CONFIG['experience_weights']['mid']
-                else:
-                    weight = ATS_CONFIG['experience_weights']['old']
-                    
-                total_years += years * weight
-            except (ValueError, TypeError):
-                continue
-                
-        # Cap at 10 years for scoring
-        return min(100, (total_years / 10) * 100)
+        from scoring_engine import experience_score
+        return experience_score(experience)
         
     def _calculate_education_score(self, education: List[Dict]) -> float:
         """Calculate education score based on degrees"""
-        if not education:
-            return 0.0
-            
-        # Assign points based on degree level
-        degree_scores = {
-            'phd': 100,
-            'master': 90,
-            'bachelor': 80,
-            'associate': 60,
-            'diploma': 50,
-            'certificate': 40
-        }
-        
-        max_score = 0
-        for edu in education:
-            degree = edu.get('degree', '').lower()
-            for level, score in degree_scores.items():
-                if level in degree:
-                    max_score = max(max_score, score)
-                    break
-                    
-        return max_score
+        from scoring_engine import education_score
+        return education_score(education)
 
     def to_json(self, resume_data: ResumeData) -> str:
         """Convert ResumeData object to JSON"""
         return json.dumps(asdict(resume_data), indent=2)
 
+def _build_shared_parser() -> ResumeParser:
+    from parse_cache import get_parse_cache
+    from extraction_sandbox import get_extraction_sandbox
+    return ResumeParser(cache=get_parse_cache(), sandbox=get_extraction_sandbox())
+
+
+register_model('resume_parser', _build_shared_parser)
+
+_reload_lock = threading.Lock()
+
+
+def get_resume_parser() -> ResumeParser:
+    """Process-wide parser shared by every route, CLI command and job.
+    
+    Built once (taxonomy, compiled skill automaton, parse cache) on first
+    use; parsing methods keep no per-call state on the instance, so it is
+    safe to use from several threads.
+    """
+    return get_model('resume_parser')
+
+
+def reload_skills_taxonomy(taxonomy_path: Optional[str] = None) -> int:
+    """Reload the shared parser's skills taxonomy after the file changed"""
+    from job_profile import job_profile_cache
+    with _reload_lock:
+        count = get_resume_parser().reload_taxonomy(taxonomy_path)
+        # Compiled job profiles hold taxonomy skills too
+        job_profile_cache.clear()
+        return count
+
+
 # Example usage
 if __name__ == "__main__":
-    parser = ResumeParser()
+    parser = get_resume_parser()
     resume_path = input("Enter path to resume file: ")
     if os.path.exists(resume_path):
         result = parser.parse_resume(resume_path)
@@ -0,0 +1,57 @@
+"""
+Stored resume text for SmartHire AI.
+
+The text extracted from a resume file is persisted next to the ``Resume``
+row (``ResumeText``) when the resume is uploaded or ingested. Analyzers
+rebuild a full ``ResumeData`` from ``Resume.parsed_data`` plus that text,
+so repeat analyses never open or re-parse the original file.
+"""
+
+from typing import Optional
+
+from keyword_counter import token_fingerprint
+from resume_parser import ResumeData
+
+
+def store_resume_text(resume, resume_data: ResumeData, parser_version: str = ""):
+    """Attach the extracted text of ``resume_data`` to a Resume row (no commit)"""
+    from models import ResumeText
+
+    text = resume_data.raw_text or ""
+    record = resume.text_record or ResumeText()
+    record.text = text
+    record.section_offsets = resume_data.section_offsets
+    record.token_fingerprint = token_fingerprint(text)
+    record.parser_version = parser_version
+    resume.text_record = record
+    return record
+
+
+def load_resume_data(resume, persist: bool = True) -> Optional[ResumeData]:
+    """``ResumeData`` with raw text for a Resume row.
+
+    Reads the stored text; resumes uploaded before text was stored are
+    parsed from their file once and, with ``persist``, their text is saved
+    (the caller commits). Returns None when the file cannot be read.
+    """
+    record = resume.text_record
+    if record is not None:
+        data = dict(resume.parsed_data or {})
+        data['section_offsets'] = record.section_offsets or data.get('section_offsets') or {}
+        return ResumeData.from_dict(data, raw_text=record.text)
+
+    from resume_parser import get_resume_parser
+    parser = get_resume_parser()
+    try:
+        resume_data = parser.parse_resume(resume.file_path)
+    except Exception as e:
+        print(f"Could not read resume file {resume.file_path}: {str(e)}")
+        return None
+    if not resume_data.raw_text:
+        return None
+
+    if persist:
+        if not resume.parsed_data:
+            resume.parsed_data = resume_data.to_dict()
+        store_resume_text(resume, resume_data, parser.cache_version)
+    return resume_data
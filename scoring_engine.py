@@ -0,0 +1,326 @@
+"""
+Resume-to-job scoring engine for SmartHire AI.
+
+Every match score in the app is computed here, from a parsed resume
+(``ResumeData``) and a compiled job (``job_profile.JobProfile``). A score
+is a weighted sum of features, and a *scheme* names the weights. The
+schemes reproduce the scores the app has always shown:
+
+``ats``            ResumeParser.analyze_resume / candidates' ATS score
+``match``          calculate_match_score (resume review)
+``skill_overlap``  onboarding upload match
+``mentions``       /api/candidates/<id>/analyze
+
+Features (ENGINE_VERSION 1), each 0-100 unless noted:
+
+``skills``             share of the job keywords the resume lists as skills
+``experience``         years per role weighted by recency, 10+ years = 100
+``education``          highest degree level (PhD 100 ... certificate 40)
+``compliance``         ATS compliance checks, -10 per issue
+``keyword_density``    share of job keywords at >= 0.5% density (0-1)
+``required_skills``    share of the job's required skills the resume lists
+``experience_years``   years from role durations, 10+ years = 100
+``skill_mentions``     share of required skills mentioned in the resume text
+``education_mention``  100 if a required degree level is mentioned
+``keyword_mentions``   share of job keywords mentioned in the resume text
+
+Bump ENGINE_VERSION whenever a feature or weight changes: results are
+memoized by (resume hash, job id and version, scheme, engine version).
+"""
+
+import json
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from resume_parser import ATS_CONFIG, ResumeData
+
+ENGINE_VERSION = '1'
+
+SCHEMES = {
+    'ats': {
+        'weights': {'skills': 0.4, 'experience': 0.3, 'education': 0.2, 'compliance': 0.1,
+                    'keyword_density': 0.0},
+        'precision': 2
+    },
+    'match': {
+        'weights': {'required_skills': 0.7, 'experience_years': 0.3},
+        'precision': 1
+    },
+    'skill_overlap': {
+        'weights': {'required_skills': 1.0},
+        'precision': 1
+    },
+    'mentions': {
+        'weights': {'skill_mentions': 0.5, 'education_mention': 0.2, 'keyword_mentions': 0.3},
+        'precision': 1
+    }
+}
+
+DEGREE_SCORES = {
+    'phd': 100,
+    'master': 90,
+    'bachelor': 80,
+    'associate': 60,
+    'diploma': 50,
+    'certificate': 40
+}
+
+# Vectorized scoring only pays off once the matrix build is amortized
+BATCH_MIN_RESUMES = 64
+
+
+def skill_score(skills: List[Dict], job_keywords: List[str]) -> float:
+    """Share of the job keywords the resume lists as skills (0-100)"""
+    if not skills or not job_keywords:
+        return 0.0
+    skill_names = {s['name'].lower() for s in skills}
+    job_keywords_lower = {k.lower() for k in job_keywords}
+    matched = skill_names.intersection(job_keywords_lower)
+    return min(100, len(matched) / len(job_keywords_lower) * 100)
+
+
+def experience_entry(exp: Dict, current_year: int) -> Optional[Tuple[int, float]]:
+    """(years, recency weight) of one experience entry; None if its dates do not parse"""
+    try:
+        start_year = int(exp.get('start_date', str(current_year))[:4])
+        end_year = int(exp.get('end_date', str(current_year))[:4] if exp.get('end_date') else current_year)
+    except (ValueError, TypeError):
+        return None
+
+    # Apply time-based weighting
+    if current_year - end_year <= 2:
+        weight = ATS_CONFIG['experience_weights']['recent']
+    elif current_year - end_year <= 5:
+        weight = ATS_CONFIG['experience_weights']['mid']
+    else:
+        weight = ATS_CONFIG['experience_weights']['old']
+    return end_year - start_year, weight
+
+
+def experience_score(experience: List[Dict]) -> float:
+    """Years per role, weighted by how recent the role is; 10+ years is 100"""
+    if not experience:
+        return 0.0
+
+    total_years = 0
+    current_year = datetime.now().year
+    for exp in experience:
+        entry = experience_entry(exp, current_year)
+        if entry is not None:
+            years, weight = entry
+            total_years += years * weight
+
+    return min(100, (total_years / 10) * 100)
+
+
+def degree_score(degree: str) -> int:
+    degree = degree.lower()
+    for level, score in DEGREE_SCORES.items():
+        if level in degree:
+            return score
+    return 0
+
+
+def education_score(education: List[Dict]) -> float:
+    """Score of the highest degree level found"""
+    if not education:
+        return 0.0
+    return max(degree_score(edu.get('degree', '')) for edu in education)
+
+
+def duration_years(experience: List[Dict]) -> int:
+    """Rough total years from the first number in each role's duration"""
+    total = 0
+    for exp in experience or []:
+        if 'duration' in exp:
+            years = re.findall(r'\d+', exp['duration'])
+            if years:
+                total += int(years[0])
+    return total
+
+
+@dataclass
+class ScoreResult:
+    """Score of one resume against one job under one scheme.
+
+    Results may come from the memo and are shared; treat them as read-only.
+    """
+    scheme: str
+    score: float
+    components: Dict[str, float] = field(default_factory=dict)
+    matched_skills: List[str] = field(default_factory=list)
+    missing_skills: List[str] = field(default_factory=list)
+    matched_keywords: List[str] = field(default_factory=list)
+    missing_keywords: List[str] = field(default_factory=list)
+    keyword_matches: Dict = field(default_factory=dict)
+    compliance_issues: List[str] = field(default_factory=list)
+    engine_version: str = ENGINE_VERSION
+
+    def to_dict(self) -> Dict:
+        return {
+            'scheme': self.scheme,
+            'score': self.score,
+            'components': self.components,
+            'matched_skills': self.matched_skills,
+            'missing_skills': self.missing_skills,
+            'matched_keywords': self.matched_keywords,
+            'missing_keywords': self.missing_keywords,
+            'compliance_issues': self.compliance_issues,
+            'engine_version': self.engine_version
+        }
+
+
+def resume_hash(resume: ResumeData) -> str:
+    """Content hash of everything the features read from a resume"""
+    digest = hashlib.sha256((resume.raw_text or '').encode('utf-8'))
+    digest.update(json.dumps([resume.skills, resume.experience, resume.education],
+                             sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ScoringEngine:
+    """Computes scheme scores, memoizing results of unchanged inputs"""
+
+    def __init__(self, parser=None, memo_size: int = 4096):
+        self._parser = parser
+        self.memo_size = memo_size
+        self._memo: 'OrderedDict[Hashable, ScoreResult]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def parser(self):
+        if self._parser is None:
+            from resume_parser import get_resume_parser
+            self._parser = get_resume_parser()
+        return self._parser
+
+    def _memo_key(self, resume: ResumeData, job, scheme: str) -> Optional[Hashable]:
+        # Profiles without a version are not cacheable (their content is unknown)
+        if not job.version:
+            return None
+        return (resume_hash(resume), job.job_id, job.version, scheme, ENGINE_VERSION)
+
+    def score(self, resume: ResumeData, job, scheme: str = 'ats') -> ScoreResult:
+        """Score one resume against a ``JobProfile``"""
+        key = self._memo_key(resume, job, scheme)
+        if key is not None:
+            with self._lock:
+                result = self._memo.get(key)
+                if result is not None:
+                    self._memo.move_to_end(key)
+                    self.hits += 1
+                    return result
+                self.misses += 1
+
+        result = self._compute(resume, job, scheme)
+        if key is not None:
+            with self._lock:
+                self._memo[key] = result
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return result
+
+    def score_many(self, resumes: Sequence[ResumeData], job, scheme: str = 'ats') -> List[ScoreResult]:
+        """Score many resumes against one job.
+
+        Large ``ats`` batches go through the vectorized path in
+        ``batch_scoring``; those results carry the score and components but
+        no per-keyword details, and are not memoized.
+        """
+        if scheme != 'ats' or len(resumes) < BATCH_MIN_RESUMES:
+            return [self.score(resume, job, scheme) for resume in resumes]
+
+        from batch_scoring import ResumeMatrix, score_resumes
+        scores = score_resumes(ResumeMatrix.build(resumes, parser=self.parser), job.keywords)
+        return [
+            ScoreResult(
+                scheme=scheme,
+                score=float(scores.ats_score[row]),
+                components={
+                    'skills': float(scores.skills[row]),
+                    'experience': float(scores.experience[row]),
+                    'education': float(scores.education[row]),
+                    'compliance': float(scores.compliance[row]),
+                    'keyword_density': float(scores.keyword_match_ratio[row])
+                }
+            )
+            for row in range(len(resumes))
+        ]
+
+    def _compute(self, resume: ResumeData, job, scheme: str) -> ScoreResult:
+        spec = SCHEMES[scheme]
+        weights = spec['weights']
+        result = ScoreResult(scheme=scheme, score=0.0)
+        components = result.components
+        text = resume.raw_text or ''
+
+        if 'skills' in weights:
+            components['skills'] = skill_score(resume.skills, job.keywords)
+        if 'experience' in weights:
+            components['experience'] = experience_score(resume.experience)
+        if 'education' in weights:
+            components['education'] = education_score(resume.education)
+        if 'compliance' in weights:
+            sections = None
+            if resume.section_offsets:
+                sections = self.parser._sections_from_offsets(text, resume.section_offsets)
+            compliance = self.parser.analyze_ats_compliance(text, sections)
+            components['compliance'] = compliance['score']
+            result.compliance_issues = compliance['issues']
+        if 'keyword_density' in weights:
+            result.keyword_matches = self.parser.calculate_keyword_density(text, job.keywords)
+            components['keyword_density'] = result.keyword_matches.get('match_ratio', 0)
+
+        if 'required_skills' in weights:
+            resume_skills = {skill['name'].lower() for skill in (resume.skills or [])}
+            result.matched_skills = [s for s in job.required_skills if s.lower() in resume_skills]
+            result.missing_skills = [s for s in job.required_skills if s.lower() not in resume_skills]
+            components['required_skills'] = (len(result.matched_skills) / len(job.required_skills) * 100
+                                             if job.required_skills else 0)
+        if 'experience_years' in weights:
+            components['experience_years'] = (min(duration_years(resume.experience) / 10 * 100, 100)
+                                              if resume.experience else 0)
+
+        if weights.keys() & {'skill_mentions', 'education_mention', 'keyword_mentions'}:
+            text_lower = text.lower()
+            result.matched_skills = [s for s in job.required_skills if s.lower() in text_lower]
+            result.missing_skills = [s for s in job.required_skills if s.lower() not in text_lower]
+            components['skill_mentions'] = (len(result.matched_skills) / len(job.required_skills) * 100
+                                            if job.required_skills else 0)
+            components['education_mention'] = (100 if any(level in text_lower for level in job.education_requirements)
+                                               else 0)
+            result.matched_keywords = [k for k in job.keywords if k.lower() in text_lower]
+            result.missing_keywords = [k for k in job.keywords if k.lower() not in text_lower]
+            components['keyword_mentions'] = (len(result.matched_keywords) / len(job.keywords) * 100
+                                              if job.keywords else 0)
+
+        result.score = round(sum(components[name] * weight for name, weight in weights.items()),
+                             spec['precision'])
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._memo), 'hits': self.hits, 'misses': self.misses,
+                    'engine_version': ENGINE_VERSION}
+
+
+scoring_engine = ScoringEngine()
+
+
+def score_resume(resume: ResumeData, job, scheme: str = 'ats') -> ScoreResult:
+    return scoring_engine.score(resume, job, scheme)
+
+
+def score_resumes_against(resumes: Sequence[ResumeData], job, scheme: str = 'ats') -> List[ScoreResult]:
+    return scoring_engine.score_many(resumes, job, scheme)
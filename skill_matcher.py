@@ -0,0 +1,147 @@
+"""
+Compiled skill matching for SmartHire AI.
+
+Every canonical skill and synonym in the skills taxonomy is compiled into a
+single Aho-Corasick automaton, so finding all skills in a resume is one
+linear pass over the text no matter how large the taxonomy is.
+
+Matches must sit on word boundaries. ``+`` and ``#`` count as word
+characters so ``C`` does not match inside ``C++``/``C#``, while leading or
+trailing punctuation inside a pattern (``.NET``, ``CI/CD``, ``Node.js``) is
+matched literally. Overlapping matches resolve to the longest one, so
+``Node.js`` wins over ``Node`` and ``ASP.NET`` over ``.NET``.
+"""
+
+import os
+import re
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.json')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_skill_text(text: str) -> str:
+    """Lowercase and collapse whitespace (patterns and texts go through the same normalization)"""
+    return _WHITESPACE.sub(' ', text.lower()).strip()
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char in '_+#'
+
+
+@dataclass
+class SkillMatch:
+    """A single occurrence of a skill in normalized text"""
+    skill: str       # canonical skill name
+    surface: str     # the matched form (canonical name or synonym)
+    start: int
+    end: int
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over all skill names and synonyms"""
+
+    def __init__(self, taxonomy: Dict[str, Dict]):
+        """``taxonomy`` maps canonical names to ``{category, synonyms, importance}``"""
+        self.taxonomy = taxonomy
+        self._surface_to_skill: Dict[str, str] = {}
+        for skill, info in taxonomy.items():
+            for surface in [skill] + list(info.get('synonyms', [])):
+                normalized = normalize_skill_text(surface)
+                if normalized:
+                    # First definition wins if two skills share a synonym
+                    self._surface_to_skill.setdefault(normalized, skill)
+        self._build()
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TAXONOMY_PATH) -> 'SkillMatcher':
+        """Load a JSON taxonomy file (same shape as ``ResumeParser.skills_db``)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.taxonomy)
+
+    def _build(self) -> None:
+        """Compile the goto/fail/output tables"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lengths of the patterns ending at each state (own + via fail links)
+        self._out: List[List[int]] = [[]]
+
+        for surface in self._surface_to_skill:
+            state = 0
+            for char in surface:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append(len(surface))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[SkillMatch]:
+        """All non-overlapping skill occurrences in the text, in order"""
+        text = normalize_skill_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        candidates = []
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in out[state]:
+                start = index - length + 1
+                end = index + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                candidates.append((start, end))
+
+        # Leftmost-longest: keep the longest match, drop anything overlapping it
+        candidates.sort(key=lambda span: (span[0], -(span[1] - span[0])))
+        matches = []
+        last_end = -1
+        for start, end in candidates:
+            if start < last_end:
+                continue
+            surface = text[start:end]
+            matches.append(SkillMatch(self._surface_to_skill[surface], surface, start, end))
+            last_end = end
+        return matches
+
+    def extract(self, text: str) -> List[Dict]:
+        """Distinct canonical skills found in the text, in order of first mention"""
+        seen = set()
+        skills = []
+        for match in self.find_all(text):
+            if match.skill not in seen:
+                seen.add(match.skill)
+                skills.append({'name': match.skill, 'category': self.taxonomy[match.skill].get('category', '')})
+        return skills
+
+    def lookup(self, name: str) -> Optional[Dict]:
+        """Canonical skill info for an exact name or synonym (case-insensitive)"""
+        skill = self._surface_to_skill.get(normalize_skill_text(name))
+        if skill is None:
+            return None
+        return {'name': skill, **self.taxonomy[skill]}